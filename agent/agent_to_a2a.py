@@ -1,29 +1,70 @@
 from __future__ import annotations
 
 import logging
+import os
 import sys
-
-
-from a2a.server.apps import A2AStarletteApplication
-from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
+from typing import TYPE_CHECKING
 
 
 from starlette.applications import Starlette
-
-from google.adk.agents.base_agent import BaseAgent
-from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
-from google.adk.auth.credential_service.in_memory_credential_service import InMemoryCredentialService
-from google.adk.cli.utils.logs import setup_adk_logger
-from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
-from google.adk.runners import Runner
-from google.adk.sessions.in_memory_session_service import InMemorySessionService
-from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutor
-from google.adk.a2a.utils.agent_card_builder import AgentCardBuilder
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from http_client import http_client
+
+# Only annotations use these. The A2A server stack, the Runner and the
+# stores are imported inside to_a2a, so importing this module (as the
+# summoner does under `adk web`) does not load them.
+if TYPE_CHECKING:
+  from a2a.server.tasks import TaskStore
+  from google.adk.agents.base_agent import BaseAgent
+  from google.adk.artifacts.base_artifact_service import BaseArtifactService
+  from google.adk.auth.credential_service.base_credential_service import BaseCredentialService
+  from google.adk.memory.base_memory_service import BaseMemoryService
+  from google.adk.runners import Runner
+  from google.adk.sessions.base_session_service import BaseSessionService
+  from bounded_stores import StoreLimits
+  from toolset_loader import ToolsetLoader
 #REPLACE-IMPORT
 
+# When the shared Runner is built:
+#   startup  while the app starts, so the first request does not pay for it
+#   lazy     on the first request (faster boot, e.g. for scale-to-zero)
+# Either way a single Runner and one set of services serve every request and
+# the Runner is closed when the app shuts down.
+RUNNER_LIFECYCLES = ("startup", "lazy")
+A2A_RUNNER_LIFECYCLE = os.environ.get("A2A_RUNNER_LIFECYCLE", "startup")
+# "memory" keeps everything for the process lifetime. Eviction is opt-in:
+# "bounded" evicts least recently used sessions, tasks and memories past the
+# A2A_STORE_* limits (see bounded_stores.py); "indexed" does the same but
+# searches memory through an inverted index (see indexed_memory.py).
+A2A_STORES = os.environ.get("A2A_STORES", "memory")
+
+# Same format as google.adk.cli.utils.logs.setup_adk_logger. Importing that
+# module runs google.adk.cli/__init__, which loads the whole click CLI and
+# the evaluation package just to configure logging.
+ADK_LOGGING_FORMAT = '%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+
+
+def setup_adk_logger(level: int = logging.INFO) -> None:
+  logging.basicConfig(level=level, format=ADK_LOGGING_FORMAT)
+  logging.getLogger('google_adk').setLevel(level)
+
 def to_a2a(
-    agent: BaseAgent, *, host: str = "0.0.0.0", port: int = 8080, public_url: str | None = None
+    agent: BaseAgent,
+    *,
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    public_url: str | None = None,
+    runner_lifecycle: str = A2A_RUNNER_LIFECYCLE,
+    stores: str = A2A_STORES,
+    store_limits: StoreLimits | None = None,
+    artifact_service: BaseArtifactService | None = None,
+    session_service: BaseSessionService | None = None,
+    memory_service: BaseMemoryService | None = None,
+    credential_service: BaseCredentialService | None = None,
+    task_store: TaskStore | None = None,
+    toolsets: ToolsetLoader | None = None,
 ) -> Starlette:
   """Convert an ADK agent to a A2A Starlette application.
 
@@ -31,6 +72,15 @@ def to_a2a(
       agent: The ADK agent to convert
       host: The host for the A2A RPC URL (default: "0.0.0.0")
       port: The port for the A2A RPC URL (default: 8080)
+      runner_lifecycle: "startup" or "lazy"; see A2A_RUNNER_LIFECYCLE
+      stores: "memory", "bounded" or "indexed"; see A2A_STORES
+      store_limits: TTL, entry and byte limits for the bounded stores
+          (default: from the A2A_STORE_* environment variables)
+      artifact_service, session_service, memory_service, credential_service:
+          Services shared by every request; override the `stores` choice
+      task_store: Store for A2A tasks; overrides the `stores` choice
+      toolsets: The agent's toolsets; their eager ones are connected
+          concurrently before the agent card is built
 
   Returns:
       A Starlette application that can be run with uvicorn
@@ -40,24 +90,51 @@ def to_a2a(
       app = to_a2a(agent, host="localhost", port=8000)
       # Then run with: uvicorn module:app --host localhost --port 8000
   """
+  from a2a.server.apps import A2AStarletteApplication
+  from a2a.server.request_handlers import DefaultRequestHandler
+  from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+  from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutor
+  from google.adk.a2a.utils.agent_card_builder import AgentCardBuilder
+  from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+  from google.adk.auth.credential_service.in_memory_credential_service import InMemoryCredentialService
+  from google.adk.runners import Runner
+  from bounded_stores import create_stores, render_store_metrics
+  from card_cache import CardEndpoint
+
+  if runner_lifecycle not in RUNNER_LIFECYCLES:
+    raise ValueError(
+        f"runner_lifecycle must be one of {RUNNER_LIFECYCLES}, got {runner_lifecycle!r}"
+    )
+
   # Set up ADK logging to ensure logs are visible when using uvicorn directly
   setup_adk_logger(logging.INFO)
 
+  # One set of services for the life of the app, so sessions and memory
+  # written by one request are visible to the next.
+  default_stores = create_stores(stores, store_limits)
+  artifact_service = artifact_service or InMemoryArtifactService()
+  session_service = session_service or default_stores["session_service"]
+  memory_service = memory_service or default_stores["memory_service"]
+  credential_service = credential_service or InMemoryCredentialService()
+  runner: Runner | None = None
+
   async def create_runner() -> Runner:
-    """Create a runner for the agent."""
-    return Runner(
-        app_name=agent.name or "adk_agent",
-        agent=agent,
-        # Use minimal services - in a real implementation these could be configured
-        artifact_service=InMemoryArtifactService(),
-        session_service=InMemorySessionService(),
-        memory_service=InMemoryMemoryService(),
-        credential_service=InMemoryCredentialService(),
-        #REPLACE-PLUGIN
-    )
+    """Create the runner for the agent; built once and then reused."""
+    nonlocal runner
+    if runner is None:
+      runner = Runner(
+          app_name=agent.name or "adk_agent",
+          agent=agent,
+          artifact_service=artifact_service,
+          session_service=session_service,
+          memory_service=memory_service,
+          credential_service=credential_service,
+          #REPLACE-PLUGIN
+      )
+    return runner
 
   # Create A2A components
-  task_store = InMemoryTaskStore()
+  task_store = task_store or default_stores["task_store"]
 
   agent_executor = A2aAgentExecutor(
       runner=create_runner,
@@ -74,11 +151,42 @@ def to_a2a(
       rpc_url=public_url,
   )
 
+  async def store_metrics(request: Request) -> PlainTextResponse:
+    """Gauges of the stores, the model-call scheduler and plugins that have them."""
+    text = render_store_metrics({
+        "session": session_service,
+        "task": task_store,
+        "memory": memory_service,
+    })
+    from model_scheduler import model_scheduler
+    text += model_scheduler.render_metrics()
+    if runner is not None:
+      # e.g. the hit rate of ResponseCachePlugin
+      for plugin in runner.plugin_manager.plugins:
+        if hasattr(plugin, "render_metrics"):
+          text += plugin.render_metrics()
+    return PlainTextResponse(text)
+
+  setup_done = False
+
+  async def readiness(request: Request) -> JSONResponse:
+    """200 once the card is served and the eager toolsets are loaded, else 503."""
+    ready, details = toolsets.readiness() if toolsets else (True, {})
+    ready = ready and setup_done
+    return JSONResponse({**details, "ready": ready}, status_code=200 if ready else 503)
+
   # Create a Starlette app that will be configured during startup
   app = Starlette()
+  app.add_route("/metrics", store_metrics, methods=["GET"])
+  app.add_route("/ready", readiness, methods=["GET"])
 
   # Add startup handler to build the agent card and configure A2A routes
   async def setup_a2a():
+    nonlocal setup_done
+    # Connect the eager toolsets together so the card can list their tools
+    if toolsets is not None:
+      await toolsets.warm_up()
+
     # Build the agent card asynchronously
     agent_card = await card_builder.build()
 
@@ -88,12 +196,29 @@ def to_a2a(
         http_handler=request_handler,
     )
 
+    # Serve the card from bytes serialized once, with ETag and Cache-Control.
+    # Added first, so it takes precedence over the A2A app's card route.
+    app.add_route(AGENT_CARD_WELL_KNOWN_PATH, CardEndpoint(agent_card).serve, methods=["GET"])
+
     # Add A2A routes to the main app
     a2a_app.add_routes_to_app(
         app,
     )
+    setup_done = True
+
+  async def close_runner():
+    if runner is not None:
+      # Also closes the toolsets used by the agent tree
+      await runner.close()
+    elif toolsets is not None:
+      await toolsets.close()
 
   # Store the setup function to be called during startup
   app.add_event_handler("startup", setup_a2a)
+  if runner_lifecycle == "startup":
+    app.add_event_handler("startup", create_runner)
+  app.add_event_handler("shutdown", close_runner)
+  # Release the pooled outbound connections (cooldown checks etc.) on shutdown
+  app.add_event_handler("shutdown", http_client.aclose)
 
   return app
\ No newline at end of file
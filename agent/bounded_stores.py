@@ -0,0 +1,302 @@
+# bounded_stores.py
+"""
+Bounded drop-in replacements for the in-memory session, task and memory stores.
+
+The ADK and A2A in-memory stores keep every session, task and remembered
+session for the life of the process, so a familiar that runs for days grows
+until it is OOM-killed. The stores below subclass those implementations and
+track each entry's approximate size and last access. The least recently
+used entries are evicted whenever the store holds more than `max_entries`
+entries or more than `max_bytes` bytes. Setting `ttl_seconds`
+(A2A_STORE_TTL_SECONDS, off by default) also drops entries idle for longer,
+which forgets conversations and remembered sessions.
+
+Sizes are estimates: the length of the entry's JSON serialization, updated
+incrementally as events are appended.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
+
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import Task
+from google.adk.events.event import Event
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.adk.sessions.session import Session
+
+
+def _user_key(app_name: str, user_id: str) -> str:
+    # Same "{app_name}/{user_id}" keys as InMemoryMemoryService._session_events.
+    return f"{app_name}/{user_id}"
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+@dataclass
+class StoreLimits:
+    """Limits applied to each bounded store; 0 disables a limit."""
+
+    ttl_seconds: float = field(default_factory=lambda: float(os.environ.get("A2A_STORE_TTL_SECONDS", 0)))
+    max_entries: int = field(default_factory=lambda: _env_int("A2A_STORE_MAX_ENTRIES", 10_000))
+    max_bytes: int = field(default_factory=lambda: _env_int("A2A_STORE_MAX_BYTES", 64 * 1024 * 1024))
+
+
+class LruBudget:
+    """Access order, sizes and eviction counters for the keys of one store.
+
+    The caller owns the data; `touch` and `grow` record accesses and return
+    the keys the caller must now drop.
+    """
+
+    def __init__(self, limits: StoreLimits) -> None:
+        self.limits = limits
+        # key -> [size in bytes, monotonic time of last access], oldest first.
+        self._entries: OrderedDict[Hashable, list] = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def expire(self, key: Hashable) -> bool:
+        """Drops key and returns True if it has been idle longer than the TTL."""
+        entry = self._entries.get(key)
+        if entry is None or not self.limits.ttl_seconds:
+            return False
+        if time.monotonic() - entry[1] <= self.limits.ttl_seconds:
+            return False
+        self.discard(key)
+        self.expirations += 1
+        return True
+
+    def touch(self, key: Hashable, size: Optional[int] = None) -> list[Hashable]:
+        """Marks key as used (setting its size if given); returns keys to evict."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = [0, now]
+        if size is not None:
+            self.bytes += size - entry[0]
+            entry[0] = size
+        entry[1] = now
+        self._entries.move_to_end(key)
+        return self._collect(now, keep=key)
+
+    def grow(self, key: Hashable, delta: int) -> list[Hashable]:
+        """Adds delta bytes to a key's size and marks it used."""
+        entry = self._entries.get(key)
+        return self.touch(key, (entry[0] if entry else 0) + delta)
+
+    def discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[0]
+
+    def _collect(self, now: float, keep: Hashable) -> list[Hashable]:
+        victims = []
+        limits = self.limits
+        # Oldest first, so expired entries are always at the front.
+        while len(self._entries) > 1:
+            key, (size, last_access) = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            if limits.ttl_seconds and now - last_access > limits.ttl_seconds:
+                self.expirations += 1
+            elif (limits.max_entries and len(self._entries) > limits.max_entries) or (
+                limits.max_bytes and self.bytes > limits.max_bytes
+            ):
+                self.evictions += 1
+            else:
+                break
+            self.discard(key)
+            victims.append(key)
+        return victims
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.limits.max_entries,
+            "max_bytes": self.limits.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def _json_size(model) -> int:
+    return len(model.model_dump_json(exclude_none=True))
+
+
+class BoundedSessionService(InMemorySessionService):
+    """InMemorySessionService that evicts idle and least recently used sessions."""
+
+    def __init__(self, limits: Optional[StoreLimits] = None) -> None:
+        super().__init__()
+        self.budget = LruBudget(limits or StoreLimits())
+
+    def _evict(self, keys: list[tuple[str, str, str]]) -> None:
+        for app_name, user_id, session_id in keys:
+            user_sessions = self.sessions.get(app_name, {}).get(user_id, {})
+            user_sessions.pop(session_id, None)
+            if not user_sessions:
+                self.sessions.get(app_name, {}).pop(user_id, None)
+
+    def _create_session_impl(self, *, app_name, user_id, state=None, session_id=None) -> Session:
+        session = super()._create_session_impl(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        self._evict(self.budget.touch((app_name, user_id, session.id), _json_size(session)))
+        return session
+
+    def _get_session_impl(
+        self, *, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig] = None
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        if self.budget.expire(key):
+            self._evict([key])
+            return None
+        session = super()._get_session_impl(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        if session is not None:
+            self._evict(self.budget.touch(key))
+        return session
+
+    def _delete_session_impl(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        super()._delete_session_impl(app_name=app_name, user_id=user_id, session_id=session_id)
+        self.budget.discard((app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session=session, event=event)
+        key = (session.app_name, session.user_id, session.id)
+        if key in self.budget and not event.partial:
+            self._evict(self.budget.grow(key, _json_size(event)))
+        return event
+
+
+class BoundedTaskStore(InMemoryTaskStore):
+    """InMemoryTaskStore that evicts idle and least recently used A2A tasks."""
+
+    def __init__(self, limits: Optional[StoreLimits] = None) -> None:
+        super().__init__()
+        self.budget = LruBudget(limits or StoreLimits())
+
+    async def save(self, task: Task) -> None:
+        async with self.lock:
+            self.tasks[task.id] = task
+            for task_id in self.budget.touch(task.id, _json_size(task)):
+                self.tasks.pop(task_id, None)
+
+    async def get(self, task_id: str) -> Task | None:
+        async with self.lock:
+            if self.budget.expire(task_id):
+                self.tasks.pop(task_id, None)
+                return None
+            task = self.tasks.get(task_id)
+            if task is not None:
+                for victim in self.budget.touch(task_id):
+                    self.tasks.pop(victim, None)
+            return task
+
+    async def delete(self, task_id: str) -> None:
+        await super().delete(task_id)
+        async with self.lock:
+            self.budget.discard(task_id)
+
+
+class BoundedMemoryService(InMemoryMemoryService):
+    """InMemoryMemoryService that forgets idle and least recently used sessions."""
+
+    def __init__(self, limits: Optional[StoreLimits] = None) -> None:
+        super().__init__()
+        self.budget = LruBudget(limits or StoreLimits())
+        # The budget is not thread-safe on its own.
+        self._budget_lock = threading.Lock()
+
+    def _evict(self, keys: list[tuple[str, str]]) -> None:
+        with self._lock:
+            for user_key, session_id in keys:
+                sessions = self._session_events.get(user_key, {})
+                sessions.pop(session_id, None)
+                if not sessions:
+                    self._session_events.pop(user_key, None)
+
+    async def add_session_to_memory(self, session: Session):
+        await super().add_session_to_memory(session)
+        user_key = _user_key(session.app_name, session.user_id)
+        with self._lock:
+            events = self._session_events.get(user_key, {}).get(session.id, [])
+        size = sum(_json_size(event) for event in events)
+        with self._budget_lock:
+            victims = self.budget.touch((user_key, session.id), size)
+        self._evict(victims)
+
+    async def search_memory(self, *, app_name: str, user_id: str, query: str):
+        user_key = _user_key(app_name, user_id)
+        with self._lock:
+            session_ids = list(self._session_events.get(user_key, {}))
+        with self._budget_lock:
+            expired = [(user_key, sid) for sid in session_ids if self.budget.expire((user_key, sid))]
+        self._evict(expired)
+        return await super().search_memory(app_name=app_name, user_id=user_id, query=query)
+
+
+def create_stores(kind: str, limits: Optional[StoreLimits] = None) -> dict:
+    """Returns session_service, memory_service and task_store for a store kind.
+
+    "memory" is the unbounded ADK/A2A defaults, "bounded" the classes above,
+    "indexed" the bounded stores with an IndexedMemoryService (indexed_memory.py).
+    """
+    if kind == "memory":
+        return {
+            "session_service": InMemorySessionService(),
+            "memory_service": InMemoryMemoryService(),
+            "task_store": InMemoryTaskStore(),
+        }
+    if kind == "bounded":
+        limits = limits or StoreLimits()
+        return {
+            "session_service": BoundedSessionService(limits),
+            "memory_service": BoundedMemoryService(limits),
+            "task_store": BoundedTaskStore(limits),
+        }
+    if kind == "indexed":
+        from indexed_memory import IndexedMemoryService
+
+        limits = limits or StoreLimits()
+        return {
+            "session_service": BoundedSessionService(limits),
+            "memory_service": IndexedMemoryService(limits),
+            "task_store": BoundedTaskStore(limits),
+        }
+    raise ValueError(f"Unknown A2A store kind {kind!r}; expected 'memory', 'bounded' or 'indexed'.")
+
+
+def render_store_metrics(stores: dict) -> str:
+    """Prometheus text gauges for the size and evictions of the bounded stores."""
+    lines = []
+    for metric, help_text in (
+        ("entries", "Entries held."),
+        ("bytes", "Approximate bytes held."),
+        ("evictions", "Entries evicted by the entry or byte limit."),
+        ("expirations", "Entries dropped after the idle TTL."),
+    ):
+        name = f"a2a_store_{metric}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for store_name, store in stores.items():
+            budget = getattr(store, "budget", None)
+            if budget is not None:
+                lines.append(f'{name}{{store="{store_name}"}} {budget.stats()[metric]}')
+    return "\n".join(lines) + "\n"
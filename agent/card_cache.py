@@ -0,0 +1,124 @@
+# card_cache.py
+"""
+Agent card caching on both ends of the A2A connection.
+
+Serving side: `CardEndpoint` serializes the agent card once at startup and
+serves those bytes with a strong ETag and a Cache-Control max-age. A
+request carrying a matching If-None-Match gets an empty 304.
+
+Summoner side: `AgentCardCache` keeps resolved cards per URL. Within
+`ttl_seconds` a card is served from memory. After that the next lookup
+revalidates it with a conditional GET, so an unchanged card costs a 304
+and no body. `prefetch` resolves several familiars concurrently, so a cold
+summoner does not fetch the cards one after another on its first route.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Optional
+
+import httpx
+from a2a.types import AgentCard
+from starlette.requests import Request
+from starlette.responses import Response
+
+from http_client import PooledHttpClient, http_client
+
+log = logging.getLogger(__name__)
+
+A2A_CARD_MAX_AGE_SECONDS = int(os.environ.get("A2A_CARD_MAX_AGE_SECONDS", 300))
+A2A_CARD_TTL_SECONDS = float(os.environ.get("A2A_CARD_TTL_SECONDS", 300))
+
+
+class CardEndpoint:
+    """Serves a pre-serialized agent card; route GET requests to `serve`."""
+
+    def __init__(self, agent_card: AgentCard, max_age: int = A2A_CARD_MAX_AGE_SECONDS) -> None:
+        self.body = agent_card.model_dump_json(exclude_none=True, by_alias=True).encode()
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.headers = {"ETag": self.etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    async def serve(self, request: Request) -> Response:
+        if_none_match = request.headers.get("if-none-match", "")
+        if self.etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=self.headers)
+        return Response(self.body, media_type="application/json", headers=self.headers)
+
+
+class _CachedCard:
+    __slots__ = ("card", "etag", "fetched_at")
+
+    def __init__(self, card: AgentCard, etag: Optional[str]) -> None:
+        self.card = card
+        self.etag = etag
+        self.fetched_at = time.monotonic()
+
+
+class AgentCardCache:
+    """Agent cards by URL, with a TTL and ETag revalidation."""
+
+    def __init__(self, ttl_seconds: float = A2A_CARD_TTL_SECONDS, client: Optional[PooledHttpClient] = None) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.client = client or http_client
+        self._cards: dict[str, _CachedCard] = {}
+        # One fetch per URL at a time; other callers wait for its result.
+        self._fetches: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.fetches = 0
+
+    def is_fresh(self, url: str) -> bool:
+        entry = self._cards.get(url)
+        return entry is not None and time.monotonic() - entry.fetched_at < self.ttl_seconds
+
+    async def get(self, url: str) -> AgentCard:
+        """Returns the card at url, fetching or revalidating it when needed.
+
+        Raises httpx.HTTPError if the card cannot be fetched and none is cached.
+        """
+        entry = self._cards.get(url)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.ttl_seconds:
+            self.hits += 1
+            return entry.card
+        pending = self._fetches.get(url)
+        if pending is None:
+            pending = self._fetches[url] = asyncio.ensure_future(self._fetch(url, entry))
+            pending.add_done_callback(lambda _: self._fetches.pop(url, None))
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, url: str, entry: Optional[_CachedCard]) -> AgentCard:
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        try:
+            response = await self.client.get(url, headers=headers)
+            if response.status_code == 304 and entry is not None:
+                self.revalidated += 1
+                entry.fetched_at = time.monotonic()
+                return entry.card
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if entry is None:
+                raise
+            # Keep routing with the card we have; try again after another TTL.
+            log.warning(f"Revalidating agent card {url} failed, keeping the cached one: {e}")
+            entry.fetched_at = time.monotonic()
+            return entry.card
+        self.fetches += 1
+        card = AgentCard.model_validate(response.json())
+        self._cards[url] = _CachedCard(card, response.headers.get("etag"))
+        return card
+
+    async def prefetch(self, urls: list[str]) -> None:
+        """Resolves several cards concurrently; failures are logged, not raised."""
+        results = await asyncio.gather(*(self.get(url) for url in urls), return_exceptions=True)
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                log.warning(f"Prefetching agent card {url} failed: {result}")
+
+    def stats(self) -> dict:
+        return {"cards": len(self._cards), "hits": self.hits, "revalidated": self.revalidated, "fetches": self.fetches}
+
+
+# Shared by every remote familiar in the process.
+agent_card_cache = AgentCardCache()
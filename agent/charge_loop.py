@@ -0,0 +1,253 @@
+# charge_loop.py
+"""
+Accumulation loops without a model turn per step.
+
+The earth familiar charges up in a LoopAgent: each iteration an LlmAgent
+calls seismic_charge (+2 energy) and decides whether the threshold has been
+reached. A charge of N costs N model turns and N tool round trips, although
+the tool is a pure accumulator and the outcome is known after the first
+call.
+
+ChargeLoopAgent replaces such a loop. It calls the tool once to learn the
+step (unless `step` is given), then finishes the charge in one of three
+ways:
+
+  closed_form  computes how many iterations remain and calls the tool once
+               more, with the input of the last iteration, so the final
+               message is the tool's own (default for pure tools)
+  batched      sends the remaining iterations as one batch_call_tools call
+               (in chunks of the server's batch limit)
+  iterative    calls the tool once per iteration, still without a model
+               (used for tools that are not known to be pure)
+
+Purity is read from the Arcane Forge registry (tools registered with
+pure=True) when the tool runs in-process (see local_tools.py). Over MCP the
+registry cannot be asked, so the tool names in `pure_tools`
+(CHARGE_PURE_TOOLS, default seismic_charge) are taken to be pure; pass
+pure=True or pure=False to decide for one agent. A closed-form result that
+does not match the prediction falls back to iterating from the value the
+tool returned. Batches likewise use the registry's limit in-process and
+`batch_size` (CHARGE_BATCH_SIZE) over MCP.
+
+Every run is capped at `max_iterations`. Events stay those of the loop:
+a function_call / function_response pair per tool call, the response
+carrying the state delta and, in custom_metadata, the iteration, the
+iterations the call stands for and its duration; then a final model-role
+text event with the last tool message.
+
+    ChargeLoopAgent(name="charge_loop", tools=[function_toolset], target="charge_target")
+"""
+import logging
+import math
+import os
+import re
+import time
+from typing import Any, AsyncGenerator, Callable, Optional, Union
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.adk.flows.llm_flows.functions import generate_client_function_call_id
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from pydantic import Field
+
+from tool_pipeline import function_call_event, function_response_event, resolve_tools, tool_result_value
+
+log = logging.getLogger(__name__)
+
+CHARGE_LOOP_MODES = ("closed_form", "batched", "iterative")
+CHARGE_LOOP_MODE = os.environ.get("CHARGE_LOOP_MODE", "closed_form")
+CHARGE_MAX_ITERATIONS = int(os.environ.get("CHARGE_MAX_ITERATIONS", 100))
+# Largest batch_call_tools request sent when the server's own limit is unknown (over MCP).
+CHARGE_BATCH_SIZE = int(os.environ.get("CHARGE_BATCH_SIZE", 64))
+# Comma-separated tools known to be pure, for when the registry cannot be asked.
+CHARGE_PURE_TOOLS = os.environ.get("CHARGE_PURE_TOOLS", "seismic_charge")
+
+
+def charge_value(result: Any) -> int:
+    """The last integer in a tool's result, e.g. 12 from "...accumulated to 12 units."."""
+    value = tool_result_value(result)
+    if isinstance(value, dict) and "result" in value:
+        value = value["result"]
+    if isinstance(value, bool):
+        raise ValueError(f"No charge value in {value!r}")
+    if isinstance(value, int):
+        return value
+    numbers = re.findall(r"-?\d+", str(value))
+    if not numbers:
+        raise ValueError(f"No charge value in {value!r}")
+    return int(numbers[-1])
+
+
+def _result_text(result: Any) -> str:
+    value = tool_result_value(result)
+    if isinstance(value, dict) and "result" in value:
+        value = value["result"]
+    return value if isinstance(value, str) else str(value)
+
+
+def _registry(tool: BaseTool):
+    # LocalMCPTool keeps the server's ToolRegistry; MCP tools have none.
+    return getattr(tool, "_registry", None)
+
+
+def _pure_tool_names(names: str) -> set[str]:
+    return {name.strip() for name in names.split(",") if name.strip()}
+
+
+class _ChargeError(Exception):
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class ChargeLoopAgent(BaseAgent):
+    """Runs an accumulation tool until state[state_key] reaches target, without a model."""
+
+    tools: list[Union[BaseTool, BaseToolset, Callable]] = []
+    tool: str = "seismic_charge"
+    arg_name: str = "current_energy"
+    state_key: str = "current_energy"
+    # An int, or the state key holding it.
+    target: Union[int, str]
+    start: int = 0
+    # Increase per call; learned from the first call when None.
+    step: Optional[int] = None
+    # None: ask the tool's registry in-process, else look the name up in pure_tools.
+    pure: Optional[bool] = None
+    pure_tools: set[str] = Field(default_factory=lambda: _pure_tool_names(CHARGE_PURE_TOOLS))
+    mode: str = CHARGE_LOOP_MODE
+    max_iterations: int = CHARGE_MAX_ITERATIONS
+    batch_tool: str = "batch_call_tools"
+    # None: the registry's max_batch_size in-process, else CHARGE_BATCH_SIZE.
+    batch_size: Optional[int] = None
+    # State key for the final tool message, like an LlmAgent's output_key.
+    output_key: Optional[str] = None
+    parse: Callable[[Any], int] = charge_value
+
+    def _event(self, ctx: InvocationContext, **kwargs) -> Event:
+        return Event(invocation_id=ctx.invocation_id, author=self.name, branch=ctx.branch, **kwargs)
+
+    def _is_pure(self, tool: BaseTool) -> bool:
+        if self.pure is not None:
+            return self.pure
+        registry = _registry(tool)
+        if registry is not None:
+            return tool.name in getattr(registry, "pure_tools", ())
+        return tool.name in self.pure_tools
+
+    def _batch_size(self, batch_tool: BaseTool) -> int:
+        if self.batch_size is not None:
+            return self.batch_size
+        return getattr(_registry(batch_tool), "max_batch_size", None) or CHARGE_BATCH_SIZE
+
+    def _target(self, state: dict) -> int:
+        return int(state[self.target]) if isinstance(self.target, str) else self.target
+
+    async def _call(self, ctx: InvocationContext, tool: BaseTool, args: dict, call_id: str) -> tuple[EventActions, Any, float]:
+        tool_context = ToolContext(ctx, function_call_id=call_id, event_actions=EventActions())
+        start = time.perf_counter()
+        try:
+            result = await tool.run_async(args=args, tool_context=tool_context)
+        except Exception as e:
+            raise _ChargeError("TOOL_ERROR", f"{tool.name}({args}) failed: {e}") from e
+        return tool_context.actions, result, time.perf_counter() - start
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        if self.mode not in CHARGE_LOOP_MODES:
+            yield self._event(ctx, error_code="CHARGE_MODE", error_message=f"Unknown charge loop mode {self.mode!r}; expected one of {CHARGE_LOOP_MODES}.")
+            return
+        tools = await resolve_tools(self.tools, ctx)
+        tool = tools.get(self.tool)
+        if tool is None:
+            yield self._event(ctx, error_code="TOOL_NOT_FOUND", error_message=f"No tool named {self.tool!r}.")
+            return
+        state = ctx.session.state
+        try:
+            target = self._target(state)
+        except (KeyError, TypeError, ValueError) as e:
+            yield self._event(ctx, error_code="CHARGE_TARGET", error_message=f"Cannot read the charge target: {e!r}")
+            return
+        current = int(state.get(self.state_key, self.start))
+        mode = self.mode if self._is_pure(tool) else "iterative"
+        step = self.step
+        iteration = 0
+        text = None
+
+        def response(call_id: str, actions: EventActions, result: Any, seconds: float, iterations: int, value: int, **extra) -> Event:
+            actions.state_delta[self.state_key] = value
+            return function_response_event(
+                self.name, ctx, call_id, tool.name, result, actions=actions,
+                custom_metadata={"charge_iteration": iteration, "iterations": iterations, "seconds": round(seconds, 6), "mode": mode, **extra},
+            )
+
+        try:
+            while current < target and iteration < self.max_iterations:
+                remaining = self.max_iterations - iteration
+                if step is not None and mode == "closed_form":
+                    needed = min(math.ceil((target - current) / step), remaining)
+                    predicted = current + needed * step
+                    # Only the last iteration is run; its input is what the loop would have passed.
+                    args = {self.arg_name: current + (needed - 1) * step}
+                    call_id = generate_client_function_call_id()
+                    yield function_call_event(self.name, ctx, call_id, tool.name, args)
+                    actions, result, seconds = await self._call(ctx, tool, args, call_id)
+                    value, iteration, text = self.parse(result), iteration + needed, _result_text(result)
+                    yield response(call_id, actions, result, seconds, needed, value, skipped=needed - 1)
+                    if value != predicted:
+                        log.warning(f"{self.name}: {tool.name} returned {value}, expected {predicted}; iterating")
+                        mode, step = "iterative", None
+                    current = value
+                elif step is not None and mode == "batched" and self.batch_tool in tools:
+                    needed = min(math.ceil((target - current) / step), remaining, self._batch_size(tools[self.batch_tool]))
+                    inputs = [current + i * step for i in range(needed)]
+                    calls = [{"name": tool.name, "arguments": {self.arg_name: value}} for value in inputs]
+                    _, batch, seconds = await self._call(ctx, tools[self.batch_tool], {"calls": calls}, generate_client_function_call_id())
+                    items = tool_result_value(batch)
+                    if not isinstance(items, list) or len(items) != needed:
+                        raise _ChargeError("TOOL_ERROR", f"{self.batch_tool} returned {batch!r}")
+                    # The batch runs its calls concurrently; each iteration is credited an equal share.
+                    for value, item in zip(inputs, items):
+                        if "error" in item:
+                            raise _ChargeError("TOOL_ERROR", f"{tool.name}({{{self.arg_name!r}: {value}}}) failed: {item['error']}")
+                        call_id = generate_client_function_call_id()
+                        yield function_call_event(self.name, ctx, call_id, tool.name, {self.arg_name: value})
+                        iteration, current, text = iteration + 1, self.parse(item["result"]), _result_text(item["result"])
+                        yield response(call_id, EventActions(), item["result"], seconds / needed, 1, current, batch_seconds=round(seconds, 6))
+                else:
+                    args = {self.arg_name: current}
+                    call_id = generate_client_function_call_id()
+                    yield function_call_event(self.name, ctx, call_id, tool.name, args)
+                    actions, result, seconds = await self._call(ctx, tool, args, call_id)
+                    value, iteration, text = self.parse(result), iteration + 1, _result_text(result)
+                    yield response(call_id, actions, result, seconds, 1, value)
+                    if step is None:
+                        step = value - current
+                        if step <= 0:
+                            raise _ChargeError("CHARGE_NOT_ACCUMULATING", f"{tool.name} went from {current} to {value}; it does not accumulate.")
+                    current = value
+        except _ChargeError as e:
+            yield self._event(ctx, error_code=e.code, error_message=str(e))
+            return
+        except ValueError as e:
+            yield self._event(ctx, error_code="CHARGE_PARSE", error_message=f"Cannot read the charge from {tool.name}: {e}")
+            return
+
+        capped = current < target
+        if capped:
+            log.warning(f"{self.name}: stopped at {current}/{target} after {iteration} iterations (max_iterations)")
+        if text is None:
+            text = f"The charge is already at {current} units."
+        state_delta = {self.state_key: current}
+        if self.output_key:
+            state_delta[self.output_key] = text
+        yield self._event(
+            ctx,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+            actions=EventActions(state_delta=state_delta),
+            custom_metadata={"iterations": iteration, "capped": capped, "target": target, "mode": mode},
+        )
@@ -0,0 +1,183 @@
+# cooldown_cache.py
+"""
+In-process cooldown cache for the familiars.
+
+The cooldown checks used to send a GET and then a POST to the Nexus
+`/cooldown/{familiar_name}` endpoints on every agent invocation. The
+CooldownGate below answers "still cooling down" from memory and only asks
+the Nexus when it holds no fresh entry for a familiar. That question is a
+single atomic `/cooldown/{familiar_name}/acquire` call; against an older
+Nexus it falls back to a GET and a background POST.
+"""
+import asyncio
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+
+import httpx
+
+from http_client import PooledHttpClient, http_client
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+def _parse_utc(timestamp: str) -> datetime:
+    """Parses an ISO timestamp from the Nexus; naive timestamps are taken to be UTC."""
+    parsed = datetime.fromisoformat(timestamp)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+class CooldownCache:
+    """A bounded LRU of familiar name -> last used time.
+
+    Entries expire once the cooldown window has passed, so a hit always
+    means the familiar is still resting.
+    """
+
+    def __init__(self, cooldown_seconds: int, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.cooldown_period = timedelta(seconds=cooldown_seconds)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, datetime] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def remaining(self, familiar_name: str, now: Optional[datetime] = None) -> Optional[timedelta]:
+        """Returns the cooldown left for a familiar, or None if it is not cached as resting."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            last_used = self._entries.get(familiar_name)
+            if last_used is None:
+                self.misses += 1
+                return None
+            elapsed = now - last_used
+            if elapsed >= self.cooldown_period:
+                # The window is over; drop the entry so the next check asks the Nexus.
+                del self._entries[familiar_name]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(familiar_name)
+            self.hits += 1
+            return self.cooldown_period - elapsed
+
+    def put(self, familiar_name: str, last_used: datetime) -> None:
+        """Records when a familiar was last used, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[familiar_name] = last_used
+            self._entries.move_to_end(familiar_name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class CooldownGate:
+    """Cooldown check backed by a CooldownCache and the Nexus cooldown API."""
+
+    def __init__(
+        self,
+        api_url: Optional[str],
+        cooldown_seconds: int,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        client: Optional[PooledHttpClient] = None,
+    ) -> None:
+        self.api_url = api_url
+        self.cache = CooldownCache(cooldown_seconds, max_entries=max_entries)
+        self.client = client or http_client
+        self._pending_writes: set[asyncio.Task] = set()
+        self._acquire_supported = True
+
+    @property
+    def cooldown_period(self) -> timedelta:
+        return self.cache.cooldown_period
+
+    async def acquire(self, familiar_name: str) -> Optional[timedelta]:
+        """Claims a familiar for this invocation.
+
+        Returns the remaining cooldown if the familiar is still resting, or
+        None once the familiar has been claimed. Raises httpx.HTTPError if
+        the Nexus cannot be reached.
+        """
+        now = datetime.now(timezone.utc)
+        remaining = self.cache.remaining(familiar_name, now)
+        if remaining is not None:
+            return remaining
+
+        # No fresh local entry: another instance may have used the familiar, so ask the Nexus.
+        if self._acquire_supported:
+            try:
+                acquired, last_used = await self._acquire(familiar_name, now)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (404, 405):
+                    raise
+                # Older Nexus without the acquire endpoint: fall back to GET + POST.
+                self._acquire_supported = False
+            else:
+                self.cache.put(familiar_name, last_used)
+                if acquired:
+                    return None
+                return max(self.cooldown_period - (now - last_used), timedelta(0))
+
+        last_used = await self._fetch_last_used(familiar_name)
+
+        # A concurrent invocation may have claimed the familiar while we waited.
+        remaining = self.cache.remaining(familiar_name, now)
+        if remaining is not None:
+            return remaining
+
+        if last_used is not None and now - last_used < self.cooldown_period:
+            self.cache.put(familiar_name, last_used)
+            return self.cooldown_period - (now - last_used)
+
+        self.cache.put(familiar_name, now)
+        self._store_in_background(familiar_name, now)
+        return None
+
+    async def flush(self) -> None:
+        """Waits for all background cooldown writes to finish."""
+        if self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes), return_exceptions=True)
+
+    async def _acquire(self, familiar_name: str, now: datetime) -> tuple[bool, datetime]:
+        """Atomic check-and-set on the Nexus; returns (acquired, last used time)."""
+        response = await self.client.post(
+            f"{self.api_url}/cooldown/{familiar_name}/acquire",
+            json={"timestamp": now.isoformat(), "cooldown_seconds": self.cooldown_period.total_seconds()},
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["acquired"], _parse_utc(data["time"])
+
+    async def _fetch_last_used(self, familiar_name: str) -> Optional[datetime]:
+        response = await self.client.get(f"{self.api_url}/cooldown/{familiar_name}")
+        response.raise_for_status()
+        last_used_str = response.json().get("time")
+        if not last_used_str:
+            return None
+        return _parse_utc(last_used_str)
+
+    async def _store_last_used(self, familiar_name: str, when: datetime) -> None:
+        response = await self.client.post(
+            f"{self.api_url}/cooldown/{familiar_name}",
+            json={"timestamp": when.isoformat()},
+        )
+        response.raise_for_status()
+
+    def _store_in_background(self, familiar_name: str, when: datetime) -> None:
+        task = asyncio.create_task(self._store_last_used(familiar_name, when))
+        self._pending_writes.add(task)
+
+        def _done(t: asyncio.Task) -> None:
+            self._pending_writes.discard(t)
+            if not t.cancelled() and t.exception() is not None:
+                print(f"[Cooldown] ERROR: Failed to update cooldown timestamp for '{familiar_name}': {t.exception()}")
+
+        task.add_done_callback(_done)
@@ -8,9 +8,14 @@ from google.genai import types
 import requests
 from datetime import datetime, timezone, timedelta
 import os
+from cooldown_cache import CooldownGate
 
 COOLDOWN_PERIOD_SECONDS = 60
 COOLDOWN_API_URL = os.environ.get("API_SERVER_URL")
 print(f"COOLDOWN_API_URL: {COOLDOWN_API_URL}")
 
+# Shared across invocations: "still cooling down" is answered from memory and
+# new timestamps are written to the Nexus in the background.
+cooldown_gate = CooldownGate(COOLDOWN_API_URL, COOLDOWN_PERIOD_SECONDS)
+
 #REPLACE-plugin
\ No newline at end of file
@@ -14,7 +14,9 @@ from google.genai import types
 import requests
 from datetime import datetime, timezone, timedelta
 from toolbox_core import ToolboxSyncClient
+from toolset_loader import ToolsetLoader
 from google.adk.agents.callback_context import CallbackContext
+from cooldown_cache import CooldownGate
 
 
 
@@ -25,6 +27,9 @@ COOLDOWN_PERIOD_SECONDS = 60
 COOLDOWN_API_URL = os.environ.get("API_SERVER_URL")
 print(f"COOLDOWN_API_URL: {COOLDOWN_API_URL}")
 
+# Cached cooldown state for this familiar (see cooldown_cache.py).
+cooldown_gate = CooldownGate(COOLDOWN_API_URL, COOLDOWN_PERIOD_SECONDS)
+
 
 
 logging.basicConfig(level=logging.INFO)
@@ -43,6 +48,11 @@ PUBLIC_URL = os.environ.get("PUBLIC_URL")
 print(f"FUNCTION_TOOLS_URL: {FUNCTION_TOOLS_URL}")
 print(f"PUBLIC_URL: {PUBLIC_URL}")
 
+# Connected at startup by to_a2a(..., toolsets=toolsets); see toolset_loader.py.
+toolsets = ToolsetLoader()
+# The Arcane Forge, in-process when importable; see local_tools.py.
+function_toolset = toolsets.add_function_tools("arcane-forge", FUNCTION_TOOLS_URL)
+
 
 #REPLACE-before_agent-function
 
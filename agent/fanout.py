@@ -0,0 +1,127 @@
+# fanout.py
+"""
+Parallel calls from the summoner to the remote familiars.
+
+An LlmAgent orchestrator transfers to one familiar at a time, so a summon
+that needs fire, water and earth costs the sum of their latencies.
+`parallel_summon` wraps the familiars in a ParallelAgent, so independent
+calls run concurrently and a summon costs about as much as the slowest
+familiar.
+
+FamiliarA2aAgent is a drop-in RemoteA2aAgent that:
+
+  * sends every familiar request through one shared, pooled HTTP client
+    instead of a client per agent;
+  * resolves its agent card through the shared AgentCardCache and
+    revalidates it once the cache TTL has passed;
+  * gives up on a familiar after `deadline_seconds` and reports an error
+    event instead of holding up the whole summon.
+
+Events stream through as the familiar sends them.
+"""
+import asyncio
+import os
+from typing import AsyncGenerator, Optional
+
+import httpx
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.parallel_agent import ParallelAgent
+from a2a.types import AgentCard
+from google.adk.agents.remote_a2a_agent import AgentCardResolutionError, RemoteA2aAgent
+from google.adk.events.event import Event
+
+from card_cache import AgentCardCache, agent_card_cache
+from http_client import PooledHttpClient
+
+FAMILIAR_TIMEOUT_SECONDS = float(os.environ.get("FAMILIAR_TIMEOUT_SECONDS", 600))
+FAMILIAR_DEADLINE_SECONDS = float(os.environ.get("FAMILIAR_DEADLINE_SECONDS", 120))
+
+# One pool for every familiar. Familiar calls run a model, so the read
+# timeout is much longer than the default outbound client's.
+familiar_http_client = PooledHttpClient(
+    timeout=httpx.Timeout(FAMILIAR_TIMEOUT_SECONDS, connect=10.0),
+)
+
+
+class FamiliarA2aAgent(RemoteA2aAgent):
+    """RemoteA2aAgent with a shared pooled client and card cache, and a deadline."""
+
+    def __init__(
+        self,
+        name: str,
+        agent_card,
+        *,
+        deadline_seconds: Optional[float] = FAMILIAR_DEADLINE_SECONDS,
+        http_client: PooledHttpClient = familiar_http_client,
+        card_cache: AgentCardCache = agent_card_cache,
+        **kwargs,
+    ) -> None:
+        super().__init__(name=name, agent_card=agent_card, **kwargs)
+        self._deadline_seconds = deadline_seconds
+        self._pooled_client = http_client
+        self._card_cache = card_cache
+        self._stats = {"calls": 0, "timeouts": 0}
+
+    @property
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+    async def _ensure_httpx_client(self) -> httpx.AsyncClient:
+        # The pooled client owns the connections; cleanup() must not close them.
+        self._httpx_client = self._pooled_client.client
+        self._httpx_client_needs_cleanup = False
+        return self._httpx_client
+
+    async def _resolve_agent_card_from_url(self, url: str) -> AgentCard:
+        try:
+            return await self._card_cache.get(url)
+        except Exception as e:
+            raise AgentCardResolutionError(f"Failed to resolve AgentCard from URL {url}: {e}") from e
+
+    async def _ensure_resolved(self) -> None:
+        source = self._agent_card_source
+        if self._is_resolved and source and source.startswith(("http://", "https://")) and not self._card_cache.is_fresh(source):
+            card = await self._resolve_agent_card_from_url(source)
+            if card is not self._agent_card:
+                # The familiar published a new card: rebuild the A2A client from it.
+                self._agent_card, self._a2a_client, self._is_resolved = card, None, False
+        await super()._ensure_resolved()
+
+    def _timeout_event(self, ctx: InvocationContext) -> Event:
+        self._stats["timeouts"] += 1
+        return Event(
+            author=self.name,
+            error_message=f"Familiar {self.name} did not answer within {self._deadline_seconds}s.",
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        self._stats["calls"] += 1
+        events = super()._run_async_impl(ctx)
+        loop = asyncio.get_running_loop()
+        deadline = None if self._deadline_seconds is None else loop.time() + self._deadline_seconds
+        try:
+            while True:
+                remaining = None if deadline is None else max(deadline - loop.time(), 0)
+                try:
+                    # The generator is paused between events, so the deadline
+                    # is enforced on each wait rather than across the yields.
+                    event = await asyncio.wait_for(events.__anext__(), timeout=remaining)
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    yield self._timeout_event(ctx)
+                    return
+                yield event
+        finally:
+            await events.aclose()
+
+
+def parallel_summon(name: str, familiars: list[RemoteA2aAgent], description: str = "") -> ParallelAgent:
+    """Runs the familiars concurrently; each answers in its own branch."""
+    return ParallelAgent(
+        name=name,
+        description=description or f"Summons {', '.join(f.name for f in familiars)} at the same time.",
+        sub_agents=familiars,
+    )
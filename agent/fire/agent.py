@@ -9,6 +9,7 @@ from google.adk.tools.mcp_tool.mcp_session_manager import SseServerParams
 import logging 
 import nest_asyncio 
 from toolbox_core import ToolboxSyncClient
+from toolset_loader import ToolsetLoader
 
 
 
@@ -34,6 +35,18 @@ PUBLIC_URL= os.environ.get("PUBLIC_URL")
 print(f"DB_TOOLS_URL: {DB_TOOLS_URL}")
 print(f"FUNCTION_TOOLS_URL: {FUNCTION_TOOLS_URL}")
 print(f"PUBLIC_URL: {PUBLIC_URL}")
+
+# Connected at startup by to_a2a(..., toolsets=toolsets); see toolset_loader.py.
+toolsets = ToolsetLoader()
+# With LORE_DB_URL set, lore lookups are answered from a local read-through
+# cache of the abilities table instead of the Toolbox (see lore_cache.py).
+LORE_DB_URL = os.environ.get("LORE_DB_URL")
+if LORE_DB_URL:
+    db_toolset = toolsets.add_lore_cache("librarium", LORE_DB_URL)
+else:
+    db_toolset = toolsets.add_toolbox("librarium", DB_TOOLS_URL, "summoner-librarium")
+# The Arcane Forge, in-process when importable; see local_tools.py.
+function_toolset = toolsets.add_function_tools("arcane-forge", FUNCTION_TOOLS_URL)
  
 #REPLACE-setup-MCP
 
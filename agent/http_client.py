@@ -0,0 +1,93 @@
+# http_client.py
+"""
+Shared async HTTP client for outbound calls from the familiars.
+
+Calls made with `requests` from inside ADK callbacks block the event loop
+and open a new connection each time, so one slow Nexus response stalls
+every other session in the process. PooledHttpClient keeps one keep-alive
+httpx.AsyncClient per event loop, caps the number of in-flight requests
+per host, and applies default timeouts.
+"""
+import asyncio
+import os
+import weakref
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 10))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("HTTP_CONNECT_TIMEOUT_SECONDS", 5))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+HTTP_MAX_CONCURRENCY_PER_HOST = int(os.environ.get("HTTP_MAX_CONCURRENCY_PER_HOST", 32))
+
+
+class _LoopState:
+    """The client and per-host semaphores owned by a single event loop."""
+
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.host_limits: dict[str, asyncio.Semaphore] = {}
+
+
+class PooledHttpClient:
+    """Keep-alive httpx client with per-host concurrency limits.
+
+    httpx clients and asyncio semaphores are bound to the loop they were
+    first used on. The agents run an import-time loop for initialization and
+    then uvicorn's loop, so each loop gets its own state.
+    """
+
+    def __init__(
+        self,
+        timeout: httpx.Timeout | None = None,
+        limits: httpx.Limits | None = None,
+        max_concurrency_per_host: int = HTTP_MAX_CONCURRENCY_PER_HOST,
+    ) -> None:
+        self.timeout = timeout or httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS)
+        self.limits = limits or httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None or state.client.is_closed:
+            state = _LoopState(httpx.AsyncClient(timeout=self.timeout, limits=self.limits))
+            self._states[loop] = state
+        return state
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying httpx client for the running loop."""
+        return self._state().client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        state = self._state()
+        host = urlsplit(url).netloc
+        limit = state.host_limits.get(host)
+        if limit is None:
+            limit = state.host_limits[host] = asyncio.Semaphore(self.max_concurrency_per_host)
+        async with limit:
+            return await state.client.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Closes the client of the running loop."""
+        loop = asyncio.get_running_loop()
+        state = self._states.pop(loop, None)
+        if state is not None:
+            await state.client.aclose()
+
+
+# The process-wide client every familiar module should use.
+http_client = PooledHttpClient()
@@ -0,0 +1,271 @@
+# indexed_memory.py
+"""
+Memory service for `load_memory` that searches an index instead of scanning.
+
+InMemoryMemoryService answers every search by re-tokenizing every stored
+event of every session of the user, so search cost grows linearly with
+history. IndexedMemoryService tokenizes each event once, when its session is
+added, and keeps per-user postings (word -> events). A search only touches
+the postings of the query's words and returns the same events the ADK
+service would: every event sharing at least one word with the query.
+
+With embeddings enabled (A2A_MEMORY_EMBEDDINGS=true, needs NumPy) each
+event is also embedded by HashEmbedder, a local feature-hashing embedder
+with no model or network call, and a search appends the `top_k` nearest
+events that the keyword match missed.
+
+Updates are incremental: re-adding a session indexes only its new events.
+Memory is capped by the same StoreLimits as the other bounded stores;
+least recently added sessions (and, with a TTL, idle ones) are dropped from the index.
+"""
+import hashlib
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from google.adk.events.event import Event
+from google.adk.memory import _utils
+from google.adk.memory.base_memory_service import BaseMemoryService, SearchMemoryResponse
+from google.adk.memory.memory_entry import MemoryEntry
+from google.adk.sessions.session import Session
+
+from bounded_stores import LruBudget, StoreLimits, _user_key
+
+try:
+    import numpy as np
+except ImportError:  # Keyword search only
+    np = None
+
+A2A_MEMORY_EMBEDDINGS = os.environ.get("A2A_MEMORY_EMBEDDINGS", "false").lower() == "true"
+A2A_MEMORY_EMBEDDING_DIM = int(os.environ.get("A2A_MEMORY_EMBEDDING_DIM", 256))
+A2A_MEMORY_TOP_K = int(os.environ.get("A2A_MEMORY_TOP_K", 5))
+A2A_MEMORY_MIN_SIMILARITY = float(os.environ.get("A2A_MEMORY_MIN_SIMILARITY", 0.3))
+
+# Approximate per-event bookkeeping (postings, dict slots) on top of its text.
+_EVENT_OVERHEAD_BYTES = 200
+
+
+def _words(text: str) -> frozenset[str]:
+    # Same tokenization as InMemoryMemoryService, so results match.
+    return frozenset(word.lower() for word in re.findall(r"[A-Za-z]+", text))
+
+
+def _event_text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return " ".join(part.text for part in event.content.parts if part.text)
+
+
+class HashEmbedder:
+    """Feature-hashed bag of words: each word adds +-1 to one of `dim` slots.
+
+    Deterministic across processes, so vectors do not depend on PYTHONHASHSEED.
+    """
+
+    def __init__(self, dim: int = A2A_MEMORY_EMBEDDING_DIM) -> None:
+        if np is None:
+            raise RuntimeError("HashEmbedder needs NumPy; install numpy or disable A2A_MEMORY_EMBEDDINGS.")
+        self.dim = dim
+        self._slot = lru_cache(maxsize=65536)(self._hash_slot)
+
+    def _hash_slot(self, word: str) -> tuple[int, float]:
+        digest = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), "little")
+        return digest % self.dim, 1.0 if digest >> 63 else -1.0
+
+    def embed(self, words: Iterable[str]) -> "np.ndarray":
+        """Unit-length vector; all zeros when there are no words."""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in words:
+            slot, sign = self._slot(word)
+            vector[slot] += sign
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Rows of unit vectors searched by dot product; freed rows are reused."""
+
+    def __init__(self, dim: int, capacity: int = 256) -> None:
+        self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self.doc_ids = np.full(capacity, -1, dtype=np.int64)
+        self.size = 0
+        self._free: list[int] = []
+
+    def add(self, doc_id: int, vector: "np.ndarray") -> int:
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self.size == len(self.matrix):
+                self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+                self.doc_ids = np.concatenate([self.doc_ids, np.full(len(self.doc_ids), -1, dtype=np.int64)])
+            row = self.size
+            self.size += 1
+        self.matrix[row] = vector
+        self.doc_ids[row] = doc_id
+        return row
+
+    def remove(self, row: int) -> None:
+        self.matrix[row] = 0
+        self.doc_ids[row] = -1
+        self._free.append(row)
+
+    def search(self, vector: "np.ndarray", k: int, min_similarity: float) -> list[tuple[int, float]]:
+        """Up to k (doc_id, similarity) pairs, most similar first."""
+        if not self.size or k <= 0:
+            return []
+        scores = self.matrix[: self.size] @ vector
+        k = min(k, self.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (int(self.doc_ids[row]), float(scores[row]))
+            for row in top
+            if scores[row] >= min_similarity and self.doc_ids[row] >= 0
+        ]
+
+
+class _Doc:
+    __slots__ = ("session_id", "entry", "words", "size", "row")
+
+    def __init__(self, session_id: str, entry: MemoryEntry, words: frozenset[str], size: int) -> None:
+        self.session_id = session_id
+        self.entry = entry
+        self.words = words
+        # Bytes charged to the session's budget entry for this event.
+        self.size = size
+        self.row: Optional[int] = None
+
+
+class _UserIndex:
+    """Postings and (optionally) vectors for the remembered events of one user."""
+
+    def __init__(self, embedder: Optional[HashEmbedder]) -> None:
+        self.docs: dict[int, _Doc] = {}
+        self.postings: dict[str, set[int]] = {}
+        # session_id -> event_id -> doc_id
+        self.sessions: dict[str, dict[str, int]] = {}
+        self.embedder = embedder
+        self.vectors = VectorIndex(embedder.dim) if embedder else None
+
+    def add(self, doc_id: int, doc: _Doc, event_id: str) -> None:
+        self.docs[doc_id] = doc
+        self.sessions.setdefault(doc.session_id, {})[event_id] = doc_id
+        for word in doc.words:
+            self.postings.setdefault(word, set()).add(doc_id)
+        if self.vectors is not None:
+            doc.row = self.vectors.add(doc_id, self.embedder.embed(doc.words))
+
+    def remove(self, doc_id: int) -> int:
+        """Unindexes a doc and returns its size."""
+        doc = self.docs.pop(doc_id)
+        for word in doc.words:
+            postings = self.postings[word]
+            postings.discard(doc_id)
+            if not postings:
+                del self.postings[word]
+        if doc.row is not None:
+            self.vectors.remove(doc.row)
+        return doc.size
+
+    def drop_session(self, session_id: str) -> None:
+        for doc_id in self.sessions.pop(session_id, {}).values():
+            self.remove(doc_id)
+
+    def keyword_hits(self, words: frozenset[str]) -> list[int]:
+        hits: set[int] = set()
+        for word in words:
+            hits |= self.postings.get(word, set())
+        # Doc ids increase as events are indexed, so this is insertion order.
+        return sorted(hits)
+
+
+class IndexedMemoryService(BaseMemoryService):
+    """Inverted-index (and optional embedding) memory with bounded size."""
+
+    def __init__(
+        self,
+        limits: Optional[StoreLimits] = None,
+        *,
+        embeddings: bool = A2A_MEMORY_EMBEDDINGS,
+        top_k: int = A2A_MEMORY_TOP_K,
+        min_similarity: float = A2A_MEMORY_MIN_SIMILARITY,
+    ) -> None:
+        self.budget = LruBudget(limits or StoreLimits())
+        self.embedder = HashEmbedder() if embeddings else None
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        self._users: dict[str, _UserIndex] = {}
+        self._next_doc_id = 0
+
+    def _drop(self, keys: list[tuple[str, str]]) -> None:
+        for user_key, session_id in keys:
+            index = self._users.get(user_key)
+            if index is None:
+                continue
+            index.drop_session(session_id)
+            if not index.sessions:
+                del self._users[user_key]
+
+    async def add_session_to_memory(self, session: Session):
+        user_key = _user_key(session.app_name, session.user_id)
+        with self._lock:
+            index = self._users.get(user_key)
+            if index is None:
+                index = self._users[user_key] = _UserIndex(self.embedder)
+            indexed = index.sessions.get(session.id, {})
+            current = {event.id for event in session.events}
+            # Events no longer in the session (e.g. a rewritten session) leave
+            # the index, and their bytes leave the budget.
+            added_bytes = 0
+            for event_id in [event_id for event_id in indexed if event_id not in current]:
+                added_bytes -= index.remove(indexed.pop(event_id))
+            for event in session.events:
+                if event.id in indexed:
+                    continue
+                text = _event_text(event)
+                words = _words(text)
+                if not words:
+                    continue
+                entry = MemoryEntry(
+                    content=event.content,
+                    author=event.author,
+                    timestamp=_utils.format_timestamp(event.timestamp),
+                )
+                size = len(text) + _EVENT_OVERHEAD_BYTES
+                index.add(self._next_doc_id, _Doc(session.id, entry, words, size), event.id)
+                self._next_doc_id += 1
+                added_bytes += size
+            index.sessions.setdefault(session.id, {})
+            self._drop(self.budget.grow((user_key, session.id), added_bytes))
+
+    async def search_memory(self, *, app_name: str, user_id: str, query: str) -> SearchMemoryResponse:
+        user_key = _user_key(app_name, user_id)
+        response = SearchMemoryResponse()
+        with self._lock:
+            index = self._users.get(user_key)
+            if index is None:
+                return response
+            self._drop([(user_key, sid) for sid in list(index.sessions) if self.budget.expire((user_key, sid))])
+            if user_key not in self._users:
+                return response
+            words = _words(query)
+            hits = index.keyword_hits(words)
+            if index.vectors is not None and words:
+                seen = set(hits)
+                for doc_id, _ in index.vectors.search(self.embedder.embed(words), self.top_k + len(seen), self.min_similarity):
+                    if doc_id not in seen and len(hits) - len(seen) < self.top_k:
+                        hits.append(doc_id)
+            response.memories.extend(index.docs[doc_id].entry for doc_id in hits)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "events": sum(len(index.docs) for index in self._users.values()),
+                "words": sum(len(index.postings) for index in self._users.values()),
+                **self.budget.stats(),
+            }
@@ -0,0 +1,88 @@
+# local_tools.py
+"""
+In-process binding of MCP server tools that are importable in this container.
+
+When the Arcane Forge's tool module (mcp-servers/general/forge_tools.py) is
+on disk next to an element agent, calling its tools through MCPToolset still
+costs an SSE round trip and two JSON encodings per multiplier or accumulator
+step. `local_tools` imports that module instead and returns one LocalMCPTool
+per tool its ToolRegistry serves. The module only registers tools; the
+server (main.py) imports it too.
+
+A LocalMCPTool is an MCPTool built from the same advertised MCP schema, so
+the model sees the same declaration. Calls go straight to
+`registry.call`, the function the server's call_tool handler runs, so
+results, caching, metrics and error text are the same as over MCP.
+
+FUNCTION_TOOLS_MODE selects the path (see ToolsetLoader.add_function_tools):
+
+  auto   local when the module imports, otherwise MCP (default)
+  local  local only; fail if the module is missing
+  mcp    always MCP
+"""
+import importlib.util
+import logging
+import os
+import sys
+from typing import Any, Optional
+
+from google.adk.tools.mcp_tool.mcp_tool import MCPTool
+from mcp import types as mcp_types
+
+log = logging.getLogger(__name__)
+
+FUNCTION_TOOLS_MODES = ("auto", "local", "mcp")
+FUNCTION_TOOLS_MODE = os.environ.get("FUNCTION_TOOLS_MODE", "auto")
+# The Arcane Forge's tool module; the default is its place in this repository.
+ARCANE_FORGE_MODULE = os.environ.get(
+    "ARCANE_FORGE_MODULE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp-servers", "general", "forge_tools.py"),
+)
+
+_modules: dict[str, Any] = {}
+
+
+class LocalMCPTool(MCPTool):
+    """An MCP server's tool called in-process through its ToolRegistry."""
+
+    def __init__(self, mcp_tool: mcp_types.Tool, registry) -> None:
+        # No session manager: nothing is sent over the wire.
+        super().__init__(mcp_tool=mcp_tool, mcp_session_manager=None)
+        self._registry = registry
+
+    async def _run_async_impl(self, *, args, tool_context, credential) -> mcp_types.CallToolResult:
+        # What the server's call_tool handler would have sent back.
+        return mcp_types.CallToolResult(content=await self._registry.call(self.name, args), isError=False)
+
+
+def _import_server(path: str):
+    """Imports an MCP server's tool module by file path, once; None if it is not there."""
+    if path in _modules:
+        return _modules[path]
+    if not os.path.isfile(path):
+        return None
+    module_name = f"_local_mcp_{os.path.basename(os.path.dirname(path))}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(module_name, None)
+        raise
+    _modules[path] = module
+    return module
+
+
+def local_tools(path: str = ARCANE_FORGE_MODULE) -> Optional[list[LocalMCPTool]]:
+    """The tools of the module at path, or None if it cannot be imported."""
+    try:
+        module = _import_server(path)
+    except Exception as e:
+        # Missing dependencies or a module that fails to load: use MCP.
+        log.info(f"{path} is not importable here ({e!r}); using MCP")
+        return None
+    registry = getattr(module, "registry", None) if module else None
+    if registry is None:
+        return None
+    return [LocalMCPTool(tool, registry) for tool in registry.mcp_tools]
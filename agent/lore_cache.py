@@ -0,0 +1,199 @@
+# lore_cache.py
+"""
+Read-through cache of the Librarium's `abilities` table.
+
+Every librarian lookup used to be a Toolbox call and a Cloud SQL query,
+although the table (see prerequisite/db_setup.py) almost never changes.
+AbilitiesCache loads the whole table once and answers lookups from
+in-memory indexes by familiar_name, ability_name and element, matched
+case-insensitively.
+
+Freshness: at most every `check_seconds` a lookup runs one cheap version
+query. Only if its result changed is the table loaded again. If the
+database cannot be reached, lookups keep answering from the last snapshot.
+
+The version is the `lore_version` row that prerequisite/lore_loader.py
+bumps in the same transaction as every load, together with the row count,
+highest id and sum of damage points, which also catch most writes that do
+not bump it. Row count and highest id alone are not enough: an upsert
+changes no count, and a replace re-inserts the same ids. Without a
+`lore_version` table only the row statistics are compared.
+
+Any SQLAlchemy URL works, so a local SQLite file with the same `abilities`
+table can stand in for Cloud SQL:
+
+    LORE_DB_URL=sqlite:///librarium.db
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import sqlalchemy
+from google.adk.tools.function_tool import FunctionTool
+
+log = logging.getLogger(__name__)
+
+LORE_DB_URL = os.environ.get("LORE_DB_URL")
+LORE_CACHE_CHECK_SECONDS = float(os.environ.get("LORE_CACHE_CHECK_SECONDS", 30))
+
+SELECT_ABILITIES = "SELECT id, familiar_name, ability_name, damage_points, element FROM abilities"
+# Bumped by every writer that goes through prerequisite/lore_loader.py.
+LORE_VERSION_TABLE = "lore_version"
+ABILITIES_VERSION = (
+    "SELECT (SELECT COALESCE(MAX(version), 0) FROM lore_version WHERE table_name = 'abilities'), "
+    "COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(damage_points), 0) FROM abilities"
+)
+# For databases without a lore_version table.
+ABILITIES_CHECKSUM = "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(damage_points), 0) FROM abilities"
+
+
+@dataclass(frozen=True)
+class Ability:
+    id: int
+    familiar_name: str
+    ability_name: str
+    damage_points: int
+    element: str
+
+    def as_dict(self) -> dict:
+        return {
+            "familiar_name": self.familiar_name,
+            "ability_name": self.ability_name,
+            "damage_points": self.damage_points,
+            "element": self.element,
+        }
+
+
+class _Snapshot:
+    """One load of the table; replaced as a whole, never modified."""
+
+    def __init__(self, rows: list[Ability], version: tuple) -> None:
+        self.version = version
+        self.by_familiar: dict[str, list[Ability]] = {}
+        self.by_ability: dict[str, Ability] = {}
+        self.by_element: dict[str, list[Ability]] = {}
+        for row in rows:
+            self.by_familiar.setdefault(row.familiar_name.casefold(), []).append(row)
+            self.by_ability[row.ability_name.casefold()] = row
+            self.by_element.setdefault(row.element.casefold(), []).append(row)
+        self.rows = len(rows)
+
+
+class AbilitiesCache:
+    """The abilities table in memory, revalidated by a version query."""
+
+    def __init__(
+        self,
+        db: Union[str, sqlalchemy.Engine],
+        *,
+        check_seconds: float = LORE_CACHE_CHECK_SECONDS,
+        version_query: Optional[str] = None,
+    ) -> None:
+        self.engine = sqlalchemy.create_engine(db) if isinstance(db, str) else db
+        self.check_seconds = check_seconds
+        # None: ABILITIES_VERSION, or ABILITIES_CHECKSUM without a lore_version table.
+        self.version_query = version_query
+        # The query in use; chosen again on every load.
+        self._version_query = version_query or ABILITIES_VERSION
+        self._snapshot: Optional[_Snapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.checks = 0
+        self.check_errors = 0
+
+    def _version(self, conn) -> tuple:
+        return tuple(conn.execute(sqlalchemy.text(self._version_query)).one())
+
+    def load(self) -> None:
+        """Reads the whole table and swaps in new indexes."""
+        with self.engine.connect() as conn:
+            self._version_query = self.version_query or (
+                ABILITIES_VERSION if sqlalchemy.inspect(conn).has_table(LORE_VERSION_TABLE) else ABILITIES_CHECKSUM
+            )
+            version = self._version(conn)
+            rows = [Ability(*row) for row in conn.execute(sqlalchemy.text(SELECT_ABILITIES))]
+        self._snapshot = _Snapshot(rows, version)
+        self._checked_at = time.monotonic()
+        self.loads += 1
+        log.info(f"Loaded {len(rows)} abilities (version {version})")
+
+    def is_due(self) -> bool:
+        return self._snapshot is None or time.monotonic() - self._checked_at >= self.check_seconds
+
+    def refresh(self) -> None:
+        """Loads the table if it is not loaded yet or its version changed."""
+        with self._lock:
+            if not self.is_due():
+                return
+            if self._snapshot is None:
+                self.load()
+                return
+            self.checks += 1
+            try:
+                with self.engine.connect() as conn:
+                    version = self._version(conn)
+                if version != self._snapshot.version:
+                    self.load()
+            except sqlalchemy.exc.SQLAlchemyError as e:
+                self.check_errors += 1
+                log.warning(f"Abilities version check failed, serving the cached table: {e}")
+            self._checked_at = time.monotonic()
+
+    def _current(self) -> _Snapshot:
+        self.refresh()
+        return self._snapshot
+
+    def abilities_of_familiar(self, familiar_name: str) -> list[Ability]:
+        return list(self._current().by_familiar.get(familiar_name.strip().casefold(), []))
+
+    def ability(self, ability_name: str) -> Optional[Ability]:
+        return self._current().by_ability.get(ability_name.strip().casefold())
+
+    def abilities_by_element(self, element: str) -> list[Ability]:
+        return list(self._current().by_element.get(element.strip().casefold(), []))
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    def stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "rows": snapshot.rows if snapshot else 0,
+            "version": list(snapshot.version) if snapshot else None,
+            "loads": self.loads,
+            "checks": self.checks,
+            "check_errors": self.check_errors,
+        }
+
+
+def lore_tools(cache: AbilitiesCache) -> list[FunctionTool]:
+    """The librarian's lookups as tools answered from the cache.
+
+    A version check (a database round trip) runs off the event loop; every
+    other lookup is a dict access.
+    """
+
+    async def current() -> AbilitiesCache:
+        if cache.is_due():
+            await asyncio.to_thread(cache.refresh)
+        return cache
+
+    async def get_familiar_abilities(familiar_name: str) -> list[dict]:
+        """Lists the abilities of a familiar with their damage points and element."""
+        return [row.as_dict() for row in (await current()).abilities_of_familiar(familiar_name)]
+
+    async def get_ability_damage(ability_name: str) -> dict:
+        """Returns the familiar, base damage points and element of an ability."""
+        row = (await current()).ability(ability_name)
+        return row.as_dict() if row else {"error": f"No ability named {ability_name!r}."}
+
+    async def get_element_abilities(element: str) -> list[dict]:
+        """Lists the abilities of an element (e.g. Fire, Water, Earth)."""
+        return [row.as_dict() for row in (await current()).abilities_by_element(element)]
+
+    return [FunctionTool(get_familiar_abilities), FunctionTool(get_ability_damage), FunctionTool(get_element_abilities)]
@@ -0,0 +1,185 @@
+# response_cache_plugin.py
+"""
+Caches model responses for repeated identical requests.
+
+Summoner, librarian and battlemage turns often send the same prompt with
+the same tools again. ResponseCachePlugin answers such a request from
+memory in `before_model_callback`, so the model is not called, and stores
+final responses in `after_model_callback`.
+
+The key is a SHA-256 of the normalized request: model, system instruction,
+contents, tool declarations and generation settings. Normalization drops
+what changes between otherwise identical requests: per-call function call
+ids, request labels and HTTP options.
+
+Entries expire `ttl_seconds` after they are stored and the least recently
+used are dropped beyond `max_entries`. Agents whose answers must not be
+reused (anything reading live state through its prompt) opt out with
+`exclude_agents`. Partial (streamed) chunks and error responses are never
+cached.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+
+LLM_CACHE_TTL_SECONDS = float(os.environ.get("LLM_CACHE_TTL_SECONDS", 300))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", 1000))
+LLM_CACHE_EXCLUDE_AGENTS = [
+    name.strip() for name in os.environ.get("LLM_CACHE_EXCLUDE_AGENTS", "").split(",") if name.strip()
+]
+
+# Config fields that do not change the answer.
+_IGNORED_CONFIG_FIELDS = {"labels", "http_options"}
+
+
+def _strip_ids(value: Any) -> Any:
+    """Drops the per-call "id" of function calls and responses, recursively."""
+    if isinstance(value, dict):
+        return {
+            key: _strip_ids(item)
+            for key, item in value.items()
+            if not (key == "id" and ("name" in value and ("args" in value or "response" in value)))
+        }
+    if isinstance(value, list):
+        return [_strip_ids(item) for item in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """Stable hash of everything in the request that can change the response."""
+    config = {}
+    if llm_request.config is not None:
+        config = llm_request.config.model_dump(mode="json", exclude_none=True, exclude=_IGNORED_CONFIG_FIELDS)
+    normalized = {
+        "model": llm_request.model,
+        "config": config,
+        "contents": [content.model_dump(mode="json", exclude_none=True) for content in llm_request.contents],
+    }
+    payload = json.dumps(_strip_ids(normalized), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCachePlugin(BasePlugin):
+    """Serves repeated model requests from a TTL + LRU cache."""
+
+    def __init__(
+        self,
+        name: str = "response_cache",
+        *,
+        ttl_seconds: float = LLM_CACHE_TTL_SECONDS,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        exclude_agents: Iterable[str] = LLM_CACHE_EXCLUDE_AGENTS,
+    ) -> None:
+        super().__init__(name)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.exclude_agents = set(exclude_agents)
+        # key -> (stored at, response), least recently used first.
+        self._entries: OrderedDict[str, tuple[float, LlmResponse]] = OrderedDict()
+        # (invocation_id, agent_name) -> key of the request now at the model.
+        # Cleared per call in the after-model and error callbacks, and per
+        # invocation in after_run_callback for calls that never reached the
+        # model (an agent's own before_model_callback answered instead).
+        self._pending: dict[tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def before_model_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        if callback_context.agent_name in self.exclude_agents:
+            self.bypassed += 1
+            return None
+        key = request_key(llm_request)
+        pending = (callback_context.invocation_id, callback_context.agent_name)
+        with self._lock:
+            self._pending.pop(pending, None)
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                # A copy, so later callbacks cannot modify the cached response.
+                response = entry[1].model_copy(deep=True)
+                response.custom_metadata = {**(response.custom_metadata or {}), "response_cache": "hit"}
+                return response
+            self.misses += 1
+            self._pending[pending] = key
+        return None
+
+    async def after_model_callback(
+        self, *, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        if llm_response.partial:
+            return None
+        with self._lock:
+            key = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+            if key is None or llm_response.error_code or llm_response.content is None:
+                return None
+            self._entries[key] = (time.monotonic(), llm_response.model_copy(deep=True))
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return None
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> Optional[LlmResponse]:
+        with self._lock:
+            self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        with self._lock:
+            for pending in [pending for pending in self._pending if pending[0] == invocation_context.invocation_id]:
+                del self._pending[pending]
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def render_metrics(self) -> str:
+        """Prometheus text gauges, in the format of the /metrics endpoints."""
+        lines = []
+        for metric, value in self.stats().items():
+            name = f"llm_response_cache_{metric}"
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f'{name}{{plugin="{self.name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+# Shared by the runners in this process; add it to a Runner's plugins.
+response_cache_plugin = ResponseCachePlugin()
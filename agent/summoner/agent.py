@@ -17,6 +17,15 @@ print(f"FIRE_URL: {FIRE_URL}")
 print(f"WATER_URL: {WATER_URL}")
 print(f"EARTH_URL: {EARTH_URL}")
 
+# FamiliarA2aAgent is a drop-in RemoteA2aAgent with a shared connection
+# pool and a per-familiar deadline; parallel_summon runs familiars
+# concurrently instead of one transfer at a time (see fanout.py).
+from fanout import FamiliarA2aAgent, parallel_summon
+from card_cache import agent_card_cache
+
+# The familiars' cards, fetched together at startup (see card_cache.py)
+FAMILIAR_CARD_URLS = [f"{url.rstrip('/')}{AGENT_CARD_WELL_KNOWN_PATH}" for url in (FIRE_URL, WATER_URL, EARTH_URL)]
+
 
 #REPLACE-remote-agents
 
@@ -34,5 +43,7 @@ PUBLIC_URL = os.environ.get("PUBLIC_URL","http://0.0.0.0:8080")
 
 if __name__ == "__main__":
     import uvicorn
+    import functools
     a2a_app = to_a2a(root_agent, port=8080, public_url=PUBLIC_URL)
+    a2a_app.add_event_handler("startup", functools.partial(agent_card_cache.prefetch, FAMILIAR_CARD_URLS))
     uvicorn.run(a2a_app, host='0.0.0.0', port=8080)
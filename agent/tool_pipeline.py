@@ -0,0 +1,170 @@
+# tool_pipeline.py
+"""
+Deterministic tool steps for a SequentialAgent.
+
+An LlmAgent step whose only job is to call one tool with arguments taken
+from earlier steps costs a model turn to decide the call and another to
+read the result. ToolPipelineAgent runs such steps as a compiled pipeline:
+each ToolStep maps the session state (including the outputs of earlier
+steps) to a tool's arguments, calls the tool directly and writes its
+result to state under `output_key`. No model is called.
+
+Pipelines and LlmAgents mix freely in a SequentialAgent, so steps that
+need reasoning (picking the ability from a free-form request, narrating
+the result) stay LLM steps:
+
+    SequentialAgent(name="fire_summon", sub_agents=[
+        LlmAgent(..., output_key="ability_name"),          # reasoning
+        ToolPipelineAgent(name="fire_pipeline", tools=[db_toolset, function_toolset], steps=[
+            ToolStep("get_ability_damage", lambda s: {"ability_name": s["ability_name"]}, "ability"),
+            ToolStep("inferno_resonance", lambda s: {"base_fire_damage": s["ability"]["damage_points"]}, "fire_result"),
+        ]),
+    ])
+
+The pipeline emits the same events an LlmAgent's tool calls would: a
+function_call event and a function_response event per step, the latter
+carrying the state delta. Each response event also records the step's
+duration in custom_metadata.
+"""
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Optional, Union
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.adk.flows.llm_flows.functions import generate_client_function_call_id
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from mcp import types as mcp_types
+
+
+def tool_result_value(result: Any) -> Any:
+    """A tool result as plain data: MCP text content is unwrapped and JSON-decoded."""
+    if isinstance(result, mcp_types.CallToolResult):
+        texts = [item.text for item in result.content if isinstance(item, mcp_types.TextContent)]
+        result = texts[0] if len(texts) == 1 else texts
+    if isinstance(result, str):
+        try:
+            return json.loads(result)
+        except ValueError:
+            return result
+    return result
+
+
+def _response_dict(result: Any) -> dict:
+    # The function_response payload an LlmAgent would have recorded.
+    if isinstance(result, mcp_types.CallToolResult):
+        return result.model_dump(exclude_none=True)
+    return result if isinstance(result, dict) else {"result": result}
+
+
+async def resolve_tools(tools: list, ctx: InvocationContext) -> dict[str, BaseTool]:
+    """Tools by name from toolsets, BaseTools and plain functions."""
+    resolved: dict[str, BaseTool] = {}
+    for tool in tools:
+        if isinstance(tool, BaseToolset):
+            for member in await tool.get_tools(ReadonlyContext(ctx)):
+                resolved[member.name] = member
+        elif isinstance(tool, BaseTool):
+            resolved[tool.name] = tool
+        else:
+            function_tool = FunctionTool(tool)
+            resolved[function_tool.name] = function_tool
+    return resolved
+
+
+def function_call_event(author: str, ctx: InvocationContext, call_id: str, name: str, args: dict) -> Event:
+    return Event(
+        invocation_id=ctx.invocation_id,
+        author=author,
+        branch=ctx.branch,
+        content=types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(id=call_id, name=name, args=args))],
+        ),
+    )
+
+
+def function_response_event(
+    author: str,
+    ctx: InvocationContext,
+    call_id: str,
+    name: str,
+    result: Any,
+    actions: Optional[EventActions] = None,
+    custom_metadata: Optional[dict] = None,
+) -> Event:
+    return Event(
+        invocation_id=ctx.invocation_id,
+        author=author,
+        branch=ctx.branch,
+        content=types.Content(
+            role="user",
+            parts=[types.Part(function_response=types.FunctionResponse(id=call_id, name=name, response=_response_dict(result)))],
+        ),
+        actions=actions or EventActions(),
+        custom_metadata=custom_metadata,
+    )
+
+
+@dataclass
+class ToolStep:
+    """Call `tool` with `args(state)` and store `output(result)` in state[output_key]."""
+
+    tool: str
+    args: Callable[[dict], dict]
+    output_key: Optional[str] = None
+    output: Callable[[Any], Any] = tool_result_value
+
+
+class ToolPipelineAgent(BaseAgent):
+    """Runs ToolSteps in order, without a model, and stops at the first failure."""
+
+    steps: list[ToolStep]
+    tools: list[Union[BaseTool, BaseToolset, Callable]] = []
+
+    def _event(self, ctx: InvocationContext, **kwargs) -> Event:
+        return Event(invocation_id=ctx.invocation_id, author=self.name, branch=ctx.branch, **kwargs)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        tools = await resolve_tools(self.tools, ctx)
+        state = dict(ctx.session.state)
+        for index, step in enumerate(self.steps):
+            tool = tools.get(step.tool)
+            if tool is None:
+                yield self._event(ctx, error_code="TOOL_NOT_FOUND", error_message=f"Pipeline step {index}: no tool named {step.tool!r}.")
+                return
+            start = time.perf_counter()
+            try:
+                args = step.args(state)
+            except (KeyError, TypeError, ValueError) as e:
+                yield self._event(ctx, error_code="PIPELINE_ARGS", error_message=f"Pipeline step {index} ({step.tool}): cannot build arguments: {e!r}")
+                return
+
+            call_id = generate_client_function_call_id()
+            yield function_call_event(self.name, ctx, call_id, tool.name, args)
+
+            tool_context = ToolContext(ctx, function_call_id=call_id, event_actions=EventActions())
+            try:
+                result = await tool.run_async(args=args, tool_context=tool_context)
+            except Exception as e:
+                yield self._event(ctx, error_code="TOOL_ERROR", error_message=f"Pipeline step {index} ({step.tool}) failed: {e}")
+                return
+            # Tools may write state themselves through tool_context.state.
+            state.update(tool_context.actions.state_delta)
+            if step.output_key:
+                state[step.output_key] = step.output(result)
+                tool_context.actions.state_delta[step.output_key] = state[step.output_key]
+
+            yield function_response_event(
+                self.name, ctx, call_id, tool.name, result,
+                actions=tool_context.actions,
+                custom_metadata={"pipeline_step": index, "seconds": round(time.perf_counter() - start, 6)},
+            )
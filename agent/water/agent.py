@@ -10,6 +10,7 @@ from google.adk.tools.mcp_tool.mcp_session_manager import SseServerParams
 import logging 
 import nest_asyncio 
 from toolbox_core import ToolboxSyncClient
+from toolset_loader import ToolsetLoader
 
 
 
@@ -33,6 +34,12 @@ PUBLIC_URL = os.environ.get("PUBLIC_URL")
 print(f"API_TOOLS_URL: {API_TOOLS_URL}")
 print(f"FUNCTION_TOOLS_URL: {FUNCTION_TOOLS_URL}")
 print(f"PUBLIC_URL: {PUBLIC_URL}")
+
+# Connected at startup by to_a2a(..., toolsets=toolsets); see toolset_loader.py.
+toolsets = ToolsetLoader()
+api_toolset = toolsets.add_mcp("nexus-of-whispers", API_TOOLS_URL)
+# The Arcane Forge, in-process when importable; see local_tools.py.
+function_toolset = toolsets.add_function_tools("arcane-forge", FUNCTION_TOOLS_URL)
  
 
 #REPLACE-setup-MCP
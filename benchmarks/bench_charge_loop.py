@@ -0,0 +1,159 @@
+# benchmarks/bench_charge_loop.py
+"""
+Cost of charging the earth familiar: a LoopAgent over an LlmAgent versus
+agent/charge_loop.py.
+
+All variants charge from 0 to --charges * 2 with a local copy of
+seismic_charge (+2 per call) that answers after --tool-delay-ms, the
+round trip to the Arcane Forge. The loop's model is a scripted stub that
+answers after --model-delay-ms, so no API key is needed.
+
+  llm_loop     LoopAgent(LlmAgent(tools=[seismic_charge, exit_loop])): two
+               model calls per charge (the call, then reading the result),
+               plus one to exit
+  iterative    ChargeLoopAgent, one tool call per charge, no model
+  batched      ChargeLoopAgent, one call to learn the step, then one
+               batch_call_tools call
+  closed_form  ChargeLoopAgent, one call to learn the step, then one call
+               for the last charge
+
+Reports model calls, tool round trips and latency per charge size.
+
+Usage:
+    python benchmarks/bench_charge_loop.py [--charges 10 50] [--repeats 5] [--model-delay-ms 300]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent"))
+from google.adk.agents.llm_agent import LlmAgent  # noqa: E402
+from google.adk.agents.loop_agent import LoopAgent  # noqa: E402
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions.in_memory_session_service import InMemorySessionService  # noqa: E402
+from google.adk.tools.exit_loop_tool import exit_loop  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from charge_loop import ChargeLoopAgent  # noqa: E402
+from bench_utils import StubLlm, new_report, summarize, transcript, write_report  # noqa: E402
+
+APP_NAME = "earth"
+USER_ID = "bench"
+MODES = ("llm_loop", "iterative", "batched", "closed_form")
+
+
+class Forge:
+    """seismic_charge and batch_call_tools behind a simulated round trip."""
+
+    def __init__(self, delay_seconds: float) -> None:
+        self.delay_seconds = delay_seconds
+        self.round_trips = 0
+
+    def tools(self) -> list:
+        async def seismic_charge(current_energy: int) -> str:
+            """Increments the current energy charge by 2 units."""
+            self.round_trips += 1
+            await asyncio.sleep(self.delay_seconds)
+            return self._charge(current_energy)
+
+        async def batch_call_tools(calls: list[dict]) -> list[dict]:
+            """Runs many tool calls in one round trip."""
+            self.round_trips += 1
+            await asyncio.sleep(self.delay_seconds)
+            return [{"name": call["name"], "result": self._charge(call["arguments"]["current_energy"])} for call in calls]
+
+        return [seismic_charge, batch_call_tools]
+
+    @staticmethod
+    def _charge(current_energy: int) -> str:
+        return f"The ground trembles as seismic energy is absorbed. The power charge has accumulated to {current_energy + 2} units."
+
+
+class ScriptedLlm(StubLlm):
+    """Charges with seismic_charge until the target in the request, then calls exit_loop."""
+
+    def respond(self, llm_request: LlmRequest) -> types.Part:
+        text = transcript(llm_request)
+        target = int(re.search(r"to (\d+) units", text).group(1))
+        charges = re.findall(r"accumulated to (\d+) units", text)
+        current = int(charges[-1]) if charges else 0
+        last = llm_request.contents[-1].parts[0]
+        if last.function_response is not None:
+            return types.Part(text=f"The charge is at {current} units.")
+        if current >= target:
+            return types.Part(function_call=types.FunctionCall(name="exit_loop", args={}))
+        return types.Part(function_call=types.FunctionCall(name="seismic_charge", args={"current_energy": current}))
+
+
+def build_agent(mode: str, forge: Forge, model: ScriptedLlm, target: int, max_iterations: int):
+    if mode == "llm_loop":
+        charger = LlmAgent(
+            name="charger", model=model, tools=[forge.tools()[0], exit_loop],
+            instruction="Call seismic_charge with the current energy; once it reaches the target, call exit_loop.",
+        )
+        return LoopAgent(name="charge_loop", sub_agents=[charger], max_iterations=max_iterations)
+    return ChargeLoopAgent(
+        name="charge_loop", tools=forge.tools(), target=target, mode=mode, pure=True, max_iterations=max_iterations,
+    )
+
+
+async def run(mode: str, charges: int, args) -> dict:
+    forge = Forge(args.tool_delay_ms / 1000)
+    model = ScriptedLlm(model="stub", delay_seconds=args.model_delay_ms / 1000)
+    target = charges * 2
+    # The LLM loop spends one iteration on its exit_loop call.
+    agent = build_agent(mode, forge, model, target, charges + 1)
+    sessions = InMemorySessionService()
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=sessions)
+    samples, finals = [], []
+    for _ in range(args.repeats):
+        session = await sessions.create_session(app_name=APP_NAME, user_id=USER_ID, state={"current_energy": 0})
+        message = types.Content(role="user", parts=[types.Part(text=f"Charge to {target} units.")])
+        start = time.perf_counter()
+        final = None
+        async for event in runner.run_async(user_id=USER_ID, session_id=session.id, new_message=message):
+            for part in (event.content.parts if event.content and event.content.parts else []):
+                if part.function_response and part.function_response.name == "seismic_charge":
+                    final = int(re.findall(r"\d+", json.dumps(part.function_response.response))[-1])
+        samples.append(time.perf_counter() - start)
+        finals.append(final)
+    await runner.close()
+    return {
+        "mode": mode,
+        "charges": charges,
+        "model_calls_per_charge": model.calls / args.repeats,
+        "tool_round_trips_per_charge": forge.round_trips / args.repeats,
+        "final_energy": finals[0] if len(set(finals)) == 1 else finals,
+        "latency": summarize(samples),
+    }
+
+
+async def main_async(args) -> dict:
+    report = new_report("charge_loop", args)
+    results = [await run(mode, charges, args) for charges in args.charges for mode in MODES]
+    report["finals_match"] = all(
+        len({r["final_energy"] for r in results if r["charges"] == charges}) == 1 for charges in args.charges
+    )
+    report["results"] = results
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--charges", type=int, nargs="+", default=[10, 50], help="seismic_charge calls needed")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--model-delay-ms", type=float, default=300, help="stub model latency per call")
+    parser.add_argument("--tool-delay-ms", type=float, default=20, help="Arcane Forge round trip")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    write_report(args, asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/bench_cooldown.py
+"""
+Latency added to each familiar invocation by the cooldown check.
+
+Starts a stand-in for the Nexus cooldown endpoints on a local port (with an
+artificial network delay), then compares the original blocking GET + POST
+against agent/cooldown_cache.CooldownGate.
+
+Usage:
+    python benchmarks/bench_cooldown.py [--invocations 200] [--familiars 3] [--delay-ms 20] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent"))
+from cooldown_cache import CooldownGate  # noqa: E402
+from bench_utils import new_report, summarize, write_report  # noqa: E402
+
+COOLDOWN_PERIOD_SECONDS = 60
+
+
+def start_fake_nexus(delay_seconds: float) -> ThreadingHTTPServer:
+    """Serves the Nexus cooldown endpoints from a dict, after sleeping delay_seconds."""
+    cooldown_db: dict[str, str] = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, code: int, body: bytes = b"") -> None:
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(delay_seconds)
+            name = self.path.rsplit("/", 1)[-1]
+            self._reply(200, json.dumps({"time": cooldown_db.get(name)}).encode())
+
+        def do_POST(self):
+            time.sleep(delay_seconds)
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length))
+            if self.path.endswith("/acquire"):
+                name = self.path.split("/")[-2]
+                last_used = cooldown_db.get(name)
+                now = datetime.fromisoformat(body["timestamp"])
+                if last_used and (now - datetime.fromisoformat(last_used)).total_seconds() < body["cooldown_seconds"]:
+                    self._reply(200, json.dumps({"acquired": False, "time": last_used}).encode())
+                    return
+                cooldown_db[name] = body["timestamp"]
+                self._reply(200, json.dumps({"acquired": True, "time": body["timestamp"]}).encode())
+                return
+            cooldown_db[self.path.rsplit("/", 1)[-1]] = body["timestamp"]
+            self._reply(204)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def uncached_check(api_url: str, familiar_name: str) -> None:
+    """The original before-agent logic: blocking GET, compare, blocking POST."""
+    now = datetime.now(timezone.utc)
+    response = requests.get(f"{api_url}/cooldown/{familiar_name}")
+    response.raise_for_status()
+    last_used_str = response.json().get("time")
+    if last_used_str:
+        if now - datetime.fromisoformat(last_used_str) < timedelta(seconds=COOLDOWN_PERIOD_SECONDS):
+            return
+    requests.post(f"{api_url}/cooldown/{familiar_name}", json={"timestamp": now.isoformat()})
+
+
+async def run(args) -> dict:
+    report = new_report("cooldown_check", args)
+    familiars = [f"familiar_{i}_elemental_familiar" for i in range(args.familiars)]
+
+    server = start_fake_nexus(args.delay_ms / 1000)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    before = []
+    for i in range(args.invocations):
+        start = time.perf_counter()
+        uncached_check(api_url, familiars[i % len(familiars)])
+        before.append(time.perf_counter() - start)
+    server.shutdown()
+
+    # Fresh Nexus state so both runs see the same sequence of claims and rejections.
+    server = start_fake_nexus(args.delay_ms / 1000)
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    gate = CooldownGate(api_url, COOLDOWN_PERIOD_SECONDS)
+    after = []
+    for i in range(args.invocations):
+        start = time.perf_counter()
+        await gate.acquire(familiars[i % len(familiars)])
+        after.append(time.perf_counter() - start)
+    await gate.flush()
+    server.shutdown()
+
+    report["before"] = summarize(before)
+    report["after"] = summarize(after)
+    report["cache"] = {"hits": gate.cache.hits, "misses": gate.cache.misses}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invocations", type=int, default=200)
+    parser.add_argument("--familiars", type=int, default=3)
+    parser.add_argument("--delay-ms", type=float, default=20.0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    write_report(args, asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
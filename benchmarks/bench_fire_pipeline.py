@@ -0,0 +1,166 @@
+# benchmarks/bench_fire_pipeline.py
+"""
+End-to-end latency and token use of the fire summon: all-LLM steps versus
+agent/tool_pipeline.py.
+
+Both versions are SequentialAgents over the same two tools (a Librarium
+lookup and inferno_resonance) and a scripted stub model that answers after
+--model-delay-ms and reports token usage of about four characters per
+token, so no API key is needed.
+
+  all_llm    librarian LlmAgent (calls get_ability_damage, then reports) ->
+             battlemage LlmAgent (calls inferno_resonance, then reports)
+  pipeline   an LlmAgent picks the ability from the request (output_key) ->
+             ToolPipelineAgent runs the lookup and inferno_resonance
+
+Usage:
+    python benchmarks/bench_fire_pipeline.py [--turns 20] [--model-delay-ms 300]
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent"))
+from google.adk.agents.llm_agent import LlmAgent  # noqa: E402
+from google.adk.agents.sequential_agent import SequentialAgent  # noqa: E402
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+from google.adk.models.llm_response import LlmResponse  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions.in_memory_session_service import InMemorySessionService  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from tool_pipeline import ToolPipelineAgent, ToolStep  # noqa: E402
+from bench_utils import StubLlm, new_report, summarize, transcript, write_report  # noqa: E402
+
+APP_NAME = "fire"
+USER_ID = "bench"
+ABILITIES = {"inferno_lash": 85, "emberstorm": 90, "pyroclasm": 80}
+
+
+def get_ability_damage(ability_name: str) -> dict:
+    """Returns the base damage points of a fire ability."""
+    return {"ability_name": ability_name, "damage_points": ABILITIES[ability_name.lower()]}
+
+
+def inferno_resonance(base_fire_damage: int) -> str:
+    """Multiplies the power of a fire spell by a factor of 3."""
+    return f"The fire spell's power is multiplied by Inferno Resonance, now charged to deal {base_fire_damage * 3} damage."
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class ScriptedLlm(StubLlm):
+    """Plays the librarian, the battlemage and the ability picker."""
+
+    def respond(self, llm_request: LlmRequest) -> LlmResponse:
+        text = transcript(llm_request)
+        instruction = str(llm_request.config.system_instruction or "")
+        last = llm_request.contents[-1].parts[0]
+        if last.function_response is not None:
+            part = types.Part(text=f"Result: {json.dumps(last.function_response.response, default=str)}")
+        elif "get_ability_damage" in llm_request.tools_dict:
+            ability = next(name for name in ABILITIES if name in text.lower())
+            part = types.Part(function_call=types.FunctionCall(name="get_ability_damage", args={"ability_name": ability}))
+        elif "inferno_resonance" in llm_request.tools_dict:
+            damage = int(re.findall(r'"damage_points": (\d+)', text)[-1])
+            part = types.Part(function_call=types.FunctionCall(name="inferno_resonance", args={"base_fire_damage": damage}))
+        else:
+            part = types.Part(text=next(name for name in ABILITIES if name in text.lower()))
+        prompt = instruction + text
+        return LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=_tokens(prompt),
+                candidates_token_count=_tokens(json.dumps(part.model_dump(exclude_none=True), default=str)),
+                total_token_count=_tokens(prompt) + _tokens(json.dumps(part.model_dump(exclude_none=True), default=str)),
+            ),
+        )
+
+
+def all_llm_agent(model: ScriptedLlm) -> SequentialAgent:
+    librarian = LlmAgent(
+        name="librarian", model=model, tools=[get_ability_damage],
+        instruction="Find the base damage of the fire ability the user names with get_ability_damage and report it.",
+    )
+    battlemage = LlmAgent(
+        name="battlemage", model=model, tools=[inferno_resonance],
+        instruction="Apply inferno_resonance to the base damage the librarian found and report the result.",
+    )
+    return SequentialAgent(name="fire_summon", sub_agents=[librarian, battlemage])
+
+
+def pipeline_agent(model: ScriptedLlm) -> SequentialAgent:
+    picker = LlmAgent(
+        name="ability_picker", model=model, output_key="ability_name",
+        instruction="Reply with only the name of the fire ability the user wants to use.",
+    )
+    pipeline = ToolPipelineAgent(
+        name="fire_pipeline",
+        tools=[get_ability_damage, inferno_resonance],
+        steps=[
+            ToolStep("get_ability_damage", lambda s: {"ability_name": s["ability_name"].strip()}, "ability"),
+            ToolStep("inferno_resonance", lambda s: {"base_fire_damage": s["ability"]["damage_points"]}, "fire_result"),
+        ],
+    )
+    return SequentialAgent(name="fire_summon", sub_agents=[picker, pipeline])
+
+
+async def run(mode: str, args) -> dict:
+    model = ScriptedLlm(model="stub", delay_seconds=args.model_delay_ms / 1000)
+    agent = all_llm_agent(model) if mode == "all_llm" else pipeline_agent(model)
+    sessions = InMemorySessionService()
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=sessions)
+    samples, tokens, answers = [], [], []
+    names = list(ABILITIES)
+    for turn in range(args.turns):
+        ability = names[turn % len(names)]
+        session = await sessions.create_session(app_name=APP_NAME, user_id=USER_ID)
+        message = types.Content(role="user", parts=[types.Part(text=f"Unleash {ability} on the target!")])
+        start = time.perf_counter()
+        used, answer = 0, None
+        async for event in runner.run_async(user_id=USER_ID, session_id=session.id, new_message=message):
+            if event.usage_metadata and event.usage_metadata.total_token_count:
+                used += event.usage_metadata.total_token_count
+            for part in (event.content.parts if event.content and event.content.parts else []):
+                if part.function_response and part.function_response.name == "inferno_resonance":
+                    answer = part.function_response.response.get("result")
+        samples.append(time.perf_counter() - start)
+        tokens.append(used)
+        answers.append(answer)
+    await runner.close()
+    return {
+        "mode": mode,
+        "model_calls_per_turn": model.calls / args.turns,
+        "tokens_per_turn": sum(tokens) / len(tokens),
+        "turn": summarize(samples),
+        "answers": answers,
+    }
+
+
+async def main_async(args) -> dict:
+    report = new_report("fire_pipeline", args)
+    all_llm = await run("all_llm", args)
+    pipeline = await run("pipeline", args)
+    report["answers_match"] = all_llm.pop("answers") == pipeline.pop("answers")
+    report["results"] = [all_llm, pipeline]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--model-delay-ms", type=float, default=300, help="stub model latency per call")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    write_report(args, asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
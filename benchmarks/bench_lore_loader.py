@@ -0,0 +1,152 @@
+# benchmarks/bench_lore_loader.py
+"""
+Rows per second of prerequisite/lore_loader.py against db_setup.py's
+one-INSERT-per-row approach.
+
+For each size, writes that many synthetic abilities to a JSONL file and
+loads it into a fresh database:
+
+  row_by_row   one INSERT ... ON CONFLICT DO NOTHING per ability, as
+               db_setup.py did (only the first --row-limit rows, it is slow)
+  bulk         lore_loader.load_abilities, streaming from the file
+  upsert       the same file again with 10% of the damage values changed,
+               into the now-full table (an incremental reload)
+
+It then checks that agent/lore_cache.py's AbilitiesCache sees an UPDATE,
+a loader upsert and a loader replace that change no row count or id
+("cache_sees_updates").
+
+Runs against a temporary SQLite file by default; pass --db-url to measure a
+local Postgres instead (its abilities table is dropped first).
+
+Usage:
+    python benchmarks/bench_lore_loader.py [--sizes 100000,1000000] [--batch-size 5000] [--db-url URL]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import sqlalchemy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "prerequisite"))
+sys.path.insert(0, os.path.join(ROOT, "agent"))
+from lore_cache import AbilitiesCache  # noqa: E402
+from lore_loader import abilities, create_schema, load_abilities, read_abilities  # noqa: E402
+from bench_utils import new_report, write_report  # noqa: E402
+
+ELEMENTS = ("Fire", "Water", "Earth", "Air", "Void")
+ROW_BY_ROW_INSERT = sqlalchemy.text(
+    "INSERT INTO abilities (familiar_name, ability_name, damage_points, element) "
+    "VALUES (:familiar_name, :ability_name, :damage_points, :element) "
+    "ON CONFLICT (ability_name) DO NOTHING"
+)
+
+
+def write_abilities(path: str, count: int, rng: random.Random, changed: float = 0.0) -> None:
+    with open(path, "w") as f:
+        for i in range(count):
+            damage = (i * 7919) % 100 + 1
+            if changed and rng.random() < changed:
+                damage = rng.randint(1, 100)
+            record = {
+                "familiar_name": f"Familiar {i // 20}",
+                "ability_name": f"ability_{i}",
+                "damage_points": damage,
+                "element": ELEMENTS[i % len(ELEMENTS)],
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def fresh_engine(db_url: str | None, workdir: str, name: str) -> sqlalchemy.Engine:
+    engine = sqlalchemy.create_engine(db_url or f"sqlite:///{os.path.join(workdir, name)}.db")
+    with engine.begin() as conn:
+        abilities.drop(conn, checkfirst=True)
+    return engine
+
+
+def bench_row_by_row(engine: sqlalchemy.Engine, path: str, limit: int) -> dict:
+    start = time.perf_counter()
+    rows = 0
+    with engine.connect() as conn:
+        create_schema(conn)
+        conn.commit()
+        for record in read_abilities(path):
+            if rows >= limit:
+                break
+            conn.execute(ROW_BY_ROW_INSERT, parameters=record)
+            rows += 1
+        conn.commit()
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": round(seconds, 3), "rows_per_second": round(rows / seconds)}
+
+
+def cache_sees_updates(engine: sqlalchemy.Engine, path: str) -> bool:
+    """Whether a cached damage value follows in-place changes to the table."""
+    cache = AbilitiesCache(engine, check_seconds=0)
+    record = dict(cache.ability("ability_0").as_dict())
+    seen = []
+    with engine.begin() as conn:
+        conn.execute(
+            sqlalchemy.text("UPDATE abilities SET damage_points = :damage WHERE ability_name = 'ability_0'"),
+            {"damage": 1000},
+        )
+    seen.append(cache.ability("ability_0").damage_points == 1000)
+    record["damage_points"] = 1001
+    load_abilities(engine, [record], mode="upsert")
+    seen.append(cache.ability("ability_0").damage_points == 1001)
+    # A replace with the same rows gets the same ids and row count back.
+    load_abilities(engine, read_abilities(path), mode="replace")
+    seen.append(cache.ability("ability_0").damage_points < 1000)
+    cache.close()
+    return all(seen)
+
+
+def bench_size(size: int, args, workdir: str, rng: random.Random) -> dict:
+    path = os.path.join(workdir, f"abilities_{size}.jsonl")
+    write_abilities(path, size, rng)
+    results = {"size": size}
+
+    engine = fresh_engine(args.db_url, workdir, f"row_{size}")
+    results["row_by_row"] = bench_row_by_row(engine, path, min(size, args.row_limit))
+    engine.dispose()
+
+    engine = fresh_engine(args.db_url, workdir, f"bulk_{size}")
+    results["bulk"] = load_abilities(engine, read_abilities(path), mode="replace", batch_size=args.batch_size)
+    write_abilities(path, size, rng, changed=0.1)
+    results["upsert"] = load_abilities(engine, read_abilities(path), mode="upsert", batch_size=args.batch_size)
+    with engine.connect() as conn:
+        results["table_rows"] = conn.execute(sqlalchemy.text("SELECT COUNT(*) FROM abilities")).scalar_one()
+    results["cache_sees_updates"] = cache_sees_updates(engine, path)
+    engine.dispose()
+    os.remove(path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100000,1000000", help="comma-separated ability counts")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--row-limit", type=int, default=20000, help="rows loaded by the row-by-row baseline")
+    parser.add_argument("--db-url", help="SQLAlchemy URL of a scratch database (default: temporary SQLite)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    report = new_report("lore_loader", args)
+    report["database"] = sqlalchemy.make_url(args.db_url).get_backend_name() if args.db_url else "sqlite"
+    report["results"] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in (int(n) for n in args.sizes.split(",") if n.strip()):
+            report["results"].append(bench_size(size, args, workdir, rng))
+
+    write_report(args, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/bench_memory.py
+"""
+Query latency of the memory services against the number of stored events.
+
+Fills each service with synthetic sessions (words drawn from a Zipf-like
+vocabulary, so common words match many events and rare words few), then
+times `search_memory` for random one- to three-word queries. Compares the
+ADK InMemoryMemoryService (scans every event) with
+agent/indexed_memory.IndexedMemoryService, with and without embeddings.
+Keyword results of the indexed service are checked against the ADK ones.
+
+Usage:
+    python benchmarks/bench_memory.py [--events 1000,10000,100000] [--queries 200] [--output results.json]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent"))
+from google.adk.events.event import Event  # noqa: E402
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService  # noqa: E402
+from google.adk.sessions.session import Session  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from bounded_stores import StoreLimits  # noqa: E402
+from indexed_memory import IndexedMemoryService  # noqa: E402
+from bench_utils import new_report, summarize, write_report  # noqa: E402
+
+APP_NAME = "summoner"
+USER_ID = "bench"
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(size)]
+
+
+def make_sessions(events: int, per_session: int, vocabulary: list[str], rng: random.Random) -> list[Session]:
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    sessions = []
+    for start in range(0, events, per_session):
+        session = Session(id=f"s{start // per_session}", app_name=APP_NAME, user_id=USER_ID)
+        for _ in range(min(per_session, events - start)):
+            text = " ".join(rng.choices(vocabulary, weights=weights, k=rng.randint(8, 30)))
+            session.events.append(
+                Event(author="summoner", content=types.Content(role="model", parts=[types.Part(text=text)]))
+            )
+        sessions.append(session)
+    return sessions
+
+
+def make_queries(count: int, vocabulary: list[str], rng: random.Random) -> list[str]:
+    # Mostly mid- and low-frequency words; the most common words match nearly everything.
+    pool = vocabulary[len(vocabulary) // 20:]
+    return [" ".join(rng.sample(pool, rng.randint(1, 3))) for _ in range(count)]
+
+
+async def bench_service(name: str, service, sessions: list[Session], queries: list[str]) -> tuple[dict, list]:
+    start = time.perf_counter()
+    for session in sessions:
+        await service.add_session_to_memory(session)
+    add_seconds = time.perf_counter() - start
+
+    samples, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        response = await service.search_memory(app_name=APP_NAME, user_id=USER_ID, query=query)
+        samples.append(time.perf_counter() - start)
+        results.append(len(response.memories))
+    result = {
+        "service": name,
+        "add_seconds": round(add_seconds, 3),
+        "query": summarize(samples),
+        "mean_results": round(sum(results) / len(results), 1),
+    }
+    if hasattr(service, "stats"):
+        result["stats"] = service.stats()
+    return result, results
+
+
+async def bench_size(events: int, args, vocabulary: list[str], rng: random.Random) -> dict:
+    sessions = make_sessions(events, args.per_session, vocabulary, rng)
+    queries = make_queries(args.queries, vocabulary, rng)
+    # No TTL or entry cap here: every event must stay searchable.
+    limits = StoreLimits(ttl_seconds=0, max_entries=0, max_bytes=0)
+    services = {
+        "adk_in_memory": InMemoryMemoryService(),
+        "indexed": IndexedMemoryService(limits, embeddings=False),
+        "indexed_embeddings": IndexedMemoryService(limits, embeddings=True),
+    }
+    rows, counts = [], {}
+    for name, service in services.items():
+        result, counts[name] = await bench_service(name, service, sessions, queries)
+        rows.append(result)
+    return {
+        "events": events,
+        "sessions": len(sessions),
+        "keyword_results_match": counts["adk_in_memory"] == counts["indexed"],
+        "results": rows,
+    }
+
+
+async def main_async(args) -> dict:
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    report = new_report("memory", args)
+    report["sizes"] = []
+    for events in (int(n) for n in args.events.split(",") if n.strip()):
+        report["sizes"].append(await bench_size(events, args, vocabulary, rng))
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", default="1000,10000,100000", help="comma-separated stored event counts")
+    parser.add_argument("--per-session", type=int, default=20, help="events per session")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--vocabulary", type=int, default=20000, help="distinct words")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    write_report(args, asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# benchmarks/bench_model_scheduler.py
+"""
+Quota errors and queue waits with and without agent/model_scheduler.py.
+
+A stub model enforces a quota like the Gemini API: more than --quota-rps
+calls in any one-second window, or more than --quota-concurrency at once,
+fail with 429 RESOURCE_EXHAUSTED. The workload is a burst of background
+calls (a ParallelAgent fanning out) with interactive calls arriving while
+the burst is queued.
+
+  unscheduled  every call goes straight to the model and retries a quota
+               error immediately, up to --retries times
+  scheduled    every call goes through ScheduledLlm with a scheduler sized
+               just under the quota
+
+Reports quota errors, failed calls and latency per priority.
+
+A last run, nested_transfer, checks that a scheduled parent agent that
+transfers to a scheduled sub-agent completes with max_concurrency=1: the
+parent must not hold its slot while the sub-agent runs.
+
+Usage:
+    python benchmarks/bench_model_scheduler.py [--background 60] [--interactive 10] [--quota-rps 10]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from typing import AsyncGenerator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent"))
+from google.adk.agents.llm_agent import LlmAgent  # noqa: E402
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+from google.adk.models.llm_response import LlmResponse  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions.in_memory_session_service import InMemorySessionService  # noqa: E402
+from google.genai import errors, types  # noqa: E402
+
+from model_scheduler import BACKGROUND, INTERACTIVE, ModelCallScheduler, ScheduledLlm  # noqa: E402
+from bench_utils import StubLlm, new_report, summarize, write_report  # noqa: E402
+
+
+class QuotaStubLlm(StubLlm):
+    """Answers after `delay_seconds`, or raises 429 when over its quota."""
+
+    delay_seconds: float = 0.2
+    quota_rps: int = 10
+    quota_concurrency: int = 4
+    quota_errors: int = 0
+    active: int = 0
+    recent: deque = deque()
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        now = time.monotonic()
+        while self.recent and now - self.recent[0] > 1.0:
+            self.recent.popleft()
+        if len(self.recent) >= self.quota_rps or self.active >= self.quota_concurrency:
+            self.calls += 1
+            self.quota_errors += 1
+            raise errors.ClientError(429, {"error": {"code": 429, "message": "Quota exceeded", "status": "RESOURCE_EXHAUSTED"}})
+        self.recent.append(now)
+        self.active += 1
+        try:
+            async for response in super().generate_content_async(llm_request, stream):
+                yield response
+        finally:
+            self.active -= 1
+
+    def respond(self, llm_request: LlmRequest) -> LlmResponse:
+        return LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=100),
+        )
+
+
+class TransferStubLlm(StubLlm):
+    """Transfers to "familiar" when it can, otherwise answers."""
+
+    delay_seconds: float = 0.2
+
+    def respond(self, llm_request: LlmRequest) -> types.Part:
+        last = llm_request.contents[-1].parts[0]
+        if "transfer_to_agent" in llm_request.tools_dict and last.function_response is None:
+            return types.Part(function_call=types.FunctionCall(name="transfer_to_agent", args={"agent_name": "familiar"}))
+        return types.Part(text="ok")
+
+
+def request() -> LlmRequest:
+    return LlmRequest(model="stub", contents=[types.Content(role="user", parts=[types.Part(text="Summon.")])])
+
+
+async def call_unscheduled(model: QuotaStubLlm, retries: int) -> None:
+    for attempt in range(retries + 1):
+        try:
+            async for _ in model.generate_content_async(request()):
+                pass
+            return
+        except errors.ClientError:
+            if attempt == retries:
+                raise
+
+
+async def call_scheduled(model: ScheduledLlm) -> None:
+    async for _ in model.generate_content_async(request()):
+        pass
+
+
+async def run(mode: str, args) -> dict:
+    stub = QuotaStubLlm(
+        model="stub", delay_seconds=args.latency_ms / 1000, quota_rps=args.quota_rps,
+        quota_concurrency=args.quota_concurrency, recent=deque(),
+    )
+    scheduler = ModelCallScheduler(
+        rpm=args.quota_rps * 60 * 0.9, tpm=10_000_000, max_concurrency=args.quota_concurrency,
+        # The stub's quota window is one second, not a minute.
+        request_burst=args.quota_rps * 0.9,
+    )
+    models = {
+        priority: ScheduledLlm(model="stub", llm=stub, priority=priority, max_retries=args.retries, scheduler=scheduler)
+        for priority in (INTERACTIVE, BACKGROUND)
+    }
+    latencies = {"interactive": [], "background": []}
+    failures = {"interactive": 0, "background": 0}
+
+    async def one(priority: int, delay: float) -> None:
+        await asyncio.sleep(delay)
+        name = "interactive" if priority == INTERACTIVE else "background"
+        start = time.perf_counter()
+        try:
+            if mode == "scheduled":
+                await call_scheduled(models[priority])
+            else:
+                await call_unscheduled(stub, args.retries)
+            latencies[name].append(time.perf_counter() - start)
+        except errors.ClientError:
+            failures[name] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(one(BACKGROUND, 0) for _ in range(args.background)),
+        *(one(INTERACTIVE, 0.5 + i * 0.1) for i in range(args.interactive)),
+    )
+    result = {
+        "mode": mode,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+        "model_calls": stub.calls,
+        "quota_errors": stub.quota_errors,
+        "failed": failures,
+        "interactive": summarize(latencies["interactive"], errors=failures["interactive"]),
+        "background": summarize(latencies["background"], errors=failures["background"]),
+    }
+    if mode == "scheduled":
+        result["scheduler"] = scheduler.stats()
+    return result
+
+
+async def run_nested(args) -> dict:
+    scheduler = ModelCallScheduler(rpm=600_000, tpm=10_000_000, max_concurrency=1)
+
+    def model() -> ScheduledLlm:
+        stub = TransferStubLlm(model="stub", delay_seconds=args.latency_ms / 1000)
+        return ScheduledLlm(model="stub", llm=stub, priority=INTERACTIVE, scheduler=scheduler)
+
+    familiar = LlmAgent(
+        name="familiar", model=model(), instruction="Answer.",
+        disallow_transfer_to_parent=True, disallow_transfer_to_peers=True,
+    )
+    summoner = LlmAgent(name="summoner", model=model(), instruction="Delegate to the familiar.", sub_agents=[familiar])
+    sessions = InMemorySessionService()
+    runner = Runner(app_name="scheduler", agent=summoner, session_service=sessions)
+    message = types.Content(role="user", parts=[types.Part(text="Summon.")])
+    samples = []
+
+    async def turn() -> None:
+        session = await sessions.create_session(app_name="scheduler", user_id="bench")
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        samples.append(time.perf_counter() - start)
+
+    completed = True
+    try:
+        # Two model calls per turn; a deadlocked turn never finishes.
+        timeout = args.interactive * 4 * args.latency_ms / 1000 + 5
+        await asyncio.wait_for(asyncio.gather(*(turn() for _ in range(args.interactive))), timeout=timeout)
+    except asyncio.TimeoutError:
+        completed = False
+    await runner.close()
+    return {
+        "mode": "nested_transfer",
+        "max_concurrency": 1,
+        "completed": completed,
+        "turn": summarize(samples, errors=args.interactive - len(samples)),
+        "scheduler": scheduler.stats(),
+    }
+
+
+async def main_async(args) -> dict:
+    report = new_report("model_scheduler", args)
+    report["results"] = [await run("unscheduled", args), await run("scheduled", args), await run_nested(args)]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--background", type=int, default=60, help="background calls in the burst")
+    parser.add_argument("--interactive", type=int, default=10, help="interactive calls arriving during it")
+    parser.add_argument("--quota-rps", type=int, default=10)
+    parser.add_argument("--quota-concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    write_report(args, asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
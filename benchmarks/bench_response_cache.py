@@ -0,0 +1,95 @@
+# benchmarks/bench_response_cache.py
+"""
+Model calls and turn latency saved by agent/response_cache_plugin.py.
+
+Runs an LlmAgent (with one tool, like the librarian) against a stub model
+that answers after an artificial delay, so no API key or network is needed.
+The same questions are asked repeatedly, each time in a fresh session, with
+and without ResponseCachePlugin on the Runner. The stub counts how often
+the model was actually called.
+
+Usage:
+    python benchmarks/bench_response_cache.py [--turns 50] [--distinct 5] [--delay-ms 300]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent"))
+from google.adk.agents.llm_agent import LlmAgent  # noqa: E402
+from google.adk.models.llm_request import LlmRequest  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions.in_memory_session_service import InMemorySessionService  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from response_cache_plugin import ResponseCachePlugin  # noqa: E402
+from bench_utils import StubLlm, new_report, summarize, write_report  # noqa: E402
+
+APP_NAME = "librarian"
+USER_ID = "bench"
+
+
+class LibrarianLlm(StubLlm):
+    """Calls the tool once, then answers with the tool's result."""
+
+    def respond(self, llm_request: LlmRequest) -> types.Part:
+        last = llm_request.contents[-1].parts[0]
+        if last.function_response is not None:
+            return types.Part(text=f"The damage is {last.function_response.response['result']}.")
+        ability = last.text.rsplit(" ", 1)[-1].strip("?")
+        return types.Part(function_call=types.FunctionCall(name="lookup_damage", args={"ability": ability}))
+
+
+def lookup_damage(ability: str) -> int:
+    """Returns the damage of an ability."""
+    return sum(ability.encode()) % 100
+
+
+async def run_turns(model: LibrarianLlm, plugins: list, questions: list[str]) -> dict:
+    agent = LlmAgent(name="librarian_agent", model=model, instruction="Answer ability questions.", tools=[lookup_damage])
+    sessions = InMemorySessionService()
+    runner = Runner(app_name=APP_NAME, agent=agent, session_service=sessions, plugins=plugins)
+    samples, answers = [], []
+    for question in questions:
+        session = await sessions.create_session(app_name=APP_NAME, user_id=USER_ID)
+        message = types.Content(role="user", parts=[types.Part(text=question)])
+        start = time.perf_counter()
+        final = None
+        async for event in runner.run_async(user_id=USER_ID, session_id=session.id, new_message=message):
+            if event.is_final_response() and event.content and event.content.parts:
+                final = event.content.parts[0].text
+        samples.append(time.perf_counter() - start)
+        answers.append(final)
+    await runner.close()
+    return {"model_calls": model.calls, "turn": summarize(samples), "answers": answers}
+
+
+async def main_async(args) -> dict:
+    questions = [f"What is the damage of ability{i % args.distinct}?" for i in range(args.turns)]
+    delay = args.delay_ms / 1000
+    report = new_report("response_cache", args)
+    baseline = await run_turns(LibrarianLlm(model="stub", delay_seconds=delay), [], questions)
+    plugin = ResponseCachePlugin(ttl_seconds=args.ttl, max_entries=args.max_entries)
+    cached = await run_turns(LibrarianLlm(model="stub", delay_seconds=delay), [plugin], questions)
+    report["answers_match"] = baseline.pop("answers") == cached.pop("answers")
+    report["results"] = [{"mode": "no_cache", **baseline}, {"mode": "response_cache", **cached, "cache": plugin.stats()}]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--distinct", type=int, default=5, help="distinct questions among the turns")
+    parser.add_argument("--delay-ms", type=float, default=300, help="stub model latency per call")
+    parser.add_argument("--ttl", type=float, default=300)
+    parser.add_argument("--max-entries", type=int, default=1000)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    write_report(args, asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
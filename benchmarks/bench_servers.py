@@ -0,0 +1,213 @@
+# benchmarks/bench_servers.py
+"""
+Throughput and latency of the MCP servers and the Nexus API.
+
+Starts each server locally as a subprocess on a free port, then:
+
+  nexus         HTTP load against /cryosea_shatter and /cooldown/{familiar}
+                on prerequisite/fake_api/fake_api_server.py
+  general-mcp   N concurrent MCP SSE clients running list_tools / call_tool
+                against mcp-servers/general/main.py
+  api-mcp       the same against mcp-servers/api/main.py, pointed at the
+                local Nexus
+
+Results are written as JSON (p50/p95/p99 latency and requests per second per
+operation) so runs from different releases can be diffed. A server that
+fails to start is reported with an "error" entry instead of aborting the run.
+
+Usage:
+    python benchmarks/bench_servers.py [--clients 8] [--requests 50] [--targets nexus,general-mcp,api-mcp] [--output results.json]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack, contextmanager
+from datetime import datetime, timezone
+
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from bench_utils import new_report, summarize, write_report
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NEXUS_DIR = os.path.join(REPO_ROOT, "prerequisite", "fake_api")
+GENERAL_MCP_DIR = os.path.join(REPO_ROOT, "mcp-servers", "general")
+API_MCP_DIR = os.path.join(REPO_ROOT, "mcp-servers", "api")
+ALL_TARGETS = ("nexus", "general-mcp", "api-mcp")
+
+# Tool calls issued by the MCP clients: (tool name, arguments for request i).
+GENERAL_MCP_CALLS = [
+    ("inferno_resonance", lambda i: {"base_fire_damage": i}),
+    ("seismic_charge", lambda i: {"current_energy": i}),
+]
+API_MCP_CALLS = [
+    ("cryosea_shatter", lambda i: {}),
+    ("moonlit_cascade", lambda i: {}),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def run_server(name: str, args: list[str], cwd: str, env: dict, ready_url: str, log_dir: str, startup_timeout: float):
+    """Runs a server subprocess until the block exits. Raises RuntimeError if it never becomes ready."""
+    log_path = os.path.join(log_dir, f"{name}.log")
+    with open(log_path, "w") as log:
+        proc = subprocess.Popen(args, cwd=cwd, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{name} exited with code {proc.returncode}; see {log_path}")
+            try:
+                # Any HTTP answer means the server is listening; /sse streams, so only wait for headers.
+                with httpx.stream("GET", ready_url, timeout=1.0):
+                    break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{name} did not start within {startup_timeout}s; see {log_path}")
+                time.sleep(0.2)
+        yield
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def drive(concurrency: int, total: int, operation) -> dict:
+    """Runs operation(i) `total` times with at most `concurrency` in flight."""
+    samples: list[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception:
+                errors += 1
+                continue
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - start, errors)
+
+
+async def bench_nexus(base_url: str, clients: int, requests_per_client: int) -> list[dict]:
+    total = clients * requests_per_client
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+
+        async def shatter(i):
+            (await client.post("/cryosea_shatter")).raise_for_status()
+
+        async def cooldown_write(i):
+            timestamp = datetime.now(timezone.utc).isoformat()
+            (await client.post(f"/cooldown/familiar_{i % 64}", json={"timestamp": timestamp})).raise_for_status()
+
+        async def cooldown_read(i):
+            (await client.get(f"/cooldown/familiar_{i % 64}")).raise_for_status()
+
+        results = []
+        for operation, fn in (
+            ("POST /cryosea_shatter", shatter),
+            ("POST /cooldown/{familiar}", cooldown_write),
+            ("GET /cooldown/{familiar}", cooldown_read),
+        ):
+            results.append({"target": "nexus", "operation": operation, **await drive(clients, total, fn)})
+        return results
+
+
+async def bench_mcp(target: str, sse_url: str, calls, clients: int, requests_per_client: int) -> list[dict]:
+    """Each client holds its own SSE session; operations are spread across the sessions."""
+    async with AsyncExitStack() as stack:
+        sessions = []
+        for _ in range(clients):
+            read, write = await stack.enter_async_context(sse_client(sse_url))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            sessions.append(session)
+
+        total = clients * requests_per_client
+        results = []
+
+        async def list_tools(i):
+            await sessions[i % clients].list_tools()
+
+        results.append({"target": target, "operation": "list_tools", **await drive(clients, total, list_tools)})
+        for tool_name, make_args in calls:
+
+            async def call_tool(i, tool_name=tool_name, make_args=make_args):
+                result = await sessions[i % clients].call_tool(tool_name, make_args(i))
+                if result.isError:
+                    raise RuntimeError(result.content)
+
+            results.append(
+                {"target": target, "operation": f"call_tool:{tool_name}", **await drive(clients, total, call_tool)}
+            )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients / MCP sessions")
+    parser.add_argument("--requests", type=int, default=50, help="requests per client per operation")
+    parser.add_argument("--targets", default=",".join(ALL_TARGETS))
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    targets = [t.strip() for t in args.targets.split(",") if t.strip()]
+
+    report = new_report("servers", args)
+    report["results"] = []
+    log_dir = tempfile.mkdtemp(prefix="bench_servers_")
+    report["log_dir"] = log_dir
+    python = sys.executable
+
+    nexus_port = free_port()
+    nexus_url = f"http://127.0.0.1:{nexus_port}"
+    db_path = os.path.join(log_dir, "cooldowns.db")
+    nexus_env = {"PORT": str(nexus_port), "COOLDOWN_BACKEND": "sqlite", "COOLDOWN_DB_PATH": db_path}
+    try:
+        # The api MCP server needs a Nexus behind it, so the Nexus runs for the whole benchmark.
+        with run_server("nexus", [python, "fake_api_server.py"], NEXUS_DIR, nexus_env, nexus_url, log_dir, args.startup_timeout):
+            if "nexus" in targets:
+                report["results"] += asyncio.run(bench_nexus(nexus_url, args.clients, args.requests))
+
+            for target, directory, calls, env in (
+                ("general-mcp", GENERAL_MCP_DIR, GENERAL_MCP_CALLS, {}),
+                ("api-mcp", API_MCP_DIR, API_MCP_CALLS, {"API_SERVER_URL": nexus_url}),
+            ):
+                if target not in targets:
+                    continue
+                port = free_port()
+                url = f"http://127.0.0.1:{port}/sse"
+                env = {**env, "APP_HOST": "127.0.0.1", "APP_PORT": str(port)}
+                try:
+                    with run_server(target, [python, "main.py"], directory, env, url, log_dir, args.startup_timeout):
+                        report["results"] += asyncio.run(bench_mcp(target, url, calls, args.clients, args.requests))
+                except Exception as e:
+                    report["results"].append({"target": target, "error": str(e)})
+    except RuntimeError as e:
+        report["results"].append({"target": "nexus", "error": str(e)})
+
+    write_report(args, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of the agent containers.
+
+For every agent entry point this runs fresh interpreters and reports:
+
+  imports          wall time of `import <module>` and the import time spent
+                   in each top-level package (from `python -X importtime`)
+  first_request    time from spawning the process until the A2A app answers
+                   GET /.well-known/agent.json
+
+The element agents build root_agent in their (unfilled) setup sections, so
+an entry point without a root_agent is served with a stub LlmAgent. That
+keeps the measurement to imports plus to_a2a startup.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 3] [--modules agent_to_a2a,fire.agent] [--output results.json]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from bench_servers import free_port
+from bench_utils import new_report, write_report
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AGENT_DIR = os.path.join(REPO_ROOT, "agent")
+ALL_MODULES = ("agent_to_a2a", "fire.agent", "water.agent", "earth.agent", "summoner.agent")
+
+IMPORT_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+SERVE_SNIPPET = """
+import importlib, sys
+module = importlib.import_module({module!r})
+from agent_to_a2a import to_a2a
+agent = getattr(module, "root_agent", None)
+if agent is None:
+    from google.adk.agents.llm_agent import LlmAgent
+    agent = LlmAgent(name="startup_bench_stub", model="gemini-2.5-flash")
+app = to_a2a(agent, port={port}, public_url="http://127.0.0.1:{port}/")
+import uvicorn
+uvicorn.run(app, host="127.0.0.1", port={port}, log_level="warning")
+"""
+
+
+def child_env() -> dict:
+    return {**os.environ, "PYTHONPATH": AGENT_DIR, "PYTHONWARNINGS": "ignore"}
+
+
+def package_of(module: str, depth: int) -> str:
+    return ".".join(module.split(".")[:depth])
+
+
+def profile_imports(module: str, depth: int) -> tuple[float, Counter]:
+    """One fresh `import module`: (wall seconds, self import seconds per package)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SNIPPET.format(module=module)],
+        cwd=AGENT_DIR, env=child_env(), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    per_package: Counter = Counter()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        per_package[package_of(name, depth)] += int(self_us) / 1e6
+    return float(proc.stdout.strip().splitlines()[-1]), per_package
+
+
+def time_to_first_request(module: str, timeout: float) -> float:
+    """Seconds from spawn until the agent card is served."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/.well-known/agent.json"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", SERVE_SNIPPET.format(module=module, port=port)],
+        cwd=AGENT_DIR, env=child_env(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError(proc.stderr.read().strip().splitlines()[-1])
+            # A bare connect is cheap; polling with full HTTP requests would
+            # steal CPU from the child on small (1 vCPU) machines.
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                if httpx.get(url, timeout=5.0).status_code == 200:
+                    return time.perf_counter() - start
+            except (OSError, httpx.HTTPError):
+                pass
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"no agent card within {timeout}s")
+            time.sleep(0.05)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def bench_module(module: str, repeat: int, depth: int, top: int, timeout: float) -> dict:
+    walls, packages = [], Counter()
+    for _ in range(repeat):
+        wall, per_package = profile_imports(module, depth)
+        walls.append(wall)
+        packages.update(per_package)
+    first = [time_to_first_request(module, timeout) for _ in range(repeat)]
+    return {
+        "module": module,
+        "import_seconds": {"median": statistics.median(walls), "min": min(walls)},
+        "import_by_package": {
+            name: round(seconds / repeat, 4) for name, seconds in packages.most_common(top)
+        },
+        "first_request_seconds": {"median": statistics.median(first), "min": min(first)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", default=",".join(ALL_MODULES))
+    parser.add_argument("--repeat", type=int, default=3, help="fresh processes per measurement")
+    parser.add_argument("--depth", type=int, default=2, help="module name components per package bucket")
+    parser.add_argument("--top", type=int, default=15, help="packages listed per module")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = new_report("startup", args)
+    report["results"] = []
+    for module in (m.strip() for m in args.modules.split(",") if m.strip()):
+        try:
+            report["results"].append(bench_module(module, args.repeat, args.depth, args.top, args.timeout))
+        except Exception as e:
+            report["results"].append({"module": module, "error": str(e)})
+
+    write_report(args, report)
+
+
+if __name__ == "__main__":
+    main()
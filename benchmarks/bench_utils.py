@@ -0,0 +1,94 @@
+# benchmarks/bench_utils.py
+"""Helpers shared by the benchmark scripts."""
+import asyncio
+import json
+import math
+import platform
+import statistics
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Union
+
+try:
+    from google.adk.models.base_llm import BaseLlm
+    from google.adk.models.llm_request import LlmRequest
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types
+except ImportError:  # The server, loader and startup benchmarks run without ADK
+    BaseLlm = None
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return float("nan")
+    rank = max(math.ceil(pct / 100 * len(sorted_samples)), 1)
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples: list[float], elapsed: float | None = None, errors: int = 0) -> dict:
+    """Latency summary in milliseconds; adds requests per second when elapsed is given."""
+    ordered = sorted(samples)
+    summary = {
+        "count": len(ordered),
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3) if ordered else None,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3) if ordered else None,
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3) if ordered else None,
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3) if ordered else None,
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+    }
+    if elapsed is not None:
+        summary["rps"] = round(len(ordered) / elapsed, 2) if elapsed > 0 else None
+    return summary
+
+
+def new_report(benchmark: str, args) -> dict:
+    """The fields every JSON report starts with; call it when the run starts."""
+    return {
+        "benchmark": benchmark,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+    }
+
+
+def write_report(args, report: dict) -> None:
+    """Writes the report to args.output (from --output), or prints it."""
+    output = json.dumps(report, indent=2)
+    if getattr(args, "output", None):
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+def transcript(llm_request: "LlmRequest") -> str:
+    """The text and function responses of a request, for scripted models to match on."""
+    return " ".join(
+        part.text or json.dumps(part.function_response.response if part.function_response else {}, default=str)
+        for content in llm_request.contents for part in (content.parts or [])
+    )
+
+
+if BaseLlm is not None:
+
+    class StubLlm(BaseLlm):
+        """A scripted model: waits `delay_seconds`, then answers with `respond(llm_request)`.
+
+        Subclasses implement `respond`, returning a Part or a whole LlmResponse.
+        No API key or network is needed.
+        """
+
+        delay_seconds: float = 0.3
+        calls: int = 0
+
+        async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+            self.calls += 1
+            await asyncio.sleep(self.delay_seconds)
+            response = self.respond(llm_request)
+            if isinstance(response, types.Part):
+                response = LlmResponse(content=types.Content(role="model", parts=[response]))
+            yield response
+
+        def respond(self, llm_request: LlmRequest) -> Union[types.Part, LlmResponse]:
+            raise NotImplementedError
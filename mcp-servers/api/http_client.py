@@ -0,0 +1,70 @@
+# http_client.py
+"""
+Pooled async HTTP client for the Nexus of Whispers MCP server.
+
+The MCP handlers run on uvicorn's event loop. A blocking `requests` call in
+a tool stalls every other SSE session on that loop and opens a new
+connection per call. This client keeps connections alive, caps in-flight
+requests per host and applies default timeouts.
+"""
+import asyncio
+import os
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+HTTP_TIMEOUT_SECONDS = float(os.environ.get("HTTP_TIMEOUT_SECONDS", 10))
+HTTP_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("HTTP_CONNECT_TIMEOUT_SECONDS", 5))
+HTTP_MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", 100))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20))
+HTTP_MAX_CONCURRENCY_PER_HOST = int(os.environ.get("HTTP_MAX_CONCURRENCY_PER_HOST", 32))
+
+
+class PooledHttpClient:
+  """Keep-alive httpx client with per-host concurrency limits.
+
+  The client is created lazily on first use so it binds to the server's
+  running event loop rather than to whatever loop imported this module.
+  """
+
+  def __init__(self, max_concurrency_per_host: int = HTTP_MAX_CONCURRENCY_PER_HOST) -> None:
+    self.max_concurrency_per_host = max_concurrency_per_host
+    self._client: httpx.AsyncClient | None = None
+    self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+  @property
+  def client(self) -> httpx.AsyncClient:
+    if self._client is None or self._client.is_closed:
+      self._client = httpx.AsyncClient(
+          timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+          limits=httpx.Limits(
+              max_connections=HTTP_MAX_CONNECTIONS,
+              max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+          ),
+      )
+      self._host_limits = {}
+    return self._client
+
+  async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+    client = self.client
+    host = urlsplit(url).netloc
+    limit = self._host_limits.get(host)
+    if limit is None:
+      limit = self._host_limits[host] = asyncio.Semaphore(self.max_concurrency_per_host)
+    async with limit:
+      return await client.request(method, url, **kwargs)
+
+  async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+    return await self.request("GET", url, **kwargs)
+
+  async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+    return await self.request("POST", url, **kwargs)
+
+  async def aclose(self) -> None:
+    if self._client is not None:
+      await self._client.aclose()
+      self._client = None
+
+
+http_client = PooledHttpClient()
@@ -1,70 +1,106 @@
-import asyncio
 import json
-import uvicorn
+import sys
 import os
 from dotenv import load_dotenv
 import requests
+from http_client import http_client
 from mcp import types as mcp_types 
 from mcp.server.lowlevel import Server
 
-from mcp.server.sse import SseServerTransport
-from starlette.applications import Starlette
-from starlette.routing import Mount, Route
-
-
+# Used by the code that fills the #REPLACE blocks below.
 from google.adk.tools.function_tool import FunctionTool
-
-
 from google.adk.tools.mcp_tool.conversion_utils import adk_to_mcp_tool_type
 
+# mcp_common lives in mcp-servers/ next to this server (and in /app in the container).
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mcp_common.tool_registry import ToolRegistry
+from mcp_common.transports import build_app, run as run_server
+
 
 load_dotenv()
 APP_HOST = os.environ.get("APP_HOST", "0.0.0.0")
-APP_PORT = os.environ.get("APP_PORT",8080)
+APP_PORT = int(os.environ.get("APP_PORT", 8080))
 API_SERVER_URL = os.environ.get('API_SERVER_URL')
 
 app = Server("Nexus-of-Whispers")
-sse = SseServerTransport("/messages/")
+
+async def call_nexus(ability: str) -> dict:
+  """Casts an ability on the Nexus of Whispers and returns its JSON reply.
+
+  Goes through the shared pooled client, so a slow Nexus response does not
+  block the event loop that serves every other SSE session.
+  """
+  response = await http_client.post(f"{API_SERVER_URL}/{ability}")
+  response.raise_for_status()
+  return response.json()
 
 #REPLACE-MAGIC-CORE
 
 
-cryosea_shatterTool = FunctionTool(cryosea_shatter)
-moonlit_cascadeTool = FunctionTool(moonlit_cascade)
+# The registered tools call the Nexus through call_nexus, so they share the
+# pooled client; they take the place of any blocking definitions above.
+async def cryosea_shatter() -> str:
+  """
+  Cryosea Shatter
+  Calls upon the Nexus of Whispers to shatter a frozen sea,
+  unleashing an external ice spell.
+  """
+  data = await call_nexus("cryosea_shatter")
+  return f"The Nexus answers! {data['ability']} shatters the sea, striking for {data['damage_points']} damage."
+
 
-available_tools = {
-    cryosea_shatterTool.name: cryosea_shatterTool,
-    moonlit_cascadeTool.name: moonlit_cascadeTool,
-}
+async def moonlit_cascade() -> str:
+  """
+  Moonlit Cascade
+  Calls upon the Nexus of Whispers to pour down a cascade of moonlight,
+  unleashing an external arcane spell.
+  """
+  data = await call_nexus("moonlit_cascade")
+  return f"The Nexus answers! {data['ability']} pours down, striking for {data['damage_points']} damage."
+
+
+# Identical casts that arrive while one is already in flight share its Nexus
+# request. NEXUS_RESPONSE_TTL_SECONDS > 0 also reuses replies for that long.
+NEXUS_RESPONSE_TTL_SECONDS = float(os.environ.get("NEXUS_RESPONSE_TTL_SECONDS", 0))
+
+registry = ToolRegistry()
+cryosea_shatterTool = registry.add(cryosea_shatter, coalesce=True, cache_ttl=NEXUS_RESPONSE_TTL_SECONDS)
+moonlit_cascadeTool = registry.add(moonlit_cascade, coalesce=True, cache_ttl=NEXUS_RESPONSE_TTL_SECONDS)
+
+# Build the MCP schemas once; list_tools below returns registry.mcp_tools
+registry.freeze()
+available_tools = registry.tools
 
 
 #REPLACE-Runes of Communication
 
+
+# Registered after the block above, so these are the handlers that serve:
+# calls go through the registry's coalescing, cache and metrics.
+@app.list_tools()
+async def list_tools() -> list[mcp_types.Tool]:
+  """MCP handler to list available tools."""
+  return registry.mcp_tools
+
+@app.call_tool()
+async def call_tool(
+    name: str, arguments: dict
+) -> list[mcp_types.TextContent | mcp_types.ImageContent | mcp_types.EmbeddedResource]:
+  """MCP handler to execute a tool call."""
+  return await registry.call(name, arguments)
+
 # Create a named MCP Server instance
 
 # --- MCP Remote Server ---
-async def handle_sse(request):
-  """Runs the MCP server over standard input/output."""
-  # Use the stdio_server context manager from the MCP library
-  async with sse.connect_sse(
-    request.scope, request.receive, request._send
-  ) as streams:
-    await app.run(
-        streams[0], streams[1], app.create_initialization_options()
-    )
-
-starlette_app = Starlette(
- debug=True,
-    routes=[
-        Route("/sse", endpoint=handle_sse),
-        Mount("/messages/", app=sse.handle_post_message),
-    ],
-)
+# SSE on /sse + /messages/ and stateless streamable HTTP on /mcp.
+# MCP_TRANSPORTS and MCP_WORKERS select what is served (see mcp_common/transports.py).
+# Per-tool call metrics are served on GET /metrics.
+starlette_app = build_app(app, on_shutdown=[http_client.aclose], metrics=registry.metrics)
 
 if __name__ == "__main__":
   print("Launching MCP Server exposing ADK tools...")
   try:
-    asyncio.run(uvicorn.run(starlette_app, host=APP_HOST, port=APP_PORT))
+    run_server("main:starlette_app", starlette_app, host=APP_HOST, port=APP_PORT)
   except KeyboardInterrupt:
     print("\nMCP Server stopped by user.")
   except Exception as e:
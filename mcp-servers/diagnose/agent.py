@@ -1,13 +1,11 @@
-import asyncio
 import os
-from contextlib import AsyncExitStack
 from dotenv import load_dotenv
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-from google.adk.tools.mcp_tool.mcp_session_manager import SseServerParams
 import logging 
-import nest_asyncio 
-from toolbox_core import ToolboxSyncClient
+
+from .model_scheduler import BACKGROUND, INTERACTIVE, scheduled
+from .toolset_loader import ToolsetLoader
 
 load_dotenv()
 # Load environment variables from .env file in the parent directory
@@ -21,7 +19,6 @@ log = logging.getLogger(__name__)
 # --- Global variables ---
 # Define them first, initialize as None
 root_agent: LlmAgent | None = None
-exit_stack: AsyncExitStack | None = None
 
 
 DB_TOOLS_URL = os.environ.get("DB_TOOLS_URL")
@@ -31,31 +28,32 @@ FUNCTION_TOOLS_URL = os.environ.get("FUNCTION_TOOLS_URL")
 print(f"DB_TOOLS_URL: {DB_TOOLS_URL}")
 print(f"API_TOOLS_URL: {API_TOOLS_URL}")
 print(f"FUNCTION_TOOLS_URL: {FUNCTION_TOOLS_URL}")
- 
 
-async def get_agent_async():
+# Nothing connects at import time. The first turn loads every toolset
+# concurrently (warm_up_toolsets below); see toolset_loader.py.
+toolsets = ToolsetLoader()
+toolDB = toolsets.add_toolbox("librarium", DB_TOOLS_URL, "summoner-librarium")
+toolFAPI = toolsets.add_mcp("nexus-of-whispers", API_TOOLS_URL)
+toolFunction = toolsets.add_mcp("arcane-forge", FUNCTION_TOOLS_URL)
+
+
+async def warm_up_toolsets(callback_context: CallbackContext):
+  """Connects the three tool servers together on the first turn, in the serving event loop."""
+  if not toolsets.warmed_up:
+    await toolsets.warm_up()
+  return None
+
+
+def get_agent():
   """
-  Asynchronously creates the MCP Toolset and the LlmAgent.
+  Creates the LlmAgents. Their toolsets load on the first turn.
 
   Returns:
-      tuple: (LlmAgent instance, AsyncExitStack instance for cleanup)
+      LlmAgent: the root agent
   """
-  print(f"DB_TOOLS_URL: {DB_TOOLS_URL}")
-  print(f"API_TOOLS_URL: {API_TOOLS_URL}")
-  print(f"FUNCTION_TOOLS_URL: {FUNCTION_TOOLS_URL}")
-
-  toolbox = ToolboxSyncClient(DB_TOOLS_URL)
-  
-  toolDB = toolbox.load_toolset('summoner-librarium')
-  toolFAPI =  MCPToolset(
-      connection_params=SseServerParams(url=API_TOOLS_URL, headers={})
-  )
-  toolFunction =  MCPToolset(
-      connection_params=SseServerParams(url=FUNCTION_TOOLS_URL, headers={})
-  )
-
+  # The root's calls answer the user; the specialists' calls queue behind them.
   db_agent = LlmAgent(
-      model='gemini-2.5-flash', 
+      model=scheduled('gemini-2.5-flash', priority=BACKGROUND),
       name='librarian_agent',  
       instruction="""
           You are the Lorekeeper of the Summoner's Librarium. Your sole purpose is to
@@ -63,10 +61,10 @@ async def get_agent_async():
           Use your tools to find the abilities of familiars and the base damage of specific abilities.
           You do not cast spells or perform calculations; you only retrieve existing knowledge.
       """,
-      tools=toolDB
+      tools=[toolDB]
   )
   mcp_agent = LlmAgent(
-      model='gemini-2.5-flash', 
+      model=scheduled('gemini-2.5-flash', priority=BACKGROUND),
       name='arcane_battlemage_agent',  
       instruction="""
           You are an Arcane Battlemage, a master of dynamic spellcasting.
@@ -79,7 +77,7 @@ async def get_agent_async():
       tools=[toolFunction,toolFAPI],
   )
   root_agent = LlmAgent(
-      model='gemini-2.5-flash', 
+      model=scheduled('gemini-2.5-flash', priority=INTERACTIVE),
       name='master_summoner_agent',
       instruction="""
           You are the Master Summoner, a grand strategist who orchestrates your sub-agents.
@@ -95,36 +93,11 @@ async def get_agent_async():
             to this agent.
       """,
       sub_agents=[db_agent,mcp_agent],
-      
+      before_agent_callback=warm_up_toolsets,
   )
   print("LlmAgent created.")
   return root_agent
 
 
 
-
-async def initialize():
-   """Initializes the global root_agent and exit_stack."""
-   global root_agent
-   if root_agent is None:
-       log.info("Initializing agent...")
-       root_agent = await get_agent_async()
-       if root_agent:
-           log.info("Agent initialized successfully.")
-       else:
-           log.error("Agent initialization failed.")
-   else:
-       log.info("Agent already initialized.")
-
-
-
-nest_asyncio.apply()
-
-log.info("Running agent initialization at module level using asyncio.run()...")
-try:
-    asyncio.run(initialize())
-    log.info("Module level asyncio.run(initialize()) completed.")
-except RuntimeError as e:
-    log.error(f"RuntimeError during module level initialization (likely nested loops): {e}", exc_info=True)
-except Exception as e:
-    log.error(f"Unexpected error during module level initialization: {e}", exc_info=True)
\ No newline at end of file
+root_agent = get_agent()
@@ -0,0 +1,319 @@
+# model_scheduler.py
+# Vendored from agent/model_scheduler.py (the familiars' image is built from
+# agent/ only). Keep the two in sync.
+"""
+Process-wide scheduling of model calls.
+
+Without coordination a burst (a ParallelAgent, a LoopAgent, several
+sub-agents) sends every model call at once, runs into the project's quota
+and retries blindly. ModelCallScheduler admits calls against:
+
+  * a requests-per-minute and a tokens-per-minute token bucket,
+  * a limit on calls in flight,
+
+and serves waiting calls by priority: INTERACTIVE calls (a summoner turn a
+user is waiting on) before BACKGROUND ones, first come first served within
+a priority.
+
+Agents use it by wrapping their model:
+
+    LlmAgent(model=scheduled("gemini-2.5-flash", priority=INTERACTIVE), ...)
+
+ScheduledLlm waits for a slot before each call, charges the bucket with
+the tokens the response actually used, and when the model still answers
+with a quota error (429 / RESOURCE_EXHAUSTED) backs off and retries through
+the scheduler instead of immediately.
+
+A slot covers the model call only. ADK runs the response's tool calls and
+transfer_to_agent sub-agents while the model generator is paused at its
+yield, so the slot is released before the response is handed on: a
+non-streaming call is read to the end first, and a streaming call releases
+at its first complete (non-partial) response. Otherwise a parent waiting on
+a scheduled sub-agent would hold the slot the sub-agent needs.
+
+`stats()` / `render_metrics()` report queue waits per priority; to_a2a
+includes them in GET /metrics.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from typing import AsyncGenerator, Optional, Union
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.base_llm_connection import BaseLlmConnection
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import errors
+from pydantic import Field
+
+log = logging.getLogger(__name__)
+
+MODEL_RPM = float(os.environ.get("MODEL_RPM", 600))
+MODEL_TPM = float(os.environ.get("MODEL_TPM", 1_000_000))
+# Calls that may start back to back after an idle spell (default: a full
+# minute's worth). Lower it when the quota is enforced over shorter windows.
+MODEL_REQUEST_BURST = float(os.environ.get("MODEL_REQUEST_BURST", 0)) or None
+MODEL_MAX_CONCURRENCY = int(os.environ.get("MODEL_MAX_CONCURRENCY", 8))
+MODEL_MAX_RETRIES = int(os.environ.get("MODEL_MAX_RETRIES", 3))
+# First pause after a quota error; doubles on each further retry of a call.
+MODEL_RETRY_BACKOFF_SECONDS = float(os.environ.get("MODEL_RETRY_BACKOFF_SECONDS", 1.0))
+# Output tokens assumed for a call until its usage is known.
+MODEL_OUTPUT_TOKENS_ESTIMATE = int(os.environ.get("MODEL_OUTPUT_TOKENS_ESTIMATE", 512))
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Overrides a ScheduledLlm's own priority for calls made in this context,
+# e.g. call_priority.set(INTERACTIVE) around a user-facing turn.
+call_priority: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("call_priority", default=None)
+
+WAIT_WINDOW = 1000
+
+
+class TokenBucket:
+    """`per_minute` units that refill continuously, holding at most `burst`.
+
+    The level may go negative after a correction or a pause.
+    """
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None) -> None:
+        self.capacity = burst or per_minute
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def pause(self, seconds: float, now: float) -> None:
+        """Empties the bucket so that nothing is available for `seconds`."""
+        self._refill(now)
+        self.level = min(self.level, -seconds * self.rate)
+
+
+class ModelCallScheduler:
+    """Admits model calls by priority within rate and concurrency limits."""
+
+    def __init__(
+        self,
+        rpm: float = MODEL_RPM,
+        tpm: float = MODEL_TPM,
+        max_concurrency: int = MODEL_MAX_CONCURRENCY,
+        request_burst: Optional[float] = MODEL_REQUEST_BURST,
+    ) -> None:
+        self.requests = TokenBucket(rpm, request_burst)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        # (priority, arrival order, tokens, future)
+        self._queue: list[tuple[int, int, float, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._waits = {priority: deque(maxlen=WAIT_WINDOW) for priority in PRIORITY_NAMES}
+        self._calls = {priority: 0 for priority in PRIORITY_NAMES}
+        self.quota_errors = 0
+
+    async def acquire(self, priority: int = BACKGROUND, tokens: float = 0) -> float:
+        """Waits for a slot; returns the tokens taken from the bucket, to pass to release().
+
+        That is `tokens`, or the bucket's capacity if the estimate exceeds it.
+        """
+        start = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._order), tokens, future))
+        self._dispatch()
+        try:
+            taken = await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller gave up: hand the slot and its tokens back.
+                self.release(future.result(), 0)
+            else:
+                self._queue = [entry for entry in self._queue if entry[3] is not future]
+                heapq.heapify(self._queue)
+            raise
+        waited = time.monotonic() - start
+        self._waits.setdefault(priority, deque(maxlen=WAIT_WINDOW)).append(waited)
+        self._calls[priority] = self._calls.get(priority, 0) + 1
+        return taken
+
+    def release(self, taken_tokens: float, used_tokens: Optional[float]) -> None:
+        """Frees the slot and corrects the token bucket by the tokens actually used.
+
+        `taken_tokens` is what acquire() returned, so the correction is made
+        against what was really taken, not against the estimate.
+        """
+        self.in_flight -= 1
+        if used_tokens is not None:
+            self.tokens.take(used_tokens - taken_tokens)
+        self._dispatch()
+
+    def throttled(self, backoff_seconds: float) -> None:
+        """The model reported a quota error: admit no call for backoff_seconds."""
+        self.quota_errors += 1
+        self.requests.pause(backoff_seconds, time.monotonic())
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue and self.in_flight < self.max_concurrency:
+            priority, _, tokens, future = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            now = time.monotonic()
+            delay = max(self.requests.delay(1, now), self.tokens.delay(tokens, now))
+            if delay > 0:
+                # The head waits for the buckets; nothing behind it may overtake it.
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            taken = min(tokens, self.tokens.capacity)
+            self.requests.take(1)
+            self.tokens.take(taken)
+            self.in_flight += 1
+            future.set_result(taken)
+
+    def stats(self) -> dict:
+        waits = {}
+        for priority, samples in self._waits.items():
+            ordered = sorted(samples)
+            waits[PRIORITY_NAMES.get(priority, str(priority))] = {
+                "calls": self._calls.get(priority, 0),
+                "wait_p50_seconds": ordered[len(ordered) // 2] if ordered else 0.0,
+                "wait_p95_seconds": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else 0.0,
+                "wait_max_seconds": ordered[-1] if ordered else 0.0,
+            }
+        return {
+            "queued": sum(1 for entry in self._queue if not entry[3].done()),
+            "in_flight": self.in_flight,
+            "quota_errors": self.quota_errors,
+            "waits": waits,
+        }
+
+    def render_metrics(self) -> str:
+        """Prometheus text gauges, in the format of the /metrics endpoints."""
+        stats = self.stats()
+        lines = [
+            "# TYPE model_scheduler_queued gauge",
+            f"model_scheduler_queued {stats['queued']}",
+            "# TYPE model_scheduler_in_flight gauge",
+            f"model_scheduler_in_flight {stats['in_flight']}",
+            "# TYPE model_scheduler_quota_errors gauge",
+            f"model_scheduler_quota_errors {stats['quota_errors']}",
+        ]
+        for metric in ("calls", "wait_p50_seconds", "wait_p95_seconds", "wait_max_seconds"):
+            lines.append(f"# TYPE model_scheduler_{metric} gauge")
+            for priority, values in stats["waits"].items():
+                lines.append(f'model_scheduler_{metric}{{priority="{priority}"}} {values[metric]}')
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every ScheduledLlm in the process.
+model_scheduler = ModelCallScheduler()
+
+
+def estimate_tokens(llm_request: LlmRequest) -> int:
+    """Rough prompt size (4 characters per token) plus the expected output."""
+    chars = sum(
+        len(part.text or "") for content in llm_request.contents for part in (content.parts or [])
+    )
+    if llm_request.config is not None and isinstance(llm_request.config.system_instruction, str):
+        chars += len(llm_request.config.system_instruction)
+    return chars // 4 + MODEL_OUTPUT_TOKENS_ESTIMATE
+
+
+def _used_tokens(response: LlmResponse) -> Optional[int]:
+    if response.usage_metadata and response.usage_metadata.total_token_count:
+        return response.usage_metadata.total_token_count
+    return None
+
+
+def _is_quota_error(error: Exception) -> bool:
+    return isinstance(error, errors.APIError) and (error.code == 429 or error.status == "RESOURCE_EXHAUSTED")
+
+
+class ScheduledLlm(BaseLlm):
+    """Wraps a model so that its calls go through a ModelCallScheduler."""
+
+    llm: BaseLlm
+    priority: int = BACKGROUND
+    max_retries: int = MODEL_MAX_RETRIES
+    scheduler: ModelCallScheduler = Field(default_factory=lambda: model_scheduler, exclude=True)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        priority = call_priority.get()
+        priority = self.priority if priority is None else priority
+        estimate = estimate_tokens(llm_request)
+        for attempt in range(self.max_retries + 1):
+            taken = await self.scheduler.acquire(priority, estimate)
+            used = None
+            released = False
+            yielded = False
+
+            def release() -> None:
+                nonlocal released
+                if not released:
+                    released = True
+                    self.scheduler.release(taken, used)
+
+            try:
+                if not stream:
+                    responses = []
+                    async for response in self.llm.generate_content_async(llm_request, stream=False):
+                        responses.append(response)
+                        used = _used_tokens(response) or used
+                    release()
+                    for response in responses:
+                        yield response
+                    return
+                async for response in self.llm.generate_content_async(llm_request, stream=True):
+                    used = _used_tokens(response) or used
+                    if not response.partial:
+                        release()
+                    yielded = True
+                    yield response
+                return
+            except Exception as e:
+                # A stream that already produced output cannot be replayed.
+                if not _is_quota_error(e) or yielded or attempt == self.max_retries:
+                    raise
+                backoff = MODEL_RETRY_BACKOFF_SECONDS * 2**attempt
+                self.scheduler.throttled(backoff)
+                log.warning(
+                    f"{self.model}: quota error, retrying through the scheduler in {backoff:.1f}s"
+                    f" ({attempt + 1}/{self.max_retries})"
+                )
+            finally:
+                release()
+
+    def connect(self, llm_request: LlmRequest) -> BaseLlmConnection:
+        # Live sessions hold a connection, not a call; they are not scheduled.
+        return self.llm.connect(llm_request)
+
+
+def scheduled(model: Union[str, BaseLlm], priority: int = BACKGROUND, **kwargs) -> ScheduledLlm:
+    """`model` (a name such as "gemini-2.5-flash", or a BaseLlm) behind the shared scheduler."""
+    llm = LLMRegistry.new_llm(model) if isinstance(model, str) else model
+    return ScheduledLlm(model=llm.model, llm=llm, priority=priority, **kwargs)
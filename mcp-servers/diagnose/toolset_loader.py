@@ -0,0 +1,201 @@
+# toolset_loader.py
+# Vendored from agent/toolset_loader.py (the familiars' image is built from agent/
+# only), without add_function_tools and add_lore_cache. Keep the two in sync.
+"""
+Concurrent, deferred toolset initialization for the familiars.
+
+The familiars used to load their tools one after another at import time:
+the Toolbox toolset with a blocking `ToolboxSyncClient.load_toolset`, then
+each MCPToolset on its first `get_tools`. Cold start paid the sum of those
+round trips.
+
+ToolsetLoader hands out LazyToolsets that an agent can use in `tools=[...]`
+straight away. `warm_up()` connects every eager toolset concurrently;
+toolsets added with eager=False, or named in DEFERRED_TOOLSETS, connect on
+the first agent invocation that needs them. The familiars hand their
+loader to to_a2a(..., toolsets=toolsets), which runs `warm_up()` at startup.
+`readiness()` reports what has loaded, and to_a2a serves it on GET /ready.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Optional
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.function_tool import FunctionTool
+
+log = logging.getLogger(__name__)
+
+# Comma-separated toolset names to load on first use instead of at startup.
+DEFERRED_TOOLSETS = os.environ.get("DEFERRED_TOOLSETS", "")
+
+PENDING = "pending"
+LOADING = "loading"
+LOADED = "loaded"
+FAILED = "failed"
+DEFERRED = "deferred"
+
+
+class LazyToolset(BaseToolset):
+    """A toolset whose tools are fetched once, on warm-up or on first use.
+
+    The agent card is built without an invocation context. Until a toolset
+    has loaded, such calls get no tools instead of forcing the connection,
+    so deferred toolsets do not slow down serving the card.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load: Callable[[], Awaitable[list[BaseTool]]],
+        close: Optional[Callable[[], Awaitable[None]]] = None,
+        *,
+        eager: bool = True,
+    ) -> None:
+        super().__init__()
+        self.name = name
+        self.eager = eager
+        self._load = load
+        self._close = close
+        self._tools: Optional[list[BaseTool]] = None
+        self._loading: Optional[asyncio.Task] = None
+        self.status = PENDING if eager else DEFERRED
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._tools is not None
+
+    async def load(self) -> list[BaseTool]:
+        """Loads the tools once; concurrent callers share the same attempt."""
+        if self._tools is not None:
+            return self._tools
+        loading = self._loading
+        # A task from an earlier event loop (the import-time one) cannot be awaited here.
+        if loading is None or loading.get_loop() is not asyncio.get_running_loop():
+            loading = self._loading = asyncio.ensure_future(self._run_load())
+        try:
+            return await asyncio.shield(loading)
+        finally:
+            if loading.done() and self._tools is None:
+                # Failed: let the next caller try again.
+                self._loading = None
+
+    async def _run_load(self) -> list[BaseTool]:
+        self.status = LOADING
+        start = time.perf_counter()
+        try:
+            tools = await self._load()
+        except Exception as e:
+            self.status, self.error = FAILED, str(e)
+            log.error(f"Loading toolset '{self.name}' failed: {e}")
+            raise
+        self.load_seconds = time.perf_counter() - start
+        self._tools, self.status, self.error = tools, LOADED, None
+        log.info(f"Loaded toolset '{self.name}' ({len(tools)} tools) in {self.load_seconds:.2f}s")
+        return tools
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> list[BaseTool]:
+        if readonly_context is None and self._tools is None:
+            return []
+        return await self.load()
+
+    async def close(self) -> None:
+        if self._close is not None:
+            await self._close()
+
+
+class ToolsetLoader:
+    """The toolsets of one familiar, loaded together by `warm_up`."""
+
+    def __init__(self, deferred: str = DEFERRED_TOOLSETS) -> None:
+        self.toolsets: dict[str, LazyToolset] = {}
+        self.deferred = {name.strip() for name in deferred.split(",") if name.strip()}
+        self.warmed_up = False
+        self.warm_up_seconds: Optional[float] = None
+
+    def add(self, toolset: LazyToolset) -> LazyToolset:
+        if toolset.name in self.toolsets:
+            raise ValueError(f"Toolset '{toolset.name}' is already registered.")
+        if toolset.name in self.deferred:
+            toolset.eager, toolset.status = False, DEFERRED
+        self.toolsets[toolset.name] = toolset
+        return toolset
+
+    @staticmethod
+    def _mcp_connection(url: str, headers: Optional[dict]) -> tuple[Callable, Callable]:
+        """load and close functions for one MCPToolset, created on first load."""
+        from google.adk.tools.mcp_tool.mcp_session_manager import SseServerParams
+        from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+
+        toolset: Optional[MCPToolset] = None
+
+        async def load() -> list[BaseTool]:
+            nonlocal toolset
+            if toolset is None:
+                toolset = MCPToolset(connection_params=SseServerParams(url=url, headers=headers or {}))
+            return await toolset.get_tools()
+
+        async def close() -> None:
+            if toolset is not None:
+                await toolset.close()
+
+        return load, close
+
+    def add_mcp(self, name: str, url: str, *, headers: Optional[dict] = None, eager: bool = True) -> LazyToolset:
+        """An MCP server reached over SSE (the Arcane Forge, the Nexus of Whispers)."""
+        load, close = self._mcp_connection(url, headers)
+        return self.add(LazyToolset(name, load, close, eager=eager))
+
+    def add_toolbox(self, name: str, url: str, toolset_name: str, *, eager: bool = True) -> LazyToolset:
+        """A toolset served by the MCP Toolbox for Databases."""
+        from toolbox_core import ToolboxSyncClient
+
+        client: Optional[ToolboxSyncClient] = None
+
+        async def load() -> list[BaseTool]:
+            nonlocal client
+            client = ToolboxSyncClient(url)
+            try:
+                # load_toolset blocks until the Toolbox answers; keep it off the event loop.
+                tools = await asyncio.to_thread(client.load_toolset, toolset_name)
+            except Exception:
+                # The next attempt makes a new client; close this one's session now.
+                failed, client = client, None
+                await asyncio.to_thread(failed.close)
+                raise
+            return [FunctionTool(tool) for tool in tools]
+
+        async def close() -> None:
+            if client is not None:
+                await asyncio.to_thread(client.close)
+
+        return self.add(LazyToolset(name, load, close, eager=eager))
+
+    async def warm_up(self) -> None:
+        """Loads every eager toolset concurrently. Failures are logged, not raised."""
+        start = time.perf_counter()
+        eager = [t for t in self.toolsets.values() if t.eager]
+        await asyncio.gather(*(t.load() for t in eager), return_exceptions=True)
+        self.warm_up_seconds = time.perf_counter() - start
+        self.warmed_up = True
+        log.info(f"Toolset warm-up finished in {self.warm_up_seconds:.2f}s")
+
+    def readiness(self) -> tuple[bool, dict]:
+        """(ready, details): ready once warm-up is done and no eager toolset failed."""
+        ready = self.warmed_up and all(t.loaded for t in self.toolsets.values() if t.eager)
+        return ready, {
+            "ready": ready,
+            "warm_up_seconds": self.warm_up_seconds,
+            "toolsets": {
+                name: {"status": t.status, "seconds": t.load_seconds, "error": t.error}
+                for name, t in self.toolsets.items()
+            },
+        }
+
+    async def close(self) -> None:
+        await asyncio.gather(*(t.close() for t in self.toolsets.values()), return_exceptions=True)
@@ -0,0 +1,61 @@
+# forge_tools.py
+"""
+The Arcane Forge's tools and their ToolRegistry.
+
+main.py serves this registry over MCP. The element agents import this module
+directly to call the same tools in-process (agent/local_tools.py), so it only
+registers tools: no environment loading, app or server.
+"""
+import sys
+import os
+
+# mcp_common lives in mcp-servers/ next to this server (and in /app in the container).
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mcp_common.tool_registry import ToolRegistry
+
+
+registry = ToolRegistry()
+
+
+@registry.tool(pure=True)
+def inferno_resonance(base_fire_damage: int) -> str:
+    """
+    Inferno Resonance
+    Applies a resonance enchantment that amplifies ambient fire energy,
+    multiplying the power of a fire spell by a factor of 3.
+    """
+    final_damage = base_fire_damage * 3
+    # Thematic success message for multiplication
+    return f"The Forge roars to life! The fire spell's power is multiplied by Inferno Resonance, now charged to deal {final_damage} damage."
+
+
+@registry.tool(pure=True)
+def leviathan_surge(base_water_damage: int) -> str:
+    """
+    Leviathan Surge
+    Channels a surge of raw water magic through the Forge,
+    multiplying the power of a water-based attack by a factor of 2.
+    """
+    # FIX: The original code used 'base_water_damage * 3'. This now matches that logic.
+    final_damage = base_water_damage * 3
+    # FIX: The original f-string was broken. This is the corrected version.
+    return f"A torrent of power surges from the Forge! The water spell is magnified, now ready to strike for {final_damage} damage."
+
+
+@registry.tool(pure=True)
+def seismic_charge(current_energy: int) -> str:
+    """
+    Seismic Charge
+    Draws raw power from the earth itself, slowly accumulating seismic energy.
+    This action increments the current energy charge by 2 units.
+    """
+    charged_energy = current_energy + 2
+    # Thematic success message for accumulation
+    return f"The ground trembles as seismic energy is absorbed. The power charge has accumulated to {charged_energy} units."
+
+# Lets an agent run several multiplier / accumulator steps in one round trip
+registry.add_batch_tool()
+
+# Build the MCP schemas once, at startup
+registry.freeze()
+available_tools = registry.tools
@@ -0,0 +1 @@
+"""Code shared by the Arcane Forge and Nexus of Whispers MCP servers."""
@@ -0,0 +1,156 @@
+# mcp_common/metrics.py
+"""
+In-process metrics for the MCP servers, exposed in Prometheus text format.
+
+ToolRegistry records every tool call here: a call counter and an error
+counter per tool, a latency histogram, and request/response payload sizes.
+build_app keeps a gauge of open SSE sessions and serves GET /metrics.
+
+Recording is a few dict lookups and integer additions with no locks; all
+updates happen on the server's event loop. With MCP_WORKERS > 1 every
+worker process keeps its own numbers, so scrape each worker or sum them.
+"""
+import bisect
+import time
+from typing import Callable, Iterable
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _ToolStats:
+  """Counters for one tool."""
+
+  __slots__ = ("calls", "errors", "cache_hits", "latency_counts", "latency_sum", "request_bytes", "response_bytes")
+
+  def __init__(self) -> None:
+    self.calls = 0
+    self.errors = 0
+    self.cache_hits = 0
+    # One count per bucket plus a final +Inf bucket; cumulated when rendered.
+    self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    self.latency_sum = 0.0
+    self.request_bytes = 0
+    self.response_bytes = 0
+
+
+def _escape(value: str) -> str:
+  return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+  return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+  """Per-tool call metrics, an SSE session gauge and pluggable stats sources."""
+
+  def __init__(self, namespace: str = "mcp") -> None:
+    self.namespace = namespace
+    self.tools: dict[str, _ToolStats] = {}
+    self.sse_sessions = 0
+    self.sse_sessions_total = 0
+    self._sources: list[tuple[str, Callable[[], dict], frozenset[str]]] = []
+    self._started = time.time()
+
+  def _tool(self, name: str) -> _ToolStats:
+    stats = self.tools.get(name)
+    if stats is None:
+      stats = self.tools[name] = _ToolStats()
+    return stats
+
+  def observe_call(
+      self,
+      tool: str,
+      seconds: float,
+      *,
+      error: bool = False,
+      cache_hit: bool = False,
+      request_bytes: int = 0,
+      response_bytes: int = 0,
+  ) -> None:
+    """Records one finished tool call."""
+    stats = self._tool(tool)
+    stats.calls += 1
+    if error:
+      stats.errors += 1
+    if cache_hit:
+      stats.cache_hits += 1
+    stats.latency_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    stats.latency_sum += seconds
+    stats.request_bytes += request_bytes
+    stats.response_bytes += response_bytes
+
+  def sse_session_opened(self) -> None:
+    self.sse_sessions += 1
+    self.sse_sessions_total += 1
+
+  def sse_session_closed(self) -> None:
+    self.sse_sessions -= 1
+
+  def add_source(self, prefix: str, stats: Callable[[], dict], counters: Iterable[str] = ()) -> None:
+    """Exports every numeric value of stats() as `<namespace>_<prefix>_<key>`.
+
+    Keys listed in `counters` are typed as counters, the rest as gauges.
+    """
+    self._sources.append((prefix, stats, frozenset(counters)))
+
+  def render(self) -> str:
+    """Returns all metrics in the Prometheus text exposition format."""
+    ns = self.namespace
+    lines: list[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> str:
+      full = f"{ns}_{name}"
+      lines.append(f"# HELP {full} {help_text}")
+      lines.append(f"# TYPE {full} {kind}")
+      return full
+
+    tools = sorted(self.tools.items())
+    for attr, name, help_text in (
+        ("calls", "tool_calls_total", "Tool calls handled, including cache hits and errors."),
+        ("errors", "tool_errors_total", "Tool calls that failed."),
+        ("cache_hits", "tool_cache_hits_total", "Tool calls answered from the result cache."),
+        ("request_bytes", "tool_request_bytes_total", "Bytes of JSON arguments received."),
+        ("response_bytes", "tool_response_bytes_total", "Bytes of JSON results returned."),
+    ):
+      full = family(name, "counter", help_text)
+      for tool, stats in tools:
+        lines.append(f'{full}{{tool="{_escape(tool)}"}} {getattr(stats, attr)}')
+
+    full = family("tool_latency_seconds", "histogram", "Tool call latency.")
+    for tool, stats in tools:
+      label = f'tool="{_escape(tool)}"'
+      cumulative = 0
+      for bound, count in zip(LATENCY_BUCKETS, stats.latency_counts):
+        cumulative += count
+        lines.append(f'{full}_bucket{{{label},le="{bound}"}} {cumulative}')
+      lines.append(f'{full}_bucket{{{label},le="+Inf"}} {stats.calls}')
+      lines.append(f"{full}_sum{{{label}}} {stats.latency_sum!r}")
+      lines.append(f"{full}_count{{{label}}} {stats.calls}")
+
+    full = family("sse_sessions", "gauge", "Open SSE sessions.")
+    lines.append(f"{full} {self.sse_sessions}")
+    full = family("sse_sessions_total", "counter", "SSE sessions opened since start.")
+    lines.append(f"{full} {self.sse_sessions_total}")
+    full = family("process_start_time_seconds", "gauge", "Unix time the metrics were created.")
+    lines.append(f"{full} {self._started!r}")
+
+    for prefix, stats, counters in self._sources:
+      for key, value in stats().items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+          continue
+        kind = "counter" if key in counters else "gauge"
+        full = family(f"{prefix}_{key}{'_total' if kind == 'counter' else ''}", kind, f"{prefix} {key}.")
+        lines.append(f"{full} {_number(value)}")
+
+    return "\n".join(lines) + "\n"
+
+  async def endpoint(self, request: Request) -> Response:
+    """Starlette handler for GET /metrics."""
+    return Response(self.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,90 @@
+# mcp_common/result_cache.py
+"""
+LRU cache for the results of pure tools.
+
+Keys are the tool name plus its arguments serialized as canonical JSON
+(sorted keys, no whitespace), so {"a": 1, "b": 2} and {"b": 2, "a": 1} hit
+the same entry. Tools registered with pure=True are cached until evicted;
+tools registered with a cache_ttl are cached for that many seconds.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+TOOL_RESULT_CACHE_SIZE = int(os.environ.get("TOOL_RESULT_CACHE_SIZE", 1024))
+
+
+class CachedResult:
+  """A tool's raw result and, once built, its MCP content response."""
+
+  __slots__ = ("result", "content", "expires_at")
+
+  def __init__(self, result: Any, content: list | None = None) -> None:
+    self.result = result
+    self.content = content
+    # time.monotonic() deadline, or None for entries that never expire.
+    self.expires_at: float | None = None
+
+
+class ResultCache:
+  """Bounded LRU of (tool name, canonical arguments) -> CachedResult."""
+
+  def __init__(self, max_entries: int = TOOL_RESULT_CACHE_SIZE) -> None:
+    self.max_entries = max_entries
+    self._entries: OrderedDict[tuple[str, str], CachedResult] = OrderedDict()
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  @staticmethod
+  def make_key(name: str, arguments: dict) -> tuple[str, str] | None:
+    """Returns the cache key, or None if the arguments are not JSON-serializable."""
+    try:
+      return name, json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+      return None
+
+  def get(self, key: tuple[str, str]) -> CachedResult | None:
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+        del self._entries[key]
+        self.expirations += 1
+        entry = None
+      if entry is None:
+        self.misses += 1
+        return None
+      self._entries.move_to_end(key)
+      self.hits += 1
+      return entry
+
+  def put(self, key: tuple[str, str], entry: CachedResult, ttl: float | None = None) -> None:
+    """Stores an entry; with a ttl it expires after that many seconds."""
+    if self.max_entries <= 0:
+      return
+    if ttl is not None:
+      entry.expires_at = time.monotonic() + ttl
+    with self._lock:
+      self._entries[key] = entry
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+        self.evictions += 1
+
+  def stats(self) -> dict:
+    return {
+        "size": len(self._entries),
+        "max_entries": self.max_entries,
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+        "expirations": self.expirations,
+    }
@@ -0,0 +1,43 @@
+# mcp_common/single_flight.py
+"""
+Single-flight coalescing of identical concurrent calls.
+
+While a call for a key is in flight, later callers with the same key wait
+for that call and share its result (or its exception) instead of starting
+their own.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+  """Collapses concurrent calls that share a key into one."""
+
+  def __init__(self) -> None:
+    self._in_flight: dict[Hashable, asyncio.Future] = {}
+    # Calls that actually ran, and calls that joined one already running.
+    self.executed = 0
+    self.coalesced = 0
+
+  async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+    shared = self._in_flight.get(key)
+    if shared is not None:
+      self.coalesced += 1
+    else:
+      # fn runs in its own task, so no caller's cancellation reaches the call
+      # the others wait on; every caller, the first included, awaits it
+      # through shield.
+      shared = asyncio.ensure_future(fn())
+      self._in_flight[key] = shared
+      self.executed += 1
+
+      def _done(f: asyncio.Future) -> None:
+        del self._in_flight[key]
+        # Nobody may be waiting; mark the exception as retrieved to avoid a warning.
+        f.cancelled() or f.exception()
+
+      shared.add_done_callback(_done)
+    return await asyncio.shield(shared)
+
+  def stats(self) -> dict:
+    return {"in_flight": len(self._in_flight), "executed": self.executed, "coalesced": self.coalesced}
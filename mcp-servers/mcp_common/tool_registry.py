@@ -0,0 +1,294 @@
+# mcp_common/tool_registry.py
+"""
+Tool registry for the MCP servers.
+
+Functions are registered with the `tool` decorator (or `add`). The registry
+wraps each one in an ADK FunctionTool and converts it to its MCP schema once,
+so `list_tools` returns a prebuilt list instead of repeating the conversion
+on every request.
+
+`add_batch_tool` registers one extra tool that runs many (tool, arguments)
+pairs concurrently in a single MCP call_tool round trip.
+
+Tools registered with pure=True (same arguments, same result, no side
+effects) are memoized in a ResultCache. Anything that talks to the outside
+world, such as the Nexus API tools, must keep the default pure=False.
+
+Tools registered with coalesce=True share one execution between identical
+concurrent calls (see single_flight.py), and cache_ttl keeps their results
+for that many seconds. Both suit idempotent calls to an upstream API.
+
+Every call, batched or not, is recorded in `metrics` (see metrics.py).
+"""
+import asyncio
+import json
+import time
+from typing import Any, Callable
+
+from mcp import types as mcp_types
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.mcp_tool.conversion_utils import adk_to_mcp_tool_type
+
+from .metrics import Metrics
+from .result_cache import CachedResult, ResultCache
+from .single_flight import SingleFlight
+
+
+# Largest number of calls accepted in one batch_call_tools request.
+MAX_BATCH_SIZE = 64
+
+# Metrics label for calls to names that are not registered, so arbitrary
+# client input cannot create new time series.
+UNKNOWN_TOOL = "<unknown>"
+
+
+class ToolRegistry:
+  """Holds the FunctionTools served by one MCP server and their MCP schemas."""
+
+  def __init__(self, result_cache: ResultCache | None = None, metrics: Metrics | None = None) -> None:
+    self.tools: dict[str, FunctionTool] = {}
+    self.pure_tools: set[str] = set()
+    self.coalesced_tools: set[str] = set()
+    self.cache_ttls: dict[str, float] = {}
+    self.result_cache = result_cache or ResultCache()
+    self.single_flight = SingleFlight()
+    self.metrics = metrics or Metrics()
+    self.metrics.add_source("result_cache", self.result_cache.stats, counters=("hits", "misses", "evictions", "expirations"))
+    self.metrics.add_source("single_flight", self.single_flight.stats, counters=("executed", "coalesced"))
+    self._mcp_tools: list[mcp_types.Tool] | None = None
+    self._batch_tool_names: set[str] = set()
+    self.max_batch_size = MAX_BATCH_SIZE
+
+  def add(
+      self,
+      func: Callable,
+      *,
+      pure: bool = False,
+      coalesce: bool = False,
+      cache_ttl: float | None = None,
+  ) -> FunctionTool:
+    """Registers a function and returns its FunctionTool.
+
+    Pass pure=True only for functions whose result depends on nothing but
+    their arguments; their results are then cached. coalesce=True collapses
+    identical in-flight calls into one, and a cache_ttl > 0 caches results
+    for that many seconds.
+    """
+    if self._mcp_tools is not None:
+      raise RuntimeError(f"Cannot register '{func.__name__}': the tool list is already frozen.")
+    tool = FunctionTool(func)
+    if tool.name in self.tools:
+      raise ValueError(f"Tool '{tool.name}' is already registered.")
+    self.tools[tool.name] = tool
+    if pure:
+      self.pure_tools.add(tool.name)
+    if coalesce:
+      self.coalesced_tools.add(tool.name)
+    if cache_ttl:
+      self.cache_ttls[tool.name] = cache_ttl
+    return tool
+
+  def tool(self, func: Callable | None = None, **options):
+    """Decorator form of `add`; use as @registry.tool or @registry.tool(pure=True)."""
+    if func is None:
+      return lambda f: self.tool(f, **options)
+    self.add(func, **options)
+    return func
+
+  def _cache_key(self, name: str, arguments: dict) -> tuple[str, str] | None:
+    if name not in self.pure_tools and name not in self.cache_ttls:
+      return None
+    return ResultCache.make_key(name, arguments)
+
+  @staticmethod
+  def _payload_size(arguments: Any, key: tuple[str, str] | None = None) -> int:
+    if key is not None:
+      return len(key[1])
+    try:
+      return len(json.dumps(arguments, separators=(",", ":")))
+    except (TypeError, ValueError):
+      return 0
+
+  @staticmethod
+  def is_error_result(result: Any) -> bool:
+    """True for the {"error": ...} dict FunctionTool returns instead of raising (e.g. missing arguments)."""
+    return isinstance(result, dict) and "error" in result
+
+  def _cache_put(self, key: tuple[str, str], entry: CachedResult) -> None:
+    if self.is_error_result(entry.result):
+      return
+    self.result_cache.put(key, entry, ttl=self.cache_ttls.get(key[0]))
+
+  def freeze(self) -> list[mcp_types.Tool]:
+    """Builds the MCP schemas. Call once at startup, after every tool is registered."""
+    if self._mcp_tools is None:
+      mcp_tools = [adk_to_mcp_tool_type(tool) for tool in self.tools.values()]
+      targets = [tool for tool in mcp_tools if tool.name not in self._batch_tool_names]
+      self._mcp_tools = [
+          self._typed_batch_schema(tool, targets, self.max_batch_size) if tool.name in self._batch_tool_names else tool
+          for tool in mcp_tools
+      ]
+      print(f"MCP Server: Advertising tools: {', '.join(self.tools)}")
+    return self._mcp_tools
+
+  @staticmethod
+  def _typed_batch_schema(batch_tool: mcp_types.Tool, targets: list[mcp_types.Tool], max_batch_size: int) -> mcp_types.Tool:
+    """Spells out the batch tool's call items: a tool name and that tool's arguments.
+
+    The `list[dict]` annotation alone gives items with no properties, which
+    tells a model nothing about what a call looks like.
+    """
+    arguments: dict[str, Any] = {}
+    for tool in targets:
+      arguments.update(tool.inputSchema.get("properties", {}))
+    item = {
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "enum": [tool.name for tool in targets]},
+            "arguments": {
+                "type": "object",
+                "description": "The arguments of the named tool.",
+                "properties": arguments,
+            },
+        },
+        "required": ["name", "arguments"],
+    }
+    calls = {**batch_tool.inputSchema["properties"]["calls"], "items": item, "maxItems": max_batch_size}
+    schema = {**batch_tool.inputSchema, "properties": {**batch_tool.inputSchema["properties"], "calls": calls}}
+    return batch_tool.model_copy(update={"inputSchema": schema})
+
+  @property
+  def mcp_tools(self) -> list[mcp_types.Tool]:
+    """The list_tools response, built on first use if `freeze` was not called."""
+    return self._mcp_tools if self._mcp_tools is not None else self.freeze()
+
+  def add_batch_tool(self, name: str = "batch_call_tools") -> FunctionTool:
+    """Registers a tool that runs several registered tools in one request."""
+    registry = self
+
+    async def batch_call_tools(calls: list[dict]) -> list[dict]:
+      """
+      Batch Call
+      Runs several of this server's tools in one request. The calls run
+      concurrently and the results come back in the same order as the calls.
+      A failing call does not affect the others.
+
+      Args:
+        calls: The calls to run, each an object like
+          {"name": "inferno_resonance", "arguments": {"base_fire_damage": 80}}.
+
+      Returns:
+        One entry per call: {"name": ..., "result": ...} on success or
+        {"name": ..., "error": ...} on failure.
+      """
+      return await registry.call_batch(calls)
+
+    batch_call_tools.__name__ = name
+    tool = self.add(batch_call_tools)
+    self._batch_tool_names.add(tool.name)
+    return tool
+
+  async def _execute(self, name: str, arguments: dict) -> Any:
+    """Runs a registered tool and returns its raw result."""
+    tool_to_call = self.tools[name]
+
+    async def run():
+      return await tool_to_call.run_async(
+          args=arguments,
+          tool_context=None, # No ADK context available here
+      )
+
+    if name in self.coalesced_tools:
+      key = ResultCache.make_key(name, arguments)
+      if key is not None:
+        return await self.single_flight.do(key, run)
+    return await run()
+
+  async def call(self, name: str, arguments: dict) -> list[mcp_types.TextContent]:
+    """Runs a registered tool and wraps its result as MCP text content."""
+    print(f"MCP Server: Received call_tool request for '{name}' with args: {arguments}")
+    start = time.perf_counter()
+
+    if name not in self.tools:
+      # Handle calls to unknown tools
+      print(f"MCP Server: Tool '{name}' not found.")
+      error_text = json.dumps({"error": f"Tool '{name}' not implemented."})
+      self.metrics.observe_call(UNKNOWN_TOOL, time.perf_counter() - start, error=True, response_bytes=len(error_text))
+      return [mcp_types.TextContent(type="text", text=error_text)]
+
+    key = self._cache_key(name, arguments)
+    request_bytes = self._payload_size(arguments, key)
+    if key is not None:
+      cached = self.result_cache.get(key)
+      if cached is not None:
+        if cached.content is None:
+          cached.content = [mcp_types.TextContent(type="text", text=json.dumps(cached.result, indent=2))]
+        self.metrics.observe_call(
+            name, time.perf_counter() - start, cache_hit=True,
+            request_bytes=request_bytes, response_bytes=len(cached.content[0].text),
+        )
+        return cached.content
+
+    try:
+      adk_response = await self._execute(name, arguments)
+      failed = self.is_error_result(adk_response)
+      print(f"MCP Server: ADK tool '{name}' {'returned an error' if failed else 'executed successfully'}.")
+
+      response_text = json.dumps(adk_response, indent=2)
+      content = [mcp_types.TextContent(type="text", text=response_text)]
+      if key is not None:
+        self._cache_put(key, CachedResult(adk_response, content))
+      self.metrics.observe_call(
+          name, time.perf_counter() - start, error=failed,
+          request_bytes=request_bytes, response_bytes=len(response_text),
+      )
+      return content
+
+    except Exception as e:
+      print(f"MCP Server: Error executing ADK tool '{name}': {e}")
+      error_text = json.dumps({"error": f"Failed to execute tool '{name}': {str(e)}"})
+      self.metrics.observe_call(
+          name, time.perf_counter() - start, error=True,
+          request_bytes=request_bytes, response_bytes=len(error_text),
+      )
+      return [mcp_types.TextContent(type="text", text=error_text)]
+
+  async def call_batch(self, calls: list[dict]) -> list[dict]:
+    """Runs many tool calls concurrently; returns per-call results in order."""
+    if len(calls) > self.max_batch_size:
+      raise ValueError(f"A batch holds at most {self.max_batch_size} calls, got {len(calls)}.")
+    print(f"MCP Server: Received batch of {len(calls)} tool calls.")
+
+    async def run_one(call: dict) -> dict:
+      name = call.get("name") if isinstance(call, dict) else None
+      arguments = (call.get("arguments") or {}) if isinstance(call, dict) else {}
+      if not name:
+        return {"name": name, "error": "Each call needs a 'name'."}
+      if name not in self.tools:
+        self.metrics.observe_call(UNKNOWN_TOOL, 0.0, error=True)
+        return {"name": name, "error": f"Tool '{name}' not implemented."}
+      if name in self._batch_tool_names:
+        return {"name": name, "error": "Batch calls cannot be nested."}
+      # Batch items are recorded without a response size; the batch tool's
+      # own call accounts for the bytes sent back.
+      start = time.perf_counter()
+      key = self._cache_key(name, arguments)
+      request_bytes = self._payload_size(arguments, key)
+      if key is not None:
+        cached = self.result_cache.get(key)
+        if cached is not None:
+          self.metrics.observe_call(name, time.perf_counter() - start, cache_hit=True, request_bytes=request_bytes)
+          return {"name": name, "result": cached.result}
+      try:
+        result = await self._execute(name, arguments)
+        if key is not None:
+          self._cache_put(key, CachedResult(result))
+        self.metrics.observe_call(
+            name, time.perf_counter() - start, error=self.is_error_result(result), request_bytes=request_bytes,
+        )
+        return {"name": name, "result": result}
+      except Exception as e:
+        self.metrics.observe_call(name, time.perf_counter() - start, error=True, request_bytes=request_bytes)
+        return {"name": name, "error": f"Failed to execute tool '{name}': {str(e)}"}
+
+    return list(await asyncio.gather(*(run_one(call) for call in calls)))
@@ -0,0 +1,145 @@
+# mcp_common/transports.py
+"""
+HTTP transports and launch modes for the MCP servers.
+
+Two transports can be served from the same Starlette app:
+
+  sse              GET /sse opens a long-lived event stream and the client
+                   POSTs to /messages/. The session lives in the memory of
+                   the process that accepted the stream.
+  streamable-http  POST /mcp in stateless mode. Every request carries all it
+                   needs, so any worker process can answer it.
+
+MCP_TRANSPORTS picks the transports (comma separated, default: both) and
+MCP_WORKERS the number of uvicorn worker processes (default: 1). With more
+than one worker a /messages/ post could reach a process that does not own
+its SSE session, so SSE is switched off and only stateless streamable HTTP
+is served.
+"""
+import contextlib
+import os
+import sys
+from typing import Awaitable, Callable, Sequence
+
+import uvicorn
+from mcp.server.lowlevel import Server
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.routing import BaseRoute, Mount, Route
+
+from .metrics import Metrics
+
+SSE = "sse"
+STREAMABLE_HTTP = "streamable-http"
+
+MCP_TRANSPORTS = os.environ.get("MCP_TRANSPORTS", f"{SSE},{STREAMABLE_HTTP}")
+MCP_WORKERS = int(os.environ.get("MCP_WORKERS", 1))
+# Answer streamable-HTTP requests with plain JSON instead of a one-event SSE stream.
+MCP_JSON_RESPONSE = os.environ.get("MCP_JSON_RESPONSE", "true").lower() == "true"
+
+
+def enabled_transports(transports: str = MCP_TRANSPORTS, workers: int = MCP_WORKERS) -> list[str]:
+  """Parses a transport list and drops SSE when it cannot work with the worker count."""
+  enabled = [t.strip() for t in transports.split(",") if t.strip()]
+  unknown = set(enabled) - {SSE, STREAMABLE_HTTP}
+  if unknown:
+    raise ValueError(f"Unknown MCP transport(s): {', '.join(sorted(unknown))}")
+  if workers > 1 and SSE in enabled:
+    print(f"MCP Server: SSE sessions are pinned to one process; serving only {STREAMABLE_HTTP} with {workers} workers.")
+    enabled.remove(SSE)
+  if not enabled:
+    raise ValueError("No MCP transport left to serve.")
+  return enabled
+
+
+class _StreamableHTTPEndpoint:
+  """Raw ASGI endpoint; Starlette would wrap a plain function as a Request handler."""
+
+  def __init__(self, session_manager: StreamableHTTPSessionManager) -> None:
+    self.session_manager = session_manager
+
+  async def __call__(self, scope, receive, send) -> None:
+    await self.session_manager.handle_request(scope, receive, send)
+
+
+def build_app(
+    server: Server,
+    *,
+    transports: Sequence[str] | None = None,
+    routes: Sequence[BaseRoute] = (),
+    on_shutdown: Sequence[Callable[[], Awaitable[None]]] = (),
+    metrics: Metrics | None = None,
+    debug: bool = True,
+) -> Starlette:
+  """Creates the Starlette app serving `server` over the enabled transports.
+
+  Extra `routes` are added as-is; `on_shutdown` callbacks run when the app
+  stops. With `metrics`, open SSE sessions are counted and GET /metrics
+  serves them in Prometheus text format.
+  """
+  transports = list(transports) if transports is not None else enabled_transports()
+  app_routes: list[BaseRoute] = list(routes)
+  session_manager = None
+
+  if SSE in transports:
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request):
+      """Runs the MCP server over a Server-Sent Events stream."""
+      if metrics is not None:
+        metrics.sse_session_opened()
+      try:
+        async with sse.connect_sse(
+          request.scope, request.receive, request._send
+        ) as streams:
+          await server.run(
+              streams[0], streams[1], server.create_initialization_options()
+          )
+      finally:
+        if metrics is not None:
+          metrics.sse_session_closed()
+
+    app_routes += [
+        Route("/sse", endpoint=handle_sse),
+        Mount("/messages/", app=sse.handle_post_message),
+    ]
+
+  if STREAMABLE_HTTP in transports:
+    session_manager = StreamableHTTPSessionManager(
+        app=server, stateless=True, json_response=MCP_JSON_RESPONSE
+    )
+
+    app_routes.append(Route("/mcp", endpoint=_StreamableHTTPEndpoint(session_manager), methods=["GET", "POST", "DELETE"]))
+
+  if metrics is not None:
+    app_routes.append(Route("/metrics", endpoint=metrics.endpoint, methods=["GET"]))
+
+  @contextlib.asynccontextmanager
+  async def lifespan(app):
+    async with contextlib.AsyncExitStack() as stack:
+      if session_manager is not None:
+        await stack.enter_async_context(session_manager.run())
+      try:
+        yield
+      finally:
+        for callback in on_shutdown:
+          await callback()
+
+  print(f"MCP Server: Serving transports: {', '.join(transports)}")
+  return Starlette(debug=debug, routes=app_routes, lifespan=lifespan)
+
+
+def run(app_import_path: str, app: Starlette, host: str, port: int, workers: int = MCP_WORKERS) -> None:
+  """Runs the app with uvicorn, in `workers` processes when more than one is asked for."""
+  if workers <= 1:
+    uvicorn.run(app, host=host, port=port)
+    return
+  # Spawned workers re-import the launching __main__ before they answer
+  # uvicorn's 5 second health ping, and importing google.adk takes longer
+  # than that. Hand the process over to the uvicorn CLI, whose workers only
+  # import the app after the ping thread is running.
+  os.execv(sys.executable, [
+      sys.executable, "-m", "uvicorn", app_import_path,
+      "--host", host, "--port", str(port), "--workers", str(workers),
+  ])
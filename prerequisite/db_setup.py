@@ -1,6 +1,7 @@
 import os
 import sqlalchemy
 from google.cloud.sql.connector import Connector
+from lore_loader import load_abilities, normalize
 
 def setup_database():
     """Connects to the Cloud SQL DB, creates tables, and inserts data."""
@@ -34,50 +35,26 @@ def setup_database():
             creator=getconn,
         )
 
-        with pool.connect() as db_conn:
-            print("Connection successful. Creating table and inserting data...")
-            # Create the abilities table
-            db_conn.execute(sqlalchemy.text(
-                """
-                CREATE TABLE IF NOT EXISTS abilities (
-                    id SERIAL PRIMARY KEY,
-                    familiar_name VARCHAR(50) NOT NULL,
-                    ability_name VARCHAR(50) UNIQUE NOT NULL,
-                    damage_points INTEGER NOT NULL,
-                    element VARCHAR(20) NOT NULL
-                );
-                """
-            ))
-            db_conn.commit()
-
-            # Clear existing data to make script idempotent
-            db_conn.execute(sqlalchemy.text("TRUNCATE TABLE abilities;"))
-            db_conn.commit()
-
-            # Insert lore-based data
-            abilities_to_insert = [
-                # Fire Elemental Abilities
-                {"familiar": "Fire Elemental", "ability": "inferno_lash", "damage": 85, "element": "Fire"},
-                {"familiar": "Fire Elemental", "ability": "emberstorm", "damage": 90, "element": "Fire"}, 
-                {"familiar": "Fire Elemental", "ability": "Pyroclasm", "damage": 80, "element": "Fire"}, 
-            ]
+        # Insert lore-based data
+        abilities_to_insert = [
+            # Fire Elemental Abilities
+            {"familiar": "Fire Elemental", "ability": "inferno_lash", "damage": 85, "element": "Fire"},
+            {"familiar": "Fire Elemental", "ability": "emberstorm", "damage": 90, "element": "Fire"}, 
+            {"familiar": "Fire Elemental", "ability": "Pyroclasm", "damage": 80, "element": "Fire"}, 
+        ]
 
-            for ability in abilities_to_insert:
-                 stmt = sqlalchemy.text(
-                    """
-                    INSERT INTO abilities (familiar_name, ability_name, damage_points, element)
-                    VALUES (:familiar, :ability, :damage, :element)
-                    ON CONFLICT (ability_name) DO NOTHING;
-                    """
-                )
-                 db_conn.execute(stmt, parameters=ability)
+        print("Creating table and inserting data...")
+        # Creates the table and its indexes, then replaces its contents in one
+        # transaction (idempotent, like the TRUNCATE + INSERTs it replaces).
+        # Larger lore files: python lore_loader.py <file.jsonl|file.csv>
+        result = load_abilities(pool, (normalize(a) for a in abilities_to_insert), mode="replace")
+        print(f"Database setup complete. 'abilities' table created and populated ({result['rows']} rows).")
 
-            db_conn.commit()
-            print("Database setup complete. 'abilities' table created and populated.")
-
-            # Verify insertion
-            results = db_conn.execute(sqlalchemy.text("SELECT * FROM abilities;")).fetchall()
-            print("\n--- Verifying Inserted Data ---")
+        # Verify insertion
+        with pool.connect() as db_conn:
+            count = db_conn.execute(sqlalchemy.text("SELECT COUNT(*) FROM abilities;")).scalar_one()
+            results = db_conn.execute(sqlalchemy.text("SELECT * FROM abilities ORDER BY id LIMIT 10;")).fetchall()
+            print(f"\n--- Verifying Inserted Data ({count} rows, first {len(results)}) ---")
             for row in results:
                 print(row)
             print("-----------------------------")
@@ -0,0 +1,250 @@
+# prerequisite/fake_api/cooldown_store.py
+"""
+Cooldown backends for the Nexus of Whispers.
+
+The server stores { "familiar_name": "ISO_8601_timestamp" } records through
+one of these stores. Pick one with the COOLDOWN_BACKEND environment variable:
+
+  memory  - a per-process dict (only correct with a single uvicorn worker)
+  sqlite  - a SQLite database in WAL mode, shared by every worker process
+            that points at the same COOLDOWN_DB_PATH
+
+Records expire COOLDOWN_TTL_SECONDS after their timestamp. An expired
+familiar reads as never used, so the TTL must be at least as long as the
+longest cooldown period the familiars enforce.
+"""
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Optional
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_DB_PATH = "/tmp/nexus_cooldowns.db"
+# Expired rows are purged from the SQLite store at most this often.
+PURGE_INTERVAL_SECONDS = 30
+# Names per SELECT in get_many; older SQLite builds allow 999 variables per statement.
+GET_MANY_CHUNK_SIZE = 500
+
+
+def _parse_utc(timestamp: str) -> datetime:
+    """Parses an ISO timestamp; naive timestamps are taken to be UTC."""
+    parsed = datetime.fromisoformat(timestamp)
+    return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+
+
+def _is_cooling_down(last_used: Optional[str], timestamp: str, cooldown_seconds: float) -> bool:
+    """True if last_used lies less than cooldown_seconds before timestamp."""
+    if not last_used:
+        return False
+    try:
+        elapsed = _parse_utc(timestamp) - _parse_utc(last_used)
+    except (TypeError, ValueError):
+        return False
+    return elapsed.total_seconds() < cooldown_seconds
+
+
+def _expires_at(timestamp: str, ttl_seconds: float) -> float:
+    """Epoch seconds at which a cooldown record stops mattering."""
+    try:
+        return _parse_utc(timestamp).timestamp() + ttl_seconds
+    except ValueError:
+        # Not an ISO timestamp; keep it for a full TTL from now.
+        return time.time() + ttl_seconds
+
+
+class CooldownStore(ABC):
+    """Interface shared by every cooldown backend."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def get(self, familiar_name: str) -> Optional[str]:
+        """Returns the last used timestamp, or None if unknown or expired."""
+
+    @abstractmethod
+    def set(self, familiar_name: str, timestamp: str) -> None:
+        """Updates or sets the last used timestamp of a familiar."""
+
+    @abstractmethod
+    def evict_expired(self) -> int:
+        """Removes expired records and returns how many were removed."""
+
+    @abstractmethod
+    def acquire(self, familiar_name: str, timestamp: str, cooldown_seconds: float) -> tuple[bool, Optional[str]]:
+        """Atomically sets the timestamp if the familiar's cooldown has passed.
+
+        Returns (acquired, time): the new timestamp if the familiar was
+        acquired, otherwise the last used timestamp that is still cooling down.
+        """
+
+    def get_many(self, familiar_names: list[str]) -> dict[str, Optional[str]]:
+        return {name: self.get(name) for name in familiar_names}
+
+    def set_many(self, records: dict[str, str]) -> None:
+        for familiar_name, timestamp in records.items():
+            self.set(familiar_name, timestamp)
+
+
+class MemoryCooldownStore(CooldownStore):
+    """Process-local store. Bounded, and expired familiars are evicted."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        # { "familiar_name": (timestamp, expires_at) }
+        self._records: dict[str, tuple[str, float]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, familiar_name: str) -> Optional[str]:
+        with self._lock:
+            record = self._records.get(familiar_name)
+            if record is None:
+                return None
+            if record[1] <= time.time():
+                del self._records[familiar_name]
+                return None
+            return record[0]
+
+    def set(self, familiar_name: str, timestamp: str) -> None:
+        with self._lock:
+            self._records.pop(familiar_name, None)
+            self._records[familiar_name] = (timestamp, _expires_at(timestamp, self.ttl_seconds))
+            if len(self._records) > self.max_entries:
+                self._evict_expired_locked()
+            while len(self._records) > self.max_entries:
+                # Dicts keep insertion order, so this drops the longest-untouched familiar.
+                del self._records[next(iter(self._records))]
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            return self._evict_expired_locked()
+
+    def acquire(self, familiar_name: str, timestamp: str, cooldown_seconds: float) -> tuple[bool, Optional[str]]:
+        with self._lock:
+            last_used = self.get(familiar_name)
+            if _is_cooling_down(last_used, timestamp, cooldown_seconds):
+                return False, last_used
+            self.set(familiar_name, timestamp)
+            return True, timestamp
+
+    def _evict_expired_locked(self) -> int:
+        now = time.time()
+        expired = [name for name, (_, expires_at) in self._records.items() if expires_at <= now]
+        for name in expired:
+            del self._records[name]
+        return len(expired)
+
+
+class SQLiteCooldownStore(CooldownStore):
+    """Store shared by several worker processes through one SQLite file in WAL mode."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        super().__init__(ttl_seconds)
+        self.path = path
+        self._local = threading.local()
+        self._last_purge = 0.0
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cooldowns (
+                familiar_name TEXT PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cooldowns_expires_at ON cooldowns (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # FastAPI runs sync endpoints on a thread pool; each thread gets its own connection.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, familiar_name: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT timestamp FROM cooldowns WHERE familiar_name = ? AND expires_at > ?",
+            (familiar_name, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, familiar_name: str, timestamp: str) -> None:
+        self._upsert(self._connection(), [(familiar_name, timestamp)])
+
+    def _upsert(self, conn: sqlite3.Connection, records) -> None:
+        conn.executemany(
+            """
+            INSERT INTO cooldowns (familiar_name, timestamp, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (familiar_name) DO UPDATE SET
+                timestamp = excluded.timestamp, expires_at = excluded.expires_at
+            """,
+            [(name, timestamp, _expires_at(timestamp, self.ttl_seconds)) for name, timestamp in records],
+        )
+        if time.monotonic() - self._last_purge >= PURGE_INTERVAL_SECONDS:
+            self.evict_expired()
+
+    def acquire(self, familiar_name: str, timestamp: str, cooldown_seconds: float) -> tuple[bool, Optional[str]]:
+        conn = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front, so no other worker can
+        # acquire the same familiar between our read and our write.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            last_used = self.get(familiar_name)
+            if _is_cooling_down(last_used, timestamp, cooldown_seconds):
+                conn.execute("COMMIT")
+                return False, last_used
+            self._upsert(conn, [(familiar_name, timestamp)])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return True, timestamp
+
+    def get_many(self, familiar_names: list[str]) -> dict[str, Optional[str]]:
+        found = {}
+        conn = self._connection()
+        now = time.time()
+        for start in range(0, len(familiar_names), GET_MANY_CHUNK_SIZE):
+            chunk = familiar_names[start:start + GET_MANY_CHUNK_SIZE]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT familiar_name, timestamp FROM cooldowns WHERE familiar_name IN ({placeholders}) AND expires_at > ?",
+                (*chunk, now),
+            ).fetchall()
+            found.update(rows)
+        return {name: found.get(name) for name in familiar_names}
+
+    def set_many(self, records: dict[str, str]) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            self._upsert(conn, records.items())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def evict_expired(self) -> int:
+        self._last_purge = time.monotonic()
+        cursor = self._connection().execute("DELETE FROM cooldowns WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+
+def create_cooldown_store() -> CooldownStore:
+    """Builds the backend selected by the COOLDOWN_* environment variables."""
+    backend = os.environ.get("COOLDOWN_BACKEND", "memory").lower()
+    ttl_seconds = float(os.environ.get("COOLDOWN_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    if backend == "memory":
+        return MemoryCooldownStore(ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteCooldownStore(os.environ.get("COOLDOWN_DB_PATH", DEFAULT_DB_PATH), ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown COOLDOWN_BACKEND '{backend}'. Expected 'memory' or 'sqlite'.")
@@ -1,21 +1,33 @@
 # prerequisite/fake_api/main.py (Consolidated Version)
-from fastapi import FastAPI, Response, status
+from fastapi import FastAPI, Query, Response, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from datetime import datetime, timezone
+from typing import Optional
 import os
 import uvicorn
+from cooldown_store import create_cooldown_store
 
 app = FastAPI()
 
 # --- State Management for Cooldowns ---
-# This in-memory dictionary will act as our simple database for cooldowns.
-# It will store: { "familiar_name": "ISO_8601_timestamp" }
-cooldown_db = {}
+# The cooldown store acts as our simple database for cooldowns.
+# It stores: { "familiar_name": "ISO_8601_timestamp" }
+# Set COOLDOWN_BACKEND=sqlite to share it between several uvicorn workers.
+cooldown_db = create_cooldown_store()
 
 class CooldownRequest(BaseModel):
     timestamp: str
 
+class CooldownAcquireRequest(BaseModel):
+    cooldown_seconds: float
+    # Defaults to the server's current time.
+    timestamp: Optional[str] = None
+
+class CooldownBatchRequest(BaseModel):
+    # { "familiar_name": "ISO_8601_timestamp" }
+    cooldowns: dict[str, str]
+
 
 
 @app.get("/")
@@ -52,9 +64,40 @@ def get_cooldown_status(familiar_name: str):
 def set_cooldown_timestamp(familiar_name: str, request: CooldownRequest):
     """Updates or sets the cooldown timestamp for a Familiar."""
     print(f"[Nexus API] POST Cooldown for '{familiar_name}' to {request.timestamp}")
-    cooldown_db[familiar_name] = request.timestamp
+    cooldown_db.set(familiar_name, request.timestamp)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@app.post("/cooldown/{familiar_name}/acquire")
+def acquire_cooldown(familiar_name: str, request: CooldownAcquireRequest):
+    """Sets the cooldown timestamp only if the Familiar's cooldown has expired.
+
+    The check and the write happen atomically, so two sessions summoning the
+    same Familiar at once cannot both acquire it.
+    """
+    timestamp = request.timestamp or datetime.now(timezone.utc).isoformat()
+    acquired, last_used = cooldown_db.acquire(familiar_name, timestamp, request.cooldown_seconds)
+    print(f"[Nexus API] ACQUIRE Cooldown for '{familiar_name}'. Acquired: {acquired}, time: {last_used}")
+    return {"acquired": acquired, "time": last_used}
+
+@app.get("/cooldowns")
+def get_cooldown_statuses(familiar_name: list[str] = Query(default=[])):
+    """Returns the last used timestamps of many Familiars, e.g. /cooldowns?familiar_name=a&familiar_name=b."""
+    print(f"[Nexus API] GET Cooldowns for {familiar_name}")
+    return {"cooldowns": cooldown_db.get_many(familiar_name)}
+
+@app.post("/cooldowns", status_code=status.HTTP_204_NO_CONTENT)
+def set_cooldown_timestamps(request: CooldownBatchRequest):
+    """Updates or sets the cooldown timestamps of many Familiars."""
+    print(f"[Nexus API] POST Cooldowns for {list(request.cooldowns)}")
+    cooldown_db.set_many(request.cooldowns)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
\ No newline at end of file
+    # More than one worker needs a shared store such as COOLDOWN_BACKEND=sqlite.
+    uvicorn.run(
+        "fake_api_server:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8080)),
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+    )
\ No newline at end of file
@@ -0,0 +1,262 @@
+# prerequisite/lore_loader.py
+"""
+Bulk loader for the Librarium's `abilities` table.
+
+Streams abilities from a JSONL or CSV file and writes them in batches
+instead of one INSERT per row:
+
+  executemany  INSERT ... ON CONFLICT (ability_name) DO UPDATE executed once
+               per batch with all its rows (Postgres and SQLite)
+  copy         Postgres COPY into a temporary staging table, then one
+               upsert from it (pg8000, the driver db_setup.py uses)
+
+Each record needs familiar_name, ability_name, damage_points and element
+(db_setup.py's familiar/ability/damage keys are accepted too). Files are
+read lazily, so memory use is bounded by the batch size, not the file.
+
+Modes:
+  upsert   insert new abilities, update changed ones (incremental loads)
+  replace  empty the table first, in the same transaction
+
+The table gets indexes on familiar_name and element, the columns the
+Librarium looks abilities up by. Every load also bumps the `abilities` row
+of the lore_version table in its transaction; agent/lore_cache.py reloads
+its snapshot when that changes.
+
+Usage:
+    python prerequisite/lore_loader.py abilities.jsonl [--db-url sqlite:///librarium.db]
+        [--mode upsert|replace] [--method auto|executemany|copy] [--batch-size 5000]
+
+Without --db-url (or LORE_DB_URL) it connects to Cloud SQL with the same
+environment variables as db_setup.py.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import time
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql, sqlite
+
+COLUMNS = ("familiar_name", "ability_name", "damage_points", "element")
+# db_setup.py's record keys
+ALIASES = {"familiar": "familiar_name", "ability": "ability_name", "damage": "damage_points"}
+DEFAULT_BATCH_SIZE = 5000
+
+metadata = sqlalchemy.MetaData()
+abilities = sqlalchemy.Table(
+    "abilities",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.Integer, primary_key=True, autoincrement=True),
+    sqlalchemy.Column("familiar_name", sqlalchemy.String(50), nullable=False),
+    sqlalchemy.Column("ability_name", sqlalchemy.String(50), unique=True, nullable=False),
+    sqlalchemy.Column("damage_points", sqlalchemy.Integer, nullable=False),
+    sqlalchemy.Column("element", sqlalchemy.String(20), nullable=False),
+    sqlalchemy.Index("ix_abilities_familiar_name", "familiar_name"),
+    sqlalchemy.Index("ix_abilities_element", "element"),
+)
+# One row per table, bumped by each load so readers can tell the data changed.
+lore_version = sqlalchemy.Table(
+    "lore_version",
+    metadata,
+    sqlalchemy.Column("table_name", sqlalchemy.String(50), primary_key=True),
+    sqlalchemy.Column("version", sqlalchemy.Integer, nullable=False),
+)
+
+
+def normalize(record: dict) -> dict:
+    """A record with exactly the table's columns; raises ValueError if one is missing."""
+    record = {ALIASES.get(key, key): value for key, value in record.items()}
+    try:
+        return {
+            "familiar_name": str(record["familiar_name"]),
+            "ability_name": str(record["ability_name"]),
+            "damage_points": int(record["damage_points"]),
+            "element": str(record["element"]),
+        }
+    except KeyError as e:
+        raise ValueError(f"Ability record is missing {e.args[0]!r}: {record}") from e
+
+
+def read_abilities(path: str, file_format: Optional[str] = None) -> Iterator[dict]:
+    """Yields normalized records from a .jsonl or .csv file, one line at a time."""
+    file_format = file_format or ("csv" if path.endswith(".csv") else "jsonl")
+    with open(path, newline="") as f:
+        if file_format == "csv":
+            for record in csv.DictReader(f):
+                yield normalize(record)
+        elif file_format == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield normalize(json.loads(line))
+        else:
+            raise ValueError(f"Unknown lore file format {file_format!r}; expected 'jsonl' or 'csv'.")
+
+
+def batched(records: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _dedupe(batch: list[dict]) -> list[dict]:
+    # Postgres refuses an upsert that touches the same row twice; the last record wins.
+    return list({record["ability_name"]: record for record in batch}.values())
+
+
+def create_schema(conn: sqlalchemy.Connection) -> None:
+    """Creates the abilities and lore_version tables and the lookup indexes if they do not exist."""
+    metadata.create_all(conn, checkfirst=True)
+    # create_all skips the indexes of a table that already exists (e.g. one
+    # created by an older db_setup.py), so create those separately.
+    for index in abilities.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def _insert(dialect: str):
+    insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect)
+    if insert is None:
+        raise ValueError(f"Upserts are not supported on {dialect!r}; use Postgres or SQLite.")
+    return insert
+
+
+def _upsert_statement(dialect: str):
+    stmt = _insert(dialect)(abilities)
+    return stmt.on_conflict_do_update(
+        index_elements=["ability_name"],
+        set_={column: stmt.excluded[column] for column in COLUMNS if column != "ability_name"},
+    )
+
+
+def bump_version(conn: sqlalchemy.Connection, table_name: str = "abilities") -> None:
+    """Increments the table's lore_version row, creating it at 1."""
+    stmt = _insert(conn.dialect.name)(lore_version).values(table_name=table_name, version=1)
+    conn.execute(stmt.on_conflict_do_update(
+        index_elements=["table_name"],
+        set_={"version": lore_version.c.version + 1},
+    ))
+
+
+def _load_executemany(conn: sqlalchemy.Connection, records: Iterable[dict], batch_size: int) -> int:
+    stmt = _upsert_statement(conn.dialect.name)
+    rows = 0
+    for batch in batched(records, batch_size):
+        # One executemany per batch: a single prepared statement for the whole
+        # batch (SQLAlchemy sends it as multi-row VALUES where the driver allows).
+        conn.execute(stmt, _dedupe(batch))
+        rows += len(batch)
+    return rows
+
+
+def _load_copy(conn: sqlalchemy.Connection, records: Iterable[dict], batch_size: int) -> int:
+    cursor = conn.connection.dbapi_connection.cursor()
+    cursor.execute(
+        "CREATE TEMP TABLE abilities_staging "
+        "(seq BIGSERIAL, familiar_name VARCHAR(50), ability_name VARCHAR(50), damage_points INTEGER, element VARCHAR(20)) "
+        "ON COMMIT DROP"
+    )
+    rows = 0
+    for batch in batched(records, batch_size):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([record[column] for column in COLUMNS] for record in batch)
+        buffer.seek(0)
+        cursor.execute(f"COPY abilities_staging ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", stream=buffer)
+        rows += len(batch)
+    # One row per ability, the last one loaded, as with executemany.
+    cursor.execute(
+        f"INSERT INTO abilities ({', '.join(COLUMNS)}) "
+        f"SELECT DISTINCT ON (ability_name) {', '.join(COLUMNS)} FROM abilities_staging "
+        "ORDER BY ability_name, seq DESC "
+        "ON CONFLICT (ability_name) DO UPDATE SET familiar_name = EXCLUDED.familiar_name, "
+        "damage_points = EXCLUDED.damage_points, element = EXCLUDED.element"
+    )
+    return rows
+
+
+def load_abilities(
+    engine: sqlalchemy.Engine,
+    records: Iterable[dict],
+    *,
+    mode: str = "upsert",
+    method: str = "auto",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict:
+    """Loads records in one transaction and returns rows (records read), seconds and rows_per_second.
+
+    method "auto" uses COPY on Postgres through pg8000 and executemany otherwise.
+    """
+    if mode not in ("upsert", "replace"):
+        raise ValueError(f"Unknown load mode {mode!r}; expected 'upsert' or 'replace'.")
+    dialect = engine.dialect.name
+    if method == "auto":
+        method = "copy" if dialect == "postgresql" and engine.dialect.driver == "pg8000" else "executemany"
+    if method == "copy" and engine.dialect.driver != "pg8000":
+        raise ValueError("COPY needs Postgres through the pg8000 driver; use method='executemany'.")
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        create_schema(conn)
+        if mode == "replace":
+            conn.execute(sqlalchemy.text("TRUNCATE TABLE abilities" if dialect == "postgresql" else "DELETE FROM abilities"))
+        if method == "copy":
+            rows = _load_copy(conn, records, batch_size)
+        else:
+            rows = _load_executemany(conn, records, batch_size)
+        # In the same transaction, so no reader sees new rows under the old version.
+        bump_version(conn)
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "method": method,
+        "mode": mode,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds > 0 else None,
+    }
+
+
+def cloud_sql_engine() -> sqlalchemy.Engine:
+    """An engine for the Cloud SQL instance, from db_setup.py's environment variables."""
+    from google.cloud.sql.connector import Connector
+
+    instance_connection_name = f"{os.environ['GCP_PROJECT_ID']}:{os.environ['GCP_REGION']}:{os.environ['DB_INSTANCE_NAME']}"
+    connector = Connector()
+
+    def getconn():
+        return connector.connect(
+            instance_connection_name,
+            "pg8000",
+            user=os.environ["DB_USER"],
+            password=os.environ["DB_PASSWORD"],
+            db=os.environ["DB_NAME"],
+        )
+
+    return sqlalchemy.create_engine("postgresql+pg8000://", creator=getconn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="a .jsonl or .csv file of abilities")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="default: from the file extension")
+    parser.add_argument("--db-url", default=os.environ.get("LORE_DB_URL"), help="SQLAlchemy URL (default: Cloud SQL)")
+    parser.add_argument("--mode", choices=("upsert", "replace"), default="upsert")
+    parser.add_argument("--method", choices=("auto", "executemany", "copy"), default="auto")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = sqlalchemy.create_engine(args.db_url) if args.db_url else cloud_sql_engine()
+    result = load_abilities(
+        engine,
+        read_abilities(args.path, args.format),
+        mode=args.mode,
+        method=args.method,
+        batch_size=args.batch_size,
+    )
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()